@@ -0,0 +1,115 @@
+"""
+Benchmark: batched event publication between agents
+
+Part 1 encodes and decodes batches of generated events with event_codec
+and compares the payload size with to_dict() JSON.
+
+Part 2 starts sensors on the local transport that publish to one
+EventSubscriberAgent, once with one event per message and once with
+batches, and reports events delivered per second and events per message.
+Sensors run with a short period so that they produce events faster than
+a batch window.
+
+Usage:
+    python benchmarks/bench_messaging.py [--sensors 20] [--duration 5] [--period 0.01]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lab2.disaster_environment import DisasterEnvironment, to_dicts
+from lab2.event_codec import decode_batch, encode_batch
+from lab2.local_transport import local_agent
+from lab2.messaging import EventSubscriberAgent
+from lab2.sensor_agent import SensorAgent
+
+
+def bench_codec(batch_sizes, total: int = 100000):
+    """Print payload sizes and coding rates for several batch sizes."""
+    print(f"{'batch':>6} {'bytes/event':>12} {'json bytes/event':>17} {'ratio':>6} "
+          f"{'encode ev/s':>12} {'decode ev/s':>12}")
+    environment = DisasterEnvironment(seed=0)
+    for size in batch_sizes:
+        events = list(environment.generate_events(size))
+        repeats = max(1, total // size)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            payload = encode_batch(events)
+        encoded = time.perf_counter()
+        for _ in range(repeats):
+            decoded = decode_batch(payload)[1]
+        done = time.perf_counter()
+        assert decoded == events
+        json_size = len(json.dumps(to_dicts(events))) / size
+        print(f"{size:>6} {len(payload) / size:>12.1f} {json_size:>17.1f} "
+              f"{json_size * size / len(payload):>5.0f}x "
+              f"{repeats * size / (encoded - start):>12,.0f} {repeats * size / (done - encoded):>12,.0f}")
+
+
+async def run_agents(sensors: int, duration: float, period: float, batch_size: int,
+                     batch_window: float):
+    """Run sensors publishing to one subscriber; return the receiver's statistics."""
+    environment = DisasterEnvironment(seed=0, columnar=True)
+    mirror = DisasterEnvironment(columnar=True)
+    subscriber = local_agent(EventSubscriberAgent)("hq@localhost", "local", environment=mirror)
+    sensor_class = local_agent(SensorAgent)
+    fleet = [
+        sensor_class(f"sensor_{i}@localhost", "local", environment=environment, period=period,
+                     subscribers=["hq@localhost"], batch_size=batch_size,
+                     batch_window=batch_window)
+        for i in range(sensors)
+    ]
+    await subscriber.start(auto_register=False)
+    for agent in fleet:
+        await agent.start(auto_register=False)
+    started = time.perf_counter()
+    await asyncio.sleep(duration)
+    for agent in fleet:
+        await agent.stop()
+    # Let the subscriber drain the final batches
+    await asyncio.sleep(0.5)
+    elapsed = time.perf_counter() - started
+    await subscriber.stop()
+
+    stats = subscriber.receiver.stats()
+    published = sum(agent.publisher.events for agent in fleet)
+    assert stats["events"] == published == mirror.get_event_summary()["total_events"]
+    stats["events_per_second"] = stats["events"] / elapsed
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sensors", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--period", type=float, default=0.01,
+                        help="sensor cycle period in seconds")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--batch-window", type=float, default=1.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    bench_codec([1, 10, 100, 1000])
+
+    print(f"\n{args.sensors} sensors, period {args.period:g}s, {args.duration:g}s")
+    print(f"{'batching':>20} {'messages':>9} {'events':>8} {'events/msg':>11} "
+          f"{'bytes/event':>12} {'events/s':>9}")
+    for label, batch_size, window in (("one event/message", 1, args.batch_window),
+                                      (f"{args.batch_size} or {args.batch_window:g}s",
+                                       args.batch_size, args.batch_window)):
+        stats = asyncio.run(run_agents(args.sensors, args.duration, args.period,
+                                       batch_size, window))
+        print(f"{label:>20} {stats['messages']:>9,} {stats['events']:>8,} "
+              f"{stats['events_per_message']:>11.1f} {stats['bytes_per_event']:>12.1f} "
+              f"{stats['events_per_second']:>9,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: parallel Monte Carlo scaling
+
+Runs the same batch of seeded simulations with 1, 2, 4, ... worker
+processes up to the CPU count, checks that every worker count produces
+the same distributions, and reports throughput and parallel efficiency
+relative to one worker.
+
+Usage:
+    python benchmarks/bench_monte_carlo.py [--runs 2000] [--events 1000] [--max-workers N]
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lab2.monte_carlo import run_monte_carlo
+
+TIMING_FIELDS = ("workers", "chunks", "elapsed_seconds", "runs_per_second")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=1000, help="events per run")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    worker_counts = []
+    workers = 1
+    while workers < args.max_workers:
+        worker_counts.append(workers)
+        workers *= 2
+    worker_counts.append(args.max_workers)
+
+    print(f"{args.runs:,} runs x {args.events:,} events")
+    print(f"{'workers':>7} {'chunks':>7} {'seconds':>9} {'runs/s':>10} {'speedup':>8} {'efficiency':>10}")
+    baseline = None
+    reference = None
+    for workers in worker_counts:
+        result = run_monte_carlo(args.runs, args.events, workers=workers,
+                                 chunk_size=args.chunk_size)
+        distributions = {key: value for key, value in result.items() if key not in TIMING_FIELDS}
+        if reference is None:
+            reference = distributions
+            baseline = result["elapsed_seconds"]
+        assert distributions == reference, f"results differ with {workers} workers"
+        speedup = baseline / result["elapsed_seconds"]
+        print(f"{workers:>7} {result['chunks']:>7} {result['elapsed_seconds']:>9.2f} "
+              f"{result['runs_per_second']:>10,.0f} {speedup:>7.2f}x {speedup / workers:>9.0%}")
+
+    print(f"\npopulation at risk p50/p95: {reference['population_at_risk']['p50']:,.0f} / "
+          f"{reference['population_at_risk']['p95']:,.0f}, "
+          f"critical event frequency {reference['critical_event_frequency']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: indexed DisasterEnvironment.query versus a linear scan
+
+Builds an environment with N events and compares the time taken to answer
+"all CRITICAL floods in Hospital Area recently" (and a few broader
+queries) through the secondary indexes and by scanning
+environment.events.
+
+Usage:
+    python benchmarks/bench_query.py [--events 1000000] [--repeat 5]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lab2.disaster_environment import DisasterEnvironment, DisasterType, SeverityLevel
+
+
+def linear_scan(environment, disaster_type, location, min_severity, since):
+    """Reference implementation: filter every stored event."""
+    return [
+        e for e in environment.events
+        if (disaster_type is None or e.disaster_type == disaster_type)
+        and (location is None or e.location == location)
+        and (min_severity is None or e.severity_level.value >= min_severity.value)
+        and (since is None or e.timestamp >= since)
+    ]
+
+
+def best_time(func, repeat):
+    """Best wall-clock time of `repeat` calls, plus the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000,
+                        help="events per generate_events call (spreads timestamps)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    environment = DisasterEnvironment(seed=42)
+    for start in range(0, args.events, args.batch):
+        environment.generate_events(min(args.batch, args.events - start))
+
+    recent = environment.events[len(environment.events) * 99 // 100].timestamp
+    middle = environment.events[len(environment.events) // 2].timestamp
+    queries = {
+        "critical floods, Hospital Area, last 1%":
+            (DisasterType.FLOOD, "Hospital Area", SeverityLevel.CRITICAL, recent),
+        "critical floods, Hospital Area, second half":
+            (DisasterType.FLOOD, "Hospital Area", SeverityLevel.CRITICAL, middle),
+        "all wildfires": (DisasterType.WILDFIRE, None, None, None),
+        "severe+ in Port District": (None, "Port District", SeverityLevel.SEVERE, None),
+    }
+
+    print(f"{args.events:,} events, best of {args.repeat}")
+    print(f"{'query':45} {'matches':>9} {'index ms':>10} {'scan ms':>10} {'speedup':>9}")
+    # Events are materialised only for matches; the timings include that cost
+    for name, (disaster_type, location, min_severity, since) in queries.items():
+        index_time, indexed = best_time(
+            lambda: environment.query(disaster_type, location, min_severity, since), args.repeat)
+        scan_time, scanned = best_time(
+            lambda: linear_scan(environment, disaster_type, location, min_severity, since), 1)
+        assert indexed == scanned, f"index and scan disagree for {name!r}"
+        print(f"{name:45} {len(indexed):9,} {index_time * 1000:10.2f} "
+              f"{scan_time * 1000:10.2f} {scan_time / index_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
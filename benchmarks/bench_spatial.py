@@ -0,0 +1,103 @@
+"""
+Benchmark: spatial queries and hazard propagation
+
+Builds an environment with a spatial model and N events, then compares
+the grid index lookup behind DisasterEnvironment.events_within with a
+linear scan of all event positions, and times one propagation tick of
+WildfireGrid and FloodGrid on a full-size grid.
+
+Events cluster around the scenario's locations, so queries near a
+location match many events; the timings exclude materialising them.
+
+Usage:
+    python benchmarks/bench_spatial.py [--events 1000000] [--grid 1000] [--ticks 20]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lab2.disaster_environment import DisasterEnvironment
+from lab2.spatial import FloodGrid, SpatialModel, WildfireGrid
+
+
+def linear_scan(index, x, y, r):
+    """Reference implementation: test every event position."""
+    xs = np.frombuffer(index.xs)
+    ys = np.frombuffer(index.ys)
+    radii = np.frombuffer(index.radii)
+    return np.flatnonzero((xs - x) ** 2 + (ys - y) ** 2 <= (r + radii) ** 2)
+
+
+def best_time(func, repeat):
+    """Best wall-clock time of `repeat` calls, plus the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def time_ticks(grid, ticks):
+    """Mean milliseconds per propagation tick."""
+    start = time.perf_counter()
+    grid.run(ticks)
+    return (time.perf_counter() - start) * 1000 / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--grid", type=int, default=1000,
+                        help="hazard grid side length in cells")
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    environment = DisasterEnvironment(seed=42, columnar=True, spatial=SpatialModel(seed=42))
+    environment.generate_events(args.events)
+
+    queries = {
+        "1 km around Downtown District": (50.0, 50.0, 1.0),
+        "5 km around Hospital Area": (56.0, 63.0, 5.0),
+        "10 km around Agricultural Region": (18.0, 22.0, 10.0),
+        "2 km in open country": (10.0, 90.0, 2.0),
+    }
+    index = environment.spatial.index
+
+    print(f"{args.events:,} events, best of {args.repeat}")
+    print(f"{'query':40} {'matches':>9} {'index ms':>10} {'scan ms':>10} {'speedup':>9}")
+    for name, (x, y, r) in queries.items():
+        index_time, indexed = best_time(lambda: index.within(x, y, r), args.repeat)
+        scan_time, scanned = best_time(lambda: linear_scan(index, x, y, r), args.repeat)
+        assert np.array_equal(indexed, scanned), f"index and scan disagree for {name!r}"
+        print(f"{name:40} {len(indexed):9,} {index_time * 1000:10.2f} "
+              f"{scan_time * 1000:10.2f} {scan_time / max(index_time, 1e-9):8.1f}x")
+
+    side = args.grid
+    cell_size = 100.0 / side
+    print(f"\n{side}x{side} grid, {args.ticks} ticks")
+
+    wildfire = WildfireGrid(side, side, cell_size, seed=42)
+    wildfire.apply_event(50.0, 50.0, 2.0)
+    print(f"{'wildfire spread':40} {time_ticks(wildfire, args.ticks):10.2f} ms/tick, "
+          f"{wildfire.affected_cells():,} burning cells")
+
+    slope = np.tile(np.linspace(0.0, 1.0, side, dtype=np.float32), (side, 1))
+    flood = FloodGrid(side, side, cell_size, elevation=slope)
+    flood.apply_event(50.0, 50.0, 2.0, intensity=5.0)
+    print(f"{'flood spread':40} {time_ticks(flood, args.ticks):10.2f} ms/tick, "
+          f"{flood.affected_cells(0.01):,} flooded cells")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: SQLite event log vs. JSON-lines log
+
+Logs the same generated events through an EventLogger in SQLite mode and
+in JSON-lines streaming mode, then runs the same historical analysis on
+both: a full report, a one-hour time-range read and a filtered query.
+Reports the insert rate, the time of each analysis and its peak Python
+memory.
+
+Usage:
+    python benchmarks/bench_sqlite_log.py [--events 1000000] [--batch 1000]
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lab2.disaster_environment import DisasterEnvironment, DisasterType, SeverityLevel
+from lab2.event_logger import EventLogger
+from lab2.simulation import VirtualClock
+
+START = datetime(2024, 1, 1)
+
+
+def fill(logger: EventLogger, events: int, batch: int) -> float:
+    """Log seeded events, one batch per simulated minute; return seconds taken."""
+    clock = VirtualClock(START)
+    environment = DisasterEnvironment(seed=0, columnar=True, max_events=batch, clock=clock)
+    start = time.perf_counter()
+    for first in range(0, events, batch):
+        clock.advance(60)
+        logger.log_events(environment.generate_events(min(batch, events - first)))
+    logger.save_logs()
+    return time.perf_counter() - start
+
+
+def measure(function):
+    """
+    Run function twice: once timed, once with allocations traced.
+
+    Returns:
+        Its result, seconds taken and peak traced memory in MB
+    """
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def scan_report(logger: EventLogger) -> dict:
+    """Report by scanning the log, as a JSON-lines log requires."""
+    severities, disasters = Counter(), Counter()
+    for event in logger.iter_events():
+        severities[event["severity_level"]] += 1
+        disasters[event["disaster_type"]] += 1
+    return {"total_events": sum(severities.values()),
+            "severity_distribution": dict(severities),
+            "disaster_distribution": dict(disasters)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=1000,
+                        help="events per log_events() call and per insert")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    directory = tempfile.mkdtemp()
+    loggers = {
+        "sqlite": EventLogger(os.path.join(directory, "events.db"), sqlite=True,
+                              flush_records=args.batch),
+        "jsonl": EventLogger(os.path.join(directory, "events.jsonl"), streaming=True,
+                             flush_records=args.batch)
+    }
+    # One simulated hour from the middle of the log
+    since = START + timedelta(minutes=args.events // args.batch // 2)
+    until = since + timedelta(hours=1)
+    analyses = {
+        "report": lambda logger: (logger.generate_report() if logger.sqlite
+                                  else scan_report(logger)),
+        "range_1h": lambda logger: sum(1 for _ in logger.iter_events(since, until)),
+        "query": lambda logger: len(logger.query(DisasterType.FLOOD, "Hospital Area",
+                                                 SeverityLevel.CRITICAL, limit=100))
+    }
+
+    print(f"{args.events:,} events in batches of {args.batch:,}")
+    results = {}
+    for name, logger in loggers.items():
+        elapsed = fill(logger, args.events, args.batch)
+        size = os.path.getsize(logger.log_file)
+        print(f"{name:>6}: {args.events / elapsed:,.0f} events/s logged, {size / 1e6:,.1f} MB")
+        for analysis, function in analyses.items():
+            results[name, analysis] = measure(lambda: function(logger))
+
+    print(f"\n{'analysis':>9} {'sqlite s':>9} {'MB':>6} {'jsonl s':>9} {'MB':>6} {'speedup':>8}")
+    for analysis in analyses:
+        sqlite_result, sqlite_time, sqlite_peak = results["sqlite", analysis]
+        jsonl_result, jsonl_time, jsonl_peak = results["jsonl", analysis]
+        if analysis == "report":
+            sqlite_result = {key: sqlite_result[key] for key in jsonl_result}
+        assert sqlite_result == jsonl_result, f"{analysis} results differ"
+        print(f"{analysis:>9} {sqlite_time:>9.3f} {sqlite_peak:>6.1f} {jsonl_time:>9.3f} "
+              f"{jsonl_peak:>6.1f} {jsonl_time / sqlite_time:>7.0f}x")
+
+    for logger in loggers.values():
+        logger.close()
+    shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
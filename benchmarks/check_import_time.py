@@ -0,0 +1,109 @@
+"""
+Import-time regression check for the lab2 package
+
+Runs typical cold-start imports in fresh interpreters with
+`python -X importtime`, and fails when one of them exceeds its time
+budget or loads the agent stack (SPADE, slixmpp, aiohttp) although it
+does not use agents.
+
+Imports done by every interpreter at startup (site, encodings, ...) are
+not counted. Each scenario is run several times and the fastest run is
+compared with the budget, which keeps the check stable on a busy machine.
+
+Usage:
+    python benchmarks/check_import_time.py [--runs 5] [--scale 1.0]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+AGENT_STACK = ("spade", "slixmpp", "aiohttp")
+
+# (name, code, budget in milliseconds, whether the agent stack may load)
+SCENARIOS = [
+    ("import lab2", "import lab2", 10, False),
+    ("environment", "import lab2; lab2.DisasterEnvironment", 250, False),
+    ("event logger", "import lab2; lab2.EventLogger; lab2.merge_reports", 250, False),
+    ("simulation", "import lab2; lab2.simulate_monitoring", 300, False),
+    ("replay", "import lab2; lab2.replay_log", 250, False),
+    ("sensor agent", "import lab2; lab2.SensorAgent", 3000, True),
+]
+
+
+def run_importtime(code: str) -> Tuple[Dict[str, int], str]:
+    """
+    Run code in a fresh interpreter with -X importtime.
+
+    Returns:
+        Cumulative microseconds of each top-level import, and stdout
+    """
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=PROJECT_ROOT, env=env, check=True
+    )
+    # Top-level imports have no indentation before the module name; their
+    # cumulative times add up to the total import time
+    imports = {}
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if (not line.startswith("import time:") or len(fields) != 3
+                or fields[2].startswith("  ") or not fields[1].strip().isdigit()):
+            continue
+        imports[fields[2].strip()] = int(fields[1])
+    return imports, result.stdout
+
+
+def measure_import(code: str, startup: Set[str]) -> Tuple[float, List[str]]:
+    """
+    Measure the imports done by code, excluding interpreter startup.
+
+    Returns:
+        Import time in milliseconds and the agent-stack modules loaded
+    """
+    probe = (f"{code}\nimport sys\n"
+             f"print(','.join(m for m in {AGENT_STACK!r} if m in sys.modules))")
+    imports, stdout = run_importtime(probe)
+    total_us = sum(us for name, us in imports.items() if name not in startup)
+    loaded = [name for name in stdout.strip().split(",") if name]
+    return total_us / 1000, loaded
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5,
+                        help="interpreter starts per scenario; the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply every budget, e.g. for slow machines")
+    args = parser.parse_args(argv)
+
+    startup = set(run_importtime("pass")[0])
+    ok = True
+    print(f"{'scenario':16} {'best ms':>10} {'budget ms':>10}  agent stack")
+    for name, code, budget, agents_allowed in SCENARIOS:
+        timings = []
+        loaded: List[str] = []
+        for _ in range(args.runs):
+            elapsed, loaded = measure_import(code, startup)
+            timings.append(elapsed)
+        best = min(timings)
+        limit = budget * args.scale
+        problems = []
+        if best > limit:
+            problems.append("OVER BUDGET")
+        if loaded and not agents_allowed:
+            problems.append("LOADS AGENT STACK")
+        ok = ok and not problems
+        print(f"{name:16} {best:>10.1f} {limit:>10.0f}  {','.join(loaded) or '-':12} "
+              f"{' '.join(problems)}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
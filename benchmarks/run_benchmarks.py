@@ -0,0 +1,227 @@
+"""
+Benchmark suite for the lab2 hot paths
+
+Measures DisasterEnvironment.generate_event, get_event_summary and
+get_recent_events, EventLogger.log_event, save_logs and generate_report,
+analyze_environment_state (a fresh analysis after a change, a cached
+snapshot, and a conditional fetch of an unchanged environment) and one
+EnvironmentMonitorBehaviour cycle (with and without metrics) at history
+sizes from 10^2 to 10^6 events. Everything runs offline: the monitor
+behaviour is driven through run_cycle() without an agent or an XMPP
+connection.
+
+For every (benchmark, history size) pair the suite records throughput,
+latency percentiles and the peak memory allocated by the operation, and
+writes the results as JSON so runs can be compared.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 100 1000 ...] [--output results.json]
+    python benchmarks/run_benchmarks.py --compare baseline.json [--threshold 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lab2.disaster_environment import DisasterEnvironment
+from lab2.event_logger import EventLogger, analyze_environment_state
+from lab2.metrics import MetricsRegistry
+from lab2.sensor_agent import EnvironmentMonitorBehaviour
+
+DEFAULT_SIZES = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+
+def measure(operation: Callable[[], object], ops: int, memory_ops: int) -> Dict:
+    """
+    Time `ops` calls of an operation, then trace memory over `memory_ops` calls.
+
+    A warm-up of ops // 10 untimed calls comes first. Timing and memory
+    tracing are separate passes because tracemalloc slows down
+    allocation-heavy code considerably.
+    """
+    for _ in range(ops // 10):
+        operation()
+
+    latencies = []
+    clock = time.perf_counter
+    start = clock()
+    for _ in range(ops):
+        t0 = clock()
+        operation()
+        latencies.append(clock() - t0)
+    elapsed = clock() - start
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for _ in range(memory_ops):
+        operation()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "ops": ops,
+        "ops_per_sec": round(ops / elapsed, 2) if elapsed else None,
+        "latency_us": {
+            "p50": round(percentile(latencies, 0.50) * 1e6, 2),
+            "p95": round(percentile(latencies, 0.95) * 1e6, 2),
+            "p99": round(percentile(latencies, 0.99) * 1e6, 2),
+            "max": round(latencies[-1] * 1e6, 2)
+        },
+        "peak_memory_bytes": peak
+    }
+
+
+def build_environment(size: int, columnar: bool) -> DisasterEnvironment:
+    environment = DisasterEnvironment(seed=0, columnar=columnar)
+    environment.generate_events(size)
+    return environment
+
+
+def run_suite(sizes: List[int], columnar: bool, ops: int, workdir: Path) -> List[Dict]:
+    """
+    Run every benchmark at every history size.
+
+    Returns:
+        List of result dictionaries
+    """
+    results = []
+    loop = asyncio.new_event_loop()
+
+    for size in sizes:
+        environment = build_environment(size, columnar)
+        event_logger = EventLogger(str(workdir / f"bench_{size}.json"))
+        event_logger.log_events(environment.events)
+        behaviour = EnvironmentMonitorBehaviour(environment=environment, period=0)
+        instrumented = EnvironmentMonitorBehaviour(environment=environment, period=0,
+                                                   metrics=MetricsRegistry())
+        sample = environment.get_recent_events(1)[0]
+
+        def analyze_changed(environment=environment):
+            # A new version misses the analysis cache, as after a new event
+            environment.version += 1
+            return analyze_environment_state(environment)
+
+        # Operations that rewrite or rescan the whole history get fewer repetitions
+        whole_history_ops = max(1, min(ops, 10 ** 6 // size))
+        benchmarks = {
+            "generate_event": (environment.generate_event, ops),
+            "get_event_summary": (environment.get_event_summary, ops),
+            "get_recent_events": (environment.get_recent_events, ops),
+            "analyze_environment_state": (analyze_changed, ops),
+            "analyze_cached": (lambda: analyze_environment_state(environment), ops),
+            "analyze_unchanged_since": (
+                lambda: analyze_environment_state(environment, since_version=environment.version), ops),
+            "log_event": (lambda: event_logger.log_event(sample), ops),
+            "generate_report": (event_logger.generate_report, ops),
+            "save_logs": (event_logger.save_logs, whole_history_ops),
+            "monitor_cycle": (lambda: loop.run_until_complete(behaviour.run_cycle()), ops),
+            "monitor_cycle_instrumented": (lambda: loop.run_until_complete(instrumented.run_cycle()), ops),
+        }
+
+        for name, (operation, count) in benchmarks.items():
+            result = measure(operation, count, memory_ops=min(count, 10))
+            result.update({"benchmark": name, "history": size})
+            results.append(result)
+            print(f"{name:28} {size:>9,} {result['ops_per_sec']:>14,.1f} ops/s "
+                  f"p50 {result['latency_us']['p50']:>12,.1f}us "
+                  f"p99 {result['latency_us']['p99']:>12,.1f}us "
+                  f"peak {result['peak_memory_bytes']:>12,} B")
+
+    loop.close()
+    return results
+
+
+def compare(current: List[Dict], baseline: List[Dict], threshold: float) -> bool:
+    """
+    Print median latency changes against a baseline run.
+
+    The median is used rather than throughput because it is far less
+    sensitive to scheduler and garbage-collector outliers.
+
+    Returns:
+        True if no benchmark's median latency grew by more than `threshold`
+    """
+    previous = {(r["benchmark"], r["history"]): r for r in baseline}
+    ok = True
+    print(f"\n{'benchmark':28} {'history':>9} {'base p50 us':>14} {'p50 us':>14} {'change':>8}")
+    for result in current:
+        before = previous.get((result["benchmark"], result["history"]))
+        if before is None or not before["latency_us"]["p50"]:
+            continue
+        old, new = before["latency_us"]["p50"], result["latency_us"]["p50"]
+        change = new / old - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"{result['benchmark']:28} {result['history']:>9,} {old:>14,.2f} "
+              f"{new:>14,.2f} {change:>+7.1%}{flag}")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="history sizes to benchmark")
+    parser.add_argument("--ops", type=int, default=1000,
+                        help="operations timed per benchmark")
+    parser.add_argument("--columnar", action="store_true",
+                        help="use a columnar event store")
+    parser.add_argument("--output", default="bench_results.json",
+                        help="file to write JSON results to")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="JSON results of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative median latency increase that counts as a regression")
+    args = parser.parse_args(argv)
+
+    # Keep handler I/O out of the measurements
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = run_suite(args.sizes, args.columnar, args.ops, Path(workdir))
+
+    document = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "columnar": args.columnar,
+            "ops": args.ops,
+            "sizes": args.sizes,
+            "generated": datetime.now().isoformat()
+        },
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if not compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Scale harness: many SensorAgents in one process on the local transport
+
+Starts N SensorAgents without an XMPP server, all monitoring one shared
+columnar DisasterEnvironment. Each agent also pings a random peer at a
+fixed interval so that in-process message latency can be measured.
+
+Reports:
+- sensor behaviour cycles per second (total and per agent)
+- message latency percentiles
+- memory allocated per agent while creating and starting the fleet
+- missed deadlines of the shared cycle scheduler
+
+Usage:
+    python benchmarks/scale_agents.py [--agents 1000] [--duration 10] [--period 1.0]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from spade.behaviour import CyclicBehaviour, PeriodicBehaviour
+from spade.message import Message
+from spade.template import Template
+
+from lab2.disaster_environment import DisasterEnvironment
+from lab2.local_transport import local_agent
+from lab2.scheduler import get_scheduler
+from lab2.sensor_agent import SensorAgent
+
+
+class PingBehaviour(PeriodicBehaviour):
+    """Send a timestamped ping to a random peer."""
+
+    def __init__(self, period: float, peers):
+        super().__init__(period=period)
+        self.peers = peers
+
+    async def run(self):
+        msg = Message(to=random.choice(self.peers))
+        msg.set_metadata("performative", "ping")
+        msg.set_metadata("sent", repr(time.perf_counter()))
+        await self.send(msg)
+
+
+class PingReceiverBehaviour(CyclicBehaviour):
+    """Record the delivery latency of incoming pings."""
+
+    def __init__(self, latencies):
+        super().__init__()
+        self.latencies = latencies
+
+    async def run(self):
+        msg = await self.receive(timeout=1)
+        if msg is not None:
+            self.latencies.append(time.perf_counter() - float(msg.get_metadata("sent")))
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+
+async def run_fleet(agents: int, duration: float, period: float, ping_interval: float,
+                    jitter: float):
+    """Create, run and stop the fleet; return the measurements."""
+    environment = DisasterEnvironment(seed=0, columnar=True)
+    latencies = []
+    jids = [f"sensor_{i}@localhost" for i in range(agents)]
+    agent_class = local_agent(SensorAgent)
+
+    template = Template()
+    template.set_metadata("performative", "ping")
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    fleet = []
+    for jid in jids:
+        agent = agent_class(jid, "local", environment=environment, period=period,
+                            jitter=jitter)
+        agent.add_behaviour(PingBehaviour(ping_interval, jids))
+        agent.add_behaviour(PingReceiverBehaviour(latencies), template)
+        fleet.append(agent)
+    for agent in fleet:
+        await agent.start(auto_register=False)
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    # Measure a steady-state interval after every agent is up
+    await asyncio.sleep(min(period, 1.0))
+    start_events = environment.event_counter
+    scheduler = get_scheduler()
+    start_missed = scheduler.missed
+    latencies.clear()
+    loop = asyncio.get_running_loop()
+    lag = []
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration:
+        tick = loop.time()
+        await asyncio.sleep(0.1)
+        lag.append(loop.time() - tick - 0.1)
+    elapsed = time.perf_counter() - started
+    cycles = environment.event_counter - start_events
+    missed = scheduler.missed - start_missed
+    samples = sorted(latencies)
+
+    for agent in fleet:
+        await agent.stop()
+
+    lag.sort()
+    return {
+        "agents": agents,
+        "duration_s": round(elapsed, 2),
+        "period_s": period,
+        "cycles": cycles,
+        "cycles_per_sec": round(cycles / elapsed, 1),
+        "cycles_per_sec_per_agent": round(cycles / elapsed / agents, 3),
+        "missed_deadlines": missed,
+        "messages": len(samples),
+        "message_latency_ms": {
+            name: round(percentile(samples, p) * 1000, 3) if samples else None
+            for name, p in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        },
+        "event_loop_lag_ms_p99": round(percentile(lag, 0.99) * 1000, 3) if lag else None,
+        "memory_per_agent_bytes": memory // agents
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--agents", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0,
+                        help="measured seconds of steady-state operation")
+    parser.add_argument("--period", type=float, default=1.0,
+                        help="sensor cycle period in seconds")
+    parser.add_argument("--jitter", type=float, default=0.5,
+                        help="cycle jitter as a fraction of the period")
+    parser.add_argument("--ping-interval", type=float, default=1.0,
+                        help="seconds between pings sent by each agent")
+    args = parser.parse_args()
+
+    # Per-cycle sensor logging would dominate the measurement
+    logging.disable(logging.WARNING)
+
+    result = asyncio.run(run_fleet(args.agents, args.duration, args.period, args.ping_interval,
+                                     args.jitter))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Stress test: concurrent writers on a shared environment
+
+Starts 1, 2, 4, 8 and 16 writer threads that generate events into one
+ConcurrentDisasterEnvironment while a reader thread keeps merging
+summaries, then checks that no event was lost or duplicated:
+
+- the summary's event count is threads x events
+- every event ID is unique
+- the summary's severity, population and critical totals match a
+  recount of the merged events, as do the rolling window totals
+
+For comparison the same load is run on a plain DisasterEnvironment, and
+its duplicate IDs and lost events are reported. Throughput only scales
+with threads on free-threaded Python; with a global interpreter lock
+the check is that it does not collapse under contention.
+
+Usage:
+    python benchmarks/stress_environment.py [--events 20000] [--threads 1 2 4 8 16]
+"""
+
+import argparse
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lab2.concurrent_environment import ConcurrentDisasterEnvironment
+from lab2.disaster_environment import DisasterEnvironment, SeverityLevel
+
+
+def run_writers(environment, threads: int, events: int, batch: int) -> float:
+    """
+    Generate events from several threads at once while a reader polls.
+
+    Returns:
+        Wall-clock seconds from start to the last writer finishing
+    """
+    barrier = threading.Barrier(threads + 1)
+    done = threading.Event()
+
+    def writer():
+        barrier.wait()
+        remaining = events
+        while remaining > 0:
+            if batch > 1:
+                count = min(batch, remaining)
+                environment.generate_events(count)
+            else:
+                count = 1
+                environment.generate_event()
+            remaining -= count
+
+    def reader():
+        while not done.is_set():
+            environment.get_event_summary()
+            time.sleep(0.001)
+
+    workers = [threading.Thread(target=writer) for _ in range(threads)]
+    poller = threading.Thread(target=reader)
+    for worker in workers:
+        worker.start()
+    poller.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    poller.join()
+    return elapsed
+
+
+def check(environment, expected: int) -> list:
+    """Verify counts and IDs; returns a list of problems."""
+    problems = []
+    summary = environment.get_event_summary()
+    events = environment.events
+    ids = {event.event_id for event in events}
+    if summary["total_events"] != expected:
+        problems.append(f"summary counts {summary['total_events']} events, expected {expected}")
+    if len(events) != expected:
+        problems.append(f"{len(events)} events retained, expected {expected}")
+    if len(ids) != len(events):
+        problems.append(f"{len(events) - len(ids)} duplicate event IDs")
+    population = sum(event.affected_population for event in events)
+    critical = sum(1 for event in events if event.severity_level is SeverityLevel.CRITICAL)
+    severity = sum(event.severity_level.value for event in events)
+    average = round(severity / len(events), 2) if events else 0
+    if (summary["total_affected_population"], summary["critical_events"],
+            summary["average_severity"]) != (population, critical, average):
+        problems.append("summary totals disagree with the events")
+    hour = environment.get_window_summary()["1h"]
+    if (hour["total_events"], hour["total_affected_population"]) != (len(events), population):
+        problems.append("window totals disagree with the events")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000, help="events per writer thread")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--batch", type=int, default=1,
+                        help="events per generate_events() call (1 uses generate_event)")
+    parser.add_argument("--columnar", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, "
+          f"{args.events:,} events per thread")
+    print(f"{'threads':>7} {'seconds':>9} {'events/s':>12} {'speedup':>8} "
+          f"{'unsafe dup ids':>15} {'unsafe lost':>12}  check")
+
+    ok = True
+    baseline = None
+    for threads in args.threads:
+        expected = threads * args.events
+        environment = ConcurrentDisasterEnvironment(seed=0, columnar=args.columnar)
+        elapsed = run_writers(environment, threads, args.events, args.batch)
+        problems = check(environment, expected)
+        ok = ok and not problems
+        rate = expected / elapsed
+        baseline = baseline or rate
+
+        unsafe = DisasterEnvironment(seed=0, columnar=args.columnar)
+        run_writers(unsafe, threads, args.events, args.batch)
+        unsafe_events = list(unsafe.events)
+        duplicates = len(unsafe_events) - len({event.event_id for event in unsafe_events})
+        lost = expected - unsafe.get_event_summary()["total_events"]
+
+        print(f"{threads:>7} {elapsed:>9.2f} {rate:>12,.0f} {rate / baseline:>7.2f}x "
+              f"{duplicates:>15,} {lost:>12,}  {'; '.join(problems) or 'ok'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,10 +7,15 @@ basic agent functionality and XMPP communication.
 """
 
 import asyncio
+import sys
+from pathlib import Path
 from spade.agent import Agent
 from spade.behaviour import OneShotBehaviour
 import logging
 
+# Add project root to path for the shared local transport
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -43,13 +48,16 @@ class BasicAgent(Agent):
         logger.info("Startup behavior registered")
 
 
-async def main():
+async def main(local: bool = False):
     """
     Main function to create and run the basic agent.
     
     Configuration:
     - JID (Jabber ID): james_016@xmpp.jp
     - XMPP Server: xmpp.jp (standard port 5222)
+    
+    Args:
+        local: Run on the in-process transport instead of the XMPP server
     """
     
     # Agent credentials
@@ -57,7 +65,11 @@ async def main():
     password = "dk1963"
     
     # Create and configure agent
-    agent = BasicAgent(jid, password)
+    agent_class = BasicAgent
+    if local:
+        from lab2.local_transport import local_agent
+        agent_class = local_agent(BasicAgent)
+    agent = agent_class(jid, password)
     
     try:
         # Start the agent
@@ -81,4 +93,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(main(local="--local" in sys.argv))
@@ -5,27 +5,95 @@ This package contains:
 - DisasterEnvironment: Simulated disaster environment
 - SensorAgent: Agent that perceives environmental events
 - EventLogger: Logging and analysis utilities
+- MetricsRegistry: Opt-in behaviour metrics with a Prometheus exporter
+- VirtualClock, run_simulation: Simulated time for fast, deterministic runs
+- SpatialModel, WildfireGrid, FloodGrid: Event positions and hazard spread
+- EventReplayer, replay_log: Streaming replay of recorded event logs
+- IncidentCorrelator: Groups repeated reports of one disaster into incidents
+- SegmentedLog: Time-range reads and reports over segmented event logs
+- SqliteEventLog: Indexed queries and SQL reports over SQLite event logs
+- run_monte_carlo: Parallel seeded what-if simulations
+- ConcurrentDisasterEnvironment: Environment shared by sensors in several threads
+- EventSubscriberAgent, encode_batch, decode_batch: Batched event publication
+
+Names are imported lazily on first access, so `import lab2` is cheap and
+SPADE is only loaded once an agent class is used.
 """
 
-from .disaster_environment import (
-    DisasterEnvironment,
-    DisasterEvent,
-    DisasterType,
-    SeverityLevel,
-    get_environment
-)
-
-from .sensor_agent import SensorAgent, run_sensor_agent
-from .event_logger import EventLogger, analyze_environment_state
-
-__all__ = [
-    'DisasterEnvironment',
-    'DisasterEvent',
-    'DisasterType',
-    'SeverityLevel',
-    'get_environment',
-    'SensorAgent',
-    'run_sensor_agent',
-    'EventLogger',
-    'analyze_environment_state'
-]
+import importlib
+from typing import TYPE_CHECKING
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'DisasterEnvironment': 'disaster_environment',
+    'DisasterEvent': 'disaster_environment',
+    'DisasterType': 'disaster_environment',
+    'SeverityLevel': 'disaster_environment',
+    'get_environment': 'disaster_environment',
+    'to_dicts': 'disaster_environment',
+    'to_records': 'disaster_environment',
+    'SensorAgent': 'sensor_agent',
+    'run_sensor_agent': 'sensor_agent',
+    'EventLogger': 'event_logger',
+    'analyze_environment_state': 'event_logger',
+    'merge_reports': 'event_logger',
+    'MetricsRegistry': 'metrics',
+    'start_http_server': 'metrics',
+    'VirtualClock': 'simulation',
+    'run_simulation': 'simulation',
+    'simulate_monitoring': 'simulation',
+    'SpatialModel': 'spatial',
+    'WildfireGrid': 'spatial',
+    'FloodGrid': 'spatial',
+    'EventReplayer': 'replay',
+    'ReplayClock': 'replay',
+    'replay_log': 'replay',
+    'IncidentCorrelator': 'correlation',
+    'SegmentedLog': 'segmented_log',
+    'SqliteEventLog': 'sqlite_log',
+    'run_monte_carlo': 'monte_carlo',
+    'ConcurrentDisasterEnvironment': 'concurrent_environment',
+    'EventSubscriberAgent': 'messaging',
+    'encode_batch': 'event_codec',
+    'decode_batch': 'event_codec'
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .disaster_environment import (
+        DisasterEnvironment,
+        DisasterEvent,
+        DisasterType,
+        SeverityLevel,
+        get_environment,
+        to_dicts,
+        to_records
+    )
+    from .sensor_agent import SensorAgent, run_sensor_agent
+    from .event_logger import EventLogger, analyze_environment_state, merge_reports
+    from .metrics import MetricsRegistry, start_http_server
+    from .simulation import VirtualClock, run_simulation, simulate_monitoring
+    from .spatial import SpatialModel, WildfireGrid, FloodGrid
+    from .replay import EventReplayer, ReplayClock, replay_log
+    from .correlation import IncidentCorrelator
+    from .segmented_log import SegmentedLog
+    from .sqlite_log import SqliteEventLog
+    from .monte_carlo import run_monte_carlo
+    from .concurrent_environment import ConcurrentDisasterEnvironment
+    from .messaging import EventSubscriberAgent
+    from .event_codec import encode_batch, decode_batch
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,313 @@
+"""
+LAB 2: Concurrent Disaster Environment
+
+DisasterEnvironment is not safe to share between threads: generating an
+event increments event_counter, appends to the history and updates the
+running aggregates without synchronisation, so concurrent sensors can
+race on event IDs and lose updates. This module provides a drop-in
+environment for sensors that run in several threads:
+
+- Every writer thread gets its own shard, a private DisasterEnvironment
+  with its own generator, history, aggregates, windows and indexes, so
+  writers never touch each other's data.
+- Event numbers come from a shared EventIdAllocator in blocks, so a
+  thread takes the allocator's lock once per block rather than once per
+  event and IDs stay unique across shards.
+- Each shard has its own lock, which its writer holds while generating;
+  it is uncontended except while a reader merges. Readers take every
+  shard lock, in a fixed order, and merge the shards' aggregates,
+  windows and events, so summaries are consistent snapshots.
+
+This does not make writes faster than one thread can go on an
+interpreter with a global interpreter lock, but it keeps them correct,
+and on free-threaded Python writers proceed in parallel.
+"""
+
+import heapq
+import sys
+import threading
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from .disaster_environment import (
+        DisasterEnvironment, DisasterEvent, SeverityLevel, _timestamp_to_micros
+    )
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from disaster_environment import (
+        DisasterEnvironment, DisasterEvent, SeverityLevel, _timestamp_to_micros
+    )
+
+
+class EventIdAllocator:
+    """Thread-safe source of unique, increasing event numbers."""
+
+    def __init__(self, start: int = 1):
+        """
+        Initialize the allocator.
+
+        Args:
+            start: First event number to hand out
+        """
+        self._next = start
+        self._lock = threading.Lock()
+
+    def allocate(self, count: int) -> int:
+        """
+        Reserve a contiguous range of event numbers.
+
+        Args:
+            count: Number of event numbers to reserve
+
+        Returns:
+            The first number of the range
+        """
+        with self._lock:
+            first = self._next
+            self._next += count
+        return first
+
+    @property
+    def allocated(self) -> int:
+        """Highest event number handed out so far."""
+        return self._next - 1
+
+
+class _Shard:
+    """One writer thread's environment and the lock that guards it."""
+
+    __slots__ = ("environment", "lock", "next_number", "block_end")
+
+    def __init__(self, environment: DisasterEnvironment):
+        self.environment = environment
+        self.lock = threading.Lock()
+        self.next_number = 0
+        self.block_end = 0
+
+
+def _event_order(event: DisasterEvent):
+    return event.timestamp, int(event.event_id[4:])
+
+
+class ConcurrentDisasterEnvironment:
+    """
+    Disaster environment that many threads can generate events into.
+
+    Offers the DisasterEnvironment methods that sensors and the analysis
+    tools use. Event IDs are unique but, because threads reserve them in
+    blocks, not dense: a thread's unused block is not handed to others,
+    so the highest ID can exceed the number of events.
+    """
+
+    def __init__(self, seed: Optional[int] = None, block_size: int = 1024,
+                 clock=None, **environment_kwargs):
+        """
+        Initialize the environment.
+
+        Args:
+            seed: Seed from which every shard's generator is derived; with a
+                seed, each thread's events are reproducible when threads
+                create their shards in the same order
+            block_size: Event numbers a thread reserves at a time
+            clock: Object whose now() returns the current datetime
+                (default: the wall clock)
+            **environment_kwargs: Further DisasterEnvironment arguments for
+                every shard, e.g. columnar=True; max_events applies per shard
+        """
+        if block_size <= 0:
+            raise ValueError("block_size must be positive")
+        self.block_size = block_size
+        self.clock = clock
+        self._now = clock.now if clock is not None else datetime.now
+        self._environment_kwargs = environment_kwargs
+        self._seeds = np.random.SeedSequence(seed)
+        self.ids = EventIdAllocator()
+
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _shard(self) -> _Shard:
+        """The calling thread's shard, created on first use."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            with self._shards_lock:
+                seed = self._seeds.spawn(1)[0]
+                shard = _Shard(DisasterEnvironment(seed=seed, clock=self.clock,
+                                                   **self._environment_kwargs))
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    @contextmanager
+    def _locked_shards(self) -> Iterator[List[_Shard]]:
+        """Lock every shard, in creation order, for a consistent read."""
+        with self._shards_lock:
+            shards = list(self._shards)
+        with ExitStack() as stack:
+            for shard in shards:
+                stack.enter_context(shard.lock)
+            yield shards
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    @property
+    def event_counter(self) -> int:
+        """Highest event number allocated so far; see the class docstring."""
+        return self.ids.allocated
+
+    @property
+    def version(self) -> int:
+        """Increases whenever events are added to any shard."""
+        with self._locked_shards() as shards:
+            return sum(shard.environment.version for shard in shards)
+
+    def now(self) -> datetime:
+        """Current time on this environment's clock."""
+        return self._now()
+
+    def generate_event(self) -> DisasterEvent:
+        """
+        Generate a random disaster event in the calling thread's shard.
+
+        Returns:
+            DisasterEvent: A newly generated disaster event
+        """
+        shard = self._shard()
+        with shard.lock:
+            if shard.next_number >= shard.block_end:
+                shard.next_number = self.ids.allocate(self.block_size)
+                shard.block_end = shard.next_number + self.block_size
+            # The shard numbers its next event event_counter + 1
+            shard.environment.event_counter = shard.next_number - 1
+            event = shard.environment.generate_event()
+            shard.next_number += 1
+        return event
+
+    def generate_events(self, n: int) -> Sequence[DisasterEvent]:
+        """
+        Generate a batch of events in the calling thread's shard.
+
+        Batches that fit in the thread's current block use it; larger ones
+        reserve their own contiguous range.
+
+        Args:
+            n: Number of events to generate
+
+        Returns:
+            Sequence of the newly generated events, oldest first
+        """
+        shard = self._shard()
+        with shard.lock:
+            if shard.next_number + n <= shard.block_end:
+                first = shard.next_number
+                shard.next_number += n
+            else:
+                first = self.ids.allocate(n)
+            shard.environment.event_counter = first - 1
+            return shard.environment.generate_events(n)
+
+    def get_event_summary(self) -> Dict:
+        """
+        Get a summary of all events, merged over the shards.
+
+        Returns:
+            Dictionary with the same layout as DisasterEnvironment.get_event_summary()
+        """
+        total_events = severity_sum = population = critical = 0
+        with self._locked_shards() as shards:
+            for shard in shards:
+                environment = shard.environment
+                total_events += environment._event_count
+                severity_sum += environment._severity_sum
+                population += environment._population_sum
+                critical += environment.severity_counts.get(SeverityLevel.CRITICAL.value, 0)
+        avg_severity = severity_sum / total_events if total_events > 0 else 0
+        return {
+            "total_events": total_events,
+            "average_severity": round(avg_severity, 2),
+            "total_affected_population": population,
+            "critical_events": critical,
+            "environmental_status": "Unstable" if avg_severity > 3 else "Monitoring"
+        }
+
+    def get_window_summary(self) -> Dict[str, Dict]:
+        """
+        Get rolling statistics for recent activity, merged over the shards.
+
+        Returns:
+            Mapping of window label to a summary, as DisasterEnvironment.get_window_summary()
+        """
+        now_us = _timestamp_to_micros(self._now())
+        totals: Dict[str, List] = {}
+        with self._locked_shards() as shards:
+            for shard in shards:
+                for label, window in shard.environment.windows.windows.items():
+                    window.expire(now_us)
+                    total = totals.setdefault(label, [window.window_seconds, 0, 0, 0, 0])
+                    total[1] += window.events
+                    total[2] += window.severity_sum
+                    total[3] += window.population
+                    total[4] += window.critical
+        summaries = {}
+        for label, (window_seconds, events, severity_sum, population, critical) in totals.items():
+            average = severity_sum / events if events > 0 else 0
+            summaries[label] = {
+                "window_seconds": window_seconds,
+                "total_events": events,
+                "average_severity": round(average, 2),
+                "total_affected_population": population,
+                "critical_events": critical,
+                "environmental_status": "Unstable" if average > 3 else "Monitoring"
+            }
+        return summaries
+
+    def _merge(self, per_shard: List[List[DisasterEvent]]) -> Iterator[DisasterEvent]:
+        return heapq.merge(*per_shard, key=_event_order)
+
+    def get_recent_events(self, limit: int = 5) -> List[DisasterEvent]:
+        """Get the most recent events across all shards."""
+        if limit <= 0:
+            return []
+        with self._locked_shards() as shards:
+            per_shard = [shard.environment.get_recent_events(limit) for shard in shards]
+        return list(self._merge(per_shard))[-limit:]
+
+    def query(self, disaster_type=None, location: Optional[str] = None,
+              min_severity=None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None,
+              limit: Optional[int] = None) -> List[DisasterEvent]:
+        """
+        Find retained events matching all of the given filters, across all
+        shards; see DisasterEnvironment.query().
+
+        Returns:
+            Matching events, oldest first
+        """
+        with self._locked_shards() as shards:
+            per_shard = [
+                shard.environment.query(disaster_type, location, min_severity, since, until, limit)
+                for shard in shards
+            ]
+        events = list(self._merge(per_shard))
+        if limit is not None:
+            events = events[-limit:] if limit > 0 else []
+        return events
+
+    @property
+    def events(self) -> List[DisasterEvent]:
+        """
+        All retained events, merged into timestamp order.
+
+        Materialises the whole history; intended for inspection and tests.
+        """
+        with self._locked_shards() as shards:
+            per_shard = [list(shard.environment.events) for shard in shards]
+        return list(self._merge(per_shard))
@@ -0,0 +1,270 @@
+"""
+LAB 2: Incident Correlation
+
+Several sensors, or one sensor over several cycles, often report the same
+ongoing disaster as separate events. This module clusters events of the
+same type at the same location into incidents: an event joins the open
+incident for its (type, location) if that incident was last seen no more
+than `window_seconds` earlier, and opens a new incident otherwise.
+
+Each incident keeps rollups (event count, peak severity, peak affected
+population), and the correlator keeps running totals over incidents, so
+population and critical counts are not inflated by repeated reports.
+
+Open incidents are kept in a hash map by key and in time buckets one
+window wide, by the time they were last seen. Moving an incident between
+buckets and dropping whole buckets of stale incidents are O(1) per
+incident, so correlation costs amortized O(1) per event.
+"""
+
+import heapq
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+# Same epoch as the environment's timestamps
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+CRITICAL_SEVERITY = 5
+
+
+def _micros_to_timestamp(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+class Incident:
+    """
+    A cluster of events with the same type and location.
+
+    Attributes:
+        incident_id: Sequential identifier, e.g. "INC_0001"
+        disaster_type: Disaster type value shared by the events
+        location: Location shared by the events
+        first_seen_us: Earliest event timestamp, epoch microseconds
+        last_seen_us: Latest event timestamp, epoch microseconds
+        events: Number of events in the incident
+        severity_sum: Sum of the events' severity levels
+        max_severity: Highest severity level reported
+        peak_population: Largest affected population reported
+    """
+
+    __slots__ = (
+        "incident_id", "disaster_type", "location", "first_seen_us", "last_seen_us",
+        "events", "severity_sum", "max_severity", "peak_population"
+    )
+
+    def __init__(self, incident_id: str, disaster_type: str, location: str, timestamp_us: int):
+        self.incident_id = incident_id
+        self.disaster_type = disaster_type
+        self.location = location
+        self.first_seen_us = timestamp_us
+        self.last_seen_us = timestamp_us
+        self.events = 0
+        self.severity_sum = 0
+        self.max_severity = 0
+        self.peak_population = 0
+
+    def to_dict(self) -> Dict:
+        """Convert the incident to a dictionary for logging and reports."""
+        return {
+            "incident_id": self.incident_id,
+            "disaster_type": self.disaster_type,
+            "location": self.location,
+            "first_seen": _micros_to_timestamp(self.first_seen_us).isoformat(),
+            "last_seen": _micros_to_timestamp(self.last_seen_us).isoformat(),
+            "events": self.events,
+            "average_severity": round(self.severity_sum / self.events, 2) if self.events else 0,
+            "max_severity": self.max_severity,
+            "affected_population": self.peak_population
+        }
+
+
+class IncidentCorrelator:
+    """
+    Incrementally groups an event stream into incidents.
+
+    Time is taken from the events: the newest timestamp seen acts as the
+    current time when stale incidents are expired. An incident is closed
+    when a later event for its key arrives after the window, or by
+    expiry at most two windows after it was last seen.
+    """
+
+    def __init__(self, window_seconds: float = 300.0, max_closed: int = 1000,
+                 on_close: Optional[Callable[[Incident], None]] = None):
+        """
+        Initialize an empty correlator.
+
+        Args:
+            window_seconds: Longest gap between two events of one incident
+            max_closed: Number of recently closed incidents to keep
+            on_close: Called with each incident when it is closed
+        """
+        if window_seconds <= 0:
+            raise ValueError("window_seconds must be positive")
+        self.window_seconds = window_seconds
+        self.window_us = max(1, int(window_seconds * 1_000_000))
+        self.on_close = on_close
+        self.closed: Deque[Incident] = deque(maxlen=max_closed)
+
+        self._open: Dict[Tuple[Hashable, Hashable], Incident] = {}
+        # Bucket id (last_seen_us // window_us) -> open incidents by key
+        self._buckets: Dict[int, Dict[Tuple[Hashable, Hashable], Incident]] = {}
+        self._bucket_heap: List[int] = []
+        self._watermark_us: Optional[int] = None
+        self._expired_through = None
+
+        # Running totals over every incident, open or closed
+        self.incident_count = 0
+        self.event_count = 0
+        self._max_severity_sum = 0
+        self._population_sum = 0
+        self.critical_incidents = 0
+
+    def __len__(self) -> int:
+        """Number of open incidents."""
+        return len(self._open)
+
+    def observe(self, event) -> Incident:
+        """
+        Correlate one DisasterEvent.
+
+        Returns:
+            The incident the event was assigned to
+        """
+        return self.add(event.disaster_type.value, event.location,
+                        (event.timestamp - _EPOCH) // _MICROSECOND,
+                        1, event.severity_level.value, event.severity_level.value,
+                        event.affected_population)
+
+    def add(self, disaster_type: str, location: str, timestamp_us: int, events: int,
+            severity_sum: int, max_severity: int, max_population: int) -> Incident:
+        """
+        Correlate aggregated statistics for events sharing a type, location
+        and timestamp.
+
+        Args:
+            disaster_type: Disaster type value
+            location: Location name
+            timestamp_us: Event timestamp in epoch microseconds
+            events: Number of events
+            severity_sum: Sum of their severity levels
+            max_severity: Highest severity among them
+            max_population: Largest affected population among them
+
+        Returns:
+            The incident the events were assigned to
+        """
+        if self._watermark_us is None or timestamp_us > self._watermark_us:
+            self._watermark_us = timestamp_us
+            if timestamp_us // self.window_us != self._expired_through:
+                self.expire(timestamp_us)
+
+        key = (disaster_type, location)
+        incident = self._open.get(key)
+        if incident is not None and timestamp_us - incident.last_seen_us > self.window_us:
+            self._close(key, incident)
+            incident = None
+        if incident is None:
+            self.incident_count += 1
+            incident = Incident(f"INC_{self.incident_count:04d}", disaster_type, location,
+                                timestamp_us)
+            self._open[key] = incident
+            self._bucket(timestamp_us)[key] = incident
+        elif timestamp_us > incident.last_seen_us:
+            old_bucket = incident.last_seen_us // self.window_us
+            if timestamp_us // self.window_us != old_bucket:
+                del self._buckets[old_bucket][key]
+                self._bucket(timestamp_us)[key] = incident
+            incident.last_seen_us = timestamp_us
+        elif timestamp_us < incident.first_seen_us:
+            incident.first_seen_us = timestamp_us
+
+        incident.events += events
+        incident.severity_sum += severity_sum
+        self.event_count += events
+        if max_severity > incident.max_severity:
+            if max_severity >= CRITICAL_SEVERITY > incident.max_severity:
+                self.critical_incidents += 1
+            self._max_severity_sum += max_severity - incident.max_severity
+            incident.max_severity = max_severity
+        if max_population > incident.peak_population:
+            self._population_sum += max_population - incident.peak_population
+            incident.peak_population = max_population
+        return incident
+
+    def _bucket(self, timestamp_us: int) -> Dict[Tuple[Hashable, Hashable], Incident]:
+        bucket_id = timestamp_us // self.window_us
+        bucket = self._buckets.get(bucket_id)
+        if bucket is None:
+            bucket = self._buckets[bucket_id] = {}
+            heapq.heappush(self._bucket_heap, bucket_id)
+        return bucket
+
+    def _close(self, key: Tuple[Hashable, Hashable], incident: Incident) -> None:
+        del self._open[key]
+        del self._buckets[incident.last_seen_us // self.window_us][key]
+        self.closed.append(incident)
+        if self.on_close is not None:
+            self.on_close(incident)
+
+    def expire(self, now_us: int) -> int:
+        """
+        Close incidents that have certainly gone quiet by now_us.
+
+        Whole buckets are closed once they end more than a window before
+        now_us; incidents in the bucket straddling that edge stay open
+        until the next bucket boundary or until their key is seen again.
+
+        Args:
+            now_us: Current time in epoch microseconds
+
+        Returns:
+            Number of incidents closed
+        """
+        current = now_us // self.window_us
+        self._expired_through = current
+        heap = self._bucket_heap
+        closed = 0
+        while heap and heap[0] <= current - 2:
+            bucket = self._buckets.pop(heapq.heappop(heap))
+            for key, incident in bucket.items():
+                del self._open[key]
+                self.closed.append(incident)
+                if self.on_close is not None:
+                    self.on_close(incident)
+            closed += len(bucket)
+        return closed
+
+    def open_incidents(self) -> List[Incident]:
+        """Open incidents, most recently seen first."""
+        return sorted(self._open.values(), key=lambda incident: incident.last_seen_us,
+                      reverse=True)
+
+    def summary(self, now_us: Optional[int] = None) -> Dict:
+        """
+        Summarize the correlated stream.
+
+        Args:
+            now_us: Expire stale incidents as of this time first (default:
+                the newest event timestamp)
+
+        Returns:
+            Dictionary with the incident counterparts of the fields of
+            DisasterEnvironment.get_event_summary: population and critical
+            counts are taken once per incident, at its peak
+        """
+        if now_us is not None:
+            self.expire(now_us)
+        incidents = self.incident_count
+        average = self._max_severity_sum / incidents if incidents > 0 else 0
+        return {
+            "total_incidents": incidents,
+            "open_incidents": len(self._open),
+            "total_events": self.event_count,
+            "duplicate_events": self.event_count - incidents,
+            "average_severity": round(average, 2),
+            "total_affected_population": self._population_sum,
+            "critical_incidents": self.critical_incidents,
+            "environmental_status": "Unstable" if average > 3 else "Monitoring"
+        }
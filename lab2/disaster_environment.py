@@ -6,14 +6,34 @@ This module simulates a disaster environment with various event types
 including earthquakes, floods, fires, and infrastructure damage.
 """
 
-import random
 import logging
-from datetime import datetime
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from datetime import datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Handle imports for both direct and package execution
+try:
+    from .event_store import ColumnarEventStore, StoredEventList
+    from .event_index import EventIndex
+    from .window_stats import WindowedEventStats
+    from .spatial import SpatialModel
+    from .correlation import IncidentCorrelator
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from event_store import ColumnarEventStore, StoredEventList
+    from event_index import EventIndex
+    from window_stats import WindowedEventStats
+    from spatial import SpatialModel
+    from correlation import IncidentCorrelator
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -35,11 +55,22 @@ class SeverityLevel(Enum):
     LOW = 1
 
 
+# Precomputed "NN%" labels for damage assessments in the 0-100 range
+_DAMAGE_LABELS = tuple(f"{value}%" for value in range(101))
+
+
+def _damage_label(damage: int) -> str:
+    return _DAMAGE_LABELS[damage] if 0 <= damage <= 100 else f"{damage}%"
+
+
 @dataclass
 class DisasterEvent:
     """
     Represents a disaster event in the environment.
     
+    Events are slotted to keep per-event memory small; they carry no
+    instance __dict__.
+    
     Attributes:
         event_id: Unique identifier for the event
         disaster_type: Type of disaster
@@ -57,6 +88,11 @@ class DisasterEvent:
     timestamp: datetime
     affected_population: int
     
+    __slots__ = (
+        "event_id", "disaster_type", "location", "severity_level",
+        "damage_assessment", "timestamp", "affected_population"
+    )
+    
     def to_dict(self) -> Dict:
         """Convert event to dictionary format for logging."""
         return {
@@ -64,10 +100,129 @@ class DisasterEvent:
             "disaster_type": self.disaster_type.value,
             "location": self.location,
             "severity_level": self.severity_level.value,
-            "damage_assessment": f"{self.damage_assessment}%",
+            "damage_assessment": _damage_label(self.damage_assessment),
             "timestamp": self.timestamp.isoformat(),
             "affected_population": self.affected_population
         }
+    
+    @classmethod
+    def from_dict(cls, record: Dict) -> "DisasterEvent":
+        """
+        Rebuild an event from the dictionary produced by to_dict().
+        
+        Args:
+            record: Logged event dictionary; damage_assessment may be the
+                "NN%" label or a plain number
+        
+        Returns:
+            DisasterEvent: The equivalent event
+        """
+        damage = record["damage_assessment"]
+        if isinstance(damage, str):
+            damage = damage.rstrip("%")
+        timestamp = record["timestamp"]
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return cls(
+            event_id=record["event_id"],
+            disaster_type=_DISASTER_TYPES[_DISASTER_TYPE_CODES[record["disaster_type"]]],
+            location=record["location"],
+            severity_level=_SEVERITY_LEVELS[record["severity_level"]],
+            damage_assessment=int(damage),
+            timestamp=timestamp,
+            affected_population=int(record["affected_population"])
+        )
+
+
+# Field order of the tuples produced by to_records()
+RECORD_FIELDS = (
+    "event_id", "disaster_type", "location", "severity_level",
+    "damage_assessment", "timestamp", "affected_population"
+)
+
+
+def to_records(events: Sequence[DisasterEvent]) -> List[Tuple]:
+    """
+    Serialise many events in one pass into tuples ordered as RECORD_FIELDS.
+    
+    Values are formatted exactly as in DisasterEvent.to_dict(). Consecutive
+    events sharing a timestamp (as in generated batches) format it once,
+    and events held in a columnar store are serialised straight from its
+    columns without materialising DisasterEvent objects.
+    
+    Args:
+        events: Events to serialise, e.g. a list or environment.events
+    
+    Returns:
+        List of record tuples
+    """
+    if isinstance(events, StoredEventList):
+        return events.to_records()
+    
+    records = []
+    append = records.append
+    last_timestamp = None
+    last_iso = None
+    for event in events:
+        timestamp = event.timestamp
+        if timestamp != last_timestamp:
+            last_timestamp = timestamp
+            last_iso = timestamp.isoformat()
+        append((
+            event.event_id,
+            event.disaster_type.value,
+            event.location,
+            event.severity_level.value,
+            _damage_label(event.damage_assessment),
+            last_iso,
+            event.affected_population
+        ))
+    return records
+
+
+def to_dicts(events: Sequence[DisasterEvent]) -> List[Dict]:
+    """
+    Serialise many events in one pass into to_dict()-compatible dictionaries.
+    
+    Args:
+        events: Events to serialise, e.g. a list or environment.events
+    
+    Returns:
+        List of dictionaries identical to calling to_dict() on each event
+    """
+    return [
+        {
+            "event_id": event_id,
+            "disaster_type": disaster_type,
+            "location": location,
+            "severity_level": severity_level,
+            "damage_assessment": damage_assessment,
+            "timestamp": timestamp,
+            "affected_population": affected_population
+        }
+        for (event_id, disaster_type, location, severity_level,
+             damage_assessment, timestamp, affected_population) in to_records(events)
+    ]
+
+
+# Lookup tables used to encode events for the columnar store and indexes
+_DISASTER_TYPES = list(DisasterType)
+_DISASTER_TYPE_CODES = {t.value: i for i, t in enumerate(_DISASTER_TYPES)}
+_DISASTER_TYPE_VALUES = [t.value for t in _DISASTER_TYPES]
+_SEVERITY_LEVELS = {s.value: s for s in SeverityLevel}
+
+# Timestamps are stored as microseconds since 1970-01-01 on the event's own
+# (naive) clock, which round-trips exactly through datetime arithmetic
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _timestamp_to_micros(timestamp: datetime) -> int:
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def _micros_to_timestamp(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=micros)
 
 
 class DisasterEnvironment:
@@ -87,49 +242,556 @@ class DisasterEnvironment:
         "Shopping District", "Agricultural Region"
     ]
     
-    def __init__(self, seed: int = None):
-        """Initialize the disaster environment."""
-        if seed is not None:
-            random.seed(seed)
+    def __init__(self, seed: int = None, columnar: bool = False,
+                 max_events: Optional[int] = None, clock=None,
+                 spatial: Optional[SpatialModel] = None,
+                 correlator: Optional[IncidentCorrelator] = None):
+        """
+        Initialize the disaster environment.
         
-        self.events: List[DisasterEvent] = []
+        Args:
+            seed: Optional seed for this environment's own random generator;
+                environments never share random state
+            columnar: Store events in a compact ColumnarEventStore instead of
+                a list of DisasterEvent objects
+            max_events: Maximum number of events to retain; implies a
+                columnar store that evicts the oldest events when full
+            clock: Object whose now() returns the current datetime, e.g. a
+                simulation.VirtualClock (default: the wall clock)
+            spatial: SpatialModel that gives every generated event a position
+                and radius and answers events_within() queries; unless it
+                was given its own seed, its positions follow this seed too
+            correlator: IncidentCorrelator that groups events into incidents;
+                get_event_summary() then also reports deduplicated figures
+        """
+        self.rng = np.random.default_rng(seed)
+        self.clock = clock
+        self._now = clock.now if clock is not None else datetime.now
+        
+        self.store: Optional[ColumnarEventStore] = None
+        self._location_codes: Dict[str, int] = {}
+        self._location_names: List[str] = []
+        self._last_decoded_timestamp: Tuple[Optional[int], Optional[datetime]] = (None, None)
+        for name in self.LOCATIONS:
+            self._location_code(name)
+        if columnar or max_events is not None:
+            self.store = ColumnarEventStore(capacity=max_events)
+            self.events = StoredEventList(self.store, self._decode_row, self._serialize_rows)
+        else:
+            self.events: List[DisasterEvent] = []
         self.event_counter = 0
+        
+        # Incremented whenever events are added, so derived results can be
+        # cached per version
+        self.version = 0
+        
+        # Running aggregates, updated on every generated event so that
+        # get_event_summary() does not have to walk the event history
+        self._event_count = 0
+        self._severity_sum = 0
+        self._population_sum = 0
+        self.severity_counts: Dict[int, int] = {}
+        self.type_counts: Dict[str, int] = {}
+        self.location_counts: Dict[str, int] = {}
+        
+        # Rolling statistics over the last minute, five minutes and hour
+        self.windows = WindowedEventStats()
+        
+        # Secondary indexes by type, location, severity and timestamp
+        self.index = EventIndex()
+        
+        # Optional event positions, indexed under the same sequence numbers;
+        # an unseeded model draws from a generator derived from this seed.
+        # Runs of consecutive event numbers map ids back to sequence numbers:
+        # run i numbers events from _run_numbers[i] at _run_seqs[i] onwards
+        self.spatial = spatial
+        self._run_numbers = array("q")
+        self._run_seqs = array("q")
+        if spatial is not None:
+            spatial.bind(self.LOCATIONS, np.random.SeedSequence(seed).spawn(1)[0])
+        
+        # Optional grouping of repeated reports into incidents
+        self.correlator = correlator
         logger.info("Disaster Environment initialized")
     
+    def now(self) -> datetime:
+        """Current time on this environment's clock."""
+        return self._now()
+    
     def generate_event(self) -> DisasterEvent:
         """
         Generate a random disaster event.
         
+        Draws the same random numbers as generate_events(1), but with
+        scalar operations, which are much cheaper than NumPy array
+        operations for a single event.
+        
         Returns:
             DisasterEvent: A newly generated disaster event
         """
+        rng = self.rng
+        disaster = int(rng.integers(0, len(_DISASTER_TYPES), dtype=np.int8))
+        severity = int(rng.integers(1, len(_SEVERITY_LEVELS) + 1, dtype=np.int8))
+        location = int(rng.integers(0, len(self.LOCATIONS), dtype=np.int16))
+        damage = int(rng.integers(5, 101, dtype=np.int32))
+        population = int(rng.integers(50, 5001, dtype=np.int32))
         self.event_counter += 1
+        number = self.event_counter
+        timestamp = self._now()
+        micros = _timestamp_to_micros(timestamp)
         
-        disaster_type = random.choice(list(DisasterType))
-        severity_level = random.choice(list(SeverityLevel))
-        location = random.choice(self.LOCATIONS)
-        damage = random.randint(5, 100)
-        affected_pop = random.randint(50, 5000)
+        self._record_event(disaster, severity, location, population, micros)
+        seq = self.index.add(disaster, location, severity, micros)
+        if self.spatial is not None:
+            self.spatial.place(location, severity)
+            self._record_numbers(number, seq)
         
         event = DisasterEvent(
-            event_id=f"EVT_{self.event_counter:04d}",
-            disaster_type=disaster_type,
-            location=location,
-            severity_level=severity_level,
+            event_id=f"EVT_{number:04d}",
+            disaster_type=_DISASTER_TYPES[disaster],
+            location=self.LOCATIONS[location],
+            severity_level=_SEVERITY_LEVELS[severity],
             damage_assessment=damage,
-            timestamp=datetime.now(),
-            affected_population=affected_pop
+            timestamp=timestamp,
+            affected_population=population
         )
-        
-        self.events.append(event)
+        if self.store is None:
+            self.events.append(event)
+        else:
+            self.store.append((number, disaster, severity, location, damage, population, micros))
+            self._evict_dropped()
         return event
     
+    def generate_events(self, n: int) -> Sequence[DisasterEvent]:
+        """
+        Generate a batch of random disaster events in one vectorized pass.
+        
+        All fields for the batch are drawn from this environment's generator
+        at once and share a single timestamp. With a columnar store the
+        batch is appended column-wise and the returned events are only
+        materialised when accessed, so large batches stay cheap; a list
+        store has to build every DisasterEvent up front.
+        
+        Args:
+            n: Number of events to generate
+        
+        Returns:
+            Sequence of the newly generated events, oldest first
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        
+        rng = self.rng
+        types = rng.integers(0, len(_DISASTER_TYPES), n, dtype=np.int8)
+        severities = rng.integers(1, len(_SEVERITY_LEVELS) + 1, n, dtype=np.int8)
+        locations = rng.integers(0, len(self.LOCATIONS), n, dtype=np.int16)
+        damage = rng.integers(5, 101, n, dtype=np.int32)
+        population = rng.integers(50, 5001, n, dtype=np.int32)
+        numbers = np.arange(self.event_counter + 1, self.event_counter + n + 1, dtype=np.int64)
+        timestamp = self._now()
+        micros = _timestamp_to_micros(timestamp)
+        self.event_counter += n
+        
+        # Location codes start with LOCATIONS in order, so indices are codes
+        self._record_batch(types, severities, locations, population, micros)
+        first = self.index.add_batch(types, locations, severities,
+                                     np.full(n, micros, dtype=np.int64))
+        if self.spatial is not None and n:
+            self.spatial.place_batch(locations, severities)
+            self._record_numbers(int(numbers[0]), first)
+        
+        if self.store is None:
+            events = [
+                DisasterEvent(
+                    event_id=f"EVT_{number:04d}",
+                    disaster_type=_DISASTER_TYPES[disaster],
+                    location=self.LOCATIONS[location],
+                    severity_level=_SEVERITY_LEVELS[severity],
+                    damage_assessment=dmg,
+                    timestamp=timestamp,
+                    affected_population=pop
+                )
+                for number, disaster, severity, location, dmg, pop in zip(
+                    numbers.tolist(), types.tolist(), severities.tolist(),
+                    locations.tolist(), damage.tolist(), population.tolist())
+            ]
+            self.events.extend(events)
+            return events
+        
+        columns = {
+            "event_number": array("q", numbers.tobytes()),
+            "disaster_type": array("b", types.tobytes()),
+            "severity_level": array("b", severities.tobytes()),
+            "location": array("h", locations.tobytes()),
+            "damage_assessment": array("i", damage.tobytes()),
+            "affected_population": array("i", population.tobytes()),
+            "timestamp": array("q", [micros]) * n
+        }
+        self.store.extend(columns)
+        self._evict_dropped()
+        batch = ColumnarEventStore()
+        batch.extend(columns)
+        return StoredEventList(batch, self._decode_row, self._serialize_rows)
+    
+    def ingest_event(self, event: DisasterEvent) -> None:
+        """
+        Add an event produced elsewhere, e.g. one replayed from a log.
+        
+        The event goes through the same bookkeeping as a generated one:
+        running aggregates, rolling windows, secondary indexes and, with a
+        spatial model, a position. Its id and timestamp are kept, and the
+        event counter is moved past the id so that later generated events
+        do not reuse it.
+        
+        Args:
+            event: Event to add
+        
+        Raises:
+            ValueError: If the event cannot be stored, e.g. a non-standard
+                id with a columnar store, or a location the spatial model
+                has no coordinates for
+        """
+        disaster = _DISASTER_TYPE_CODES[event.disaster_type.value]
+        severity = event.severity_level.value
+        # The spatial model only has coordinates for the predefined locations
+        if (self.spatial is not None and
+                self._location_codes.get(event.location, len(self.LOCATIONS)) >= len(self.LOCATIONS)):
+            raise ValueError(f"No coordinates for location: {event.location}")
+        if self.store is not None:
+            row = self._encode_event(event)
+            number, location, micros = row[0], row[3], row[6]
+        else:
+            location = self._location_code(event.location)
+            micros = _timestamp_to_micros(event.timestamp)
+            suffix = event.event_id[4:]
+            number = int(suffix) if event.event_id.startswith("EVT_") and suffix.isdigit() else 0
+        self.event_counter = max(self.event_counter, number)
+        
+        self._record_event(disaster, severity, location, event.affected_population, micros)
+        seq = self.index.add(disaster, location, severity, micros)
+        if self.spatial is not None:
+            self.spatial.place(location, severity)
+            self._record_numbers(number, seq)
+        
+        if self.store is None:
+            self.events.append(event)
+        else:
+            self.store.append(row)
+            self._evict_dropped()
+    
+    def _evict_dropped(self) -> None:
+        """Drop index entries for events the bounded store has evicted."""
+        dropped = self.store.dropped
+        self.index.evict_before(dropped)
+        if self.spatial is not None:
+            self.spatial.evict_before(dropped)
+            # Forget runs that end at or before the first retained event
+            stale = bisect_right(self._run_seqs, dropped) - 1
+            if stale > 0:
+                del self._run_numbers[:stale]
+                del self._run_seqs[:stale]
+    
+    def _record_numbers(self, number: int, seq: int) -> None:
+        """Note that event numbers from `number` on were stored from sequence `seq` on."""
+        if self._run_seqs and self._run_numbers[-1] + seq - self._run_seqs[-1] == number:
+            return
+        self._run_numbers.append(number)
+        self._run_seqs.append(seq)
+    
+    def _sequence_of(self, event: DisasterEvent) -> int:
+        """Sequence number of a retained event, found through its id."""
+        suffix = event.event_id[4:]
+        number = int(suffix) if event.event_id.startswith("EVT_") and suffix.isdigit() else 0
+        numbers = np.array(self._run_numbers, dtype=np.int64)
+        seqs = np.array(self._run_seqs, dtype=np.int64)
+        ends = numbers + np.diff(seqs, append=self.index.next_seq)
+        offset = self.store.dropped if self.store is not None else 0
+        # Ids can repeat across ingested events, so the stored event must
+        # match; among identical events the newest wins
+        for run in np.flatnonzero((numbers <= number) & (number < ends))[::-1].tolist():
+            seq = int(seqs[run]) + number - int(numbers[run])
+            if seq >= offset and self.events[seq - offset] == event:
+                return seq
+        raise ValueError(f"Event {event.event_id} is not retained by this environment")
+    
+    def _record_batch(self, types: np.ndarray, severities: np.ndarray,
+                      locations: np.ndarray, population: np.ndarray,
+                      timestamp_us: int) -> None:
+        """Fold a batch of events sharing one timestamp into the running aggregates."""
+        self.version += 1
+        batch_population = int(population.sum(dtype=np.int64))
+        batch_severity = 0
+        self._event_count += len(severities)
+        self._population_sum += batch_population
+        
+        for severity, count in enumerate(np.bincount(severities, minlength=1).tolist()):
+            if count:
+                batch_severity += severity * count
+                self.severity_counts[severity] = self.severity_counts.get(severity, 0) + count
+        self._severity_sum += batch_severity
+        critical = int(np.count_nonzero(severities == SeverityLevel.CRITICAL.value))
+        self.windows.add(timestamp_us, len(severities), batch_severity, batch_population, critical)
+        for code, count in enumerate(np.bincount(types, minlength=1).tolist()):
+            if count:
+                disaster = _DISASTER_TYPES[code].value
+                self.type_counts[disaster] = self.type_counts.get(disaster, 0) + count
+        for code, count in enumerate(np.bincount(locations, minlength=1).tolist()):
+            if count:
+                location = self.LOCATIONS[code]
+                self.location_counts[location] = self.location_counts.get(location, 0) + count
+        if self.correlator is not None:
+            self._correlate_batch(types, severities, locations, population, timestamp_us)
+    
+    def _correlate_batch(self, types: np.ndarray, severities: np.ndarray,
+                         locations: np.ndarray, population: np.ndarray,
+                         timestamp_us: int) -> None:
+        """Pass a batch to the correlator as one group per (type, location)."""
+        if len(types) == 0:
+            return
+        keys = types.astype(np.int16) * len(self.LOCATIONS) + locations
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        counts = np.diff(np.r_[starts, len(keys)])
+        sorted_severities = severities[order].astype(np.int64)
+        severity_sums = np.add.reduceat(sorted_severities, starts)
+        max_severities = np.maximum.reduceat(sorted_severities, starts)
+        max_population = np.maximum.reduceat(population[order], starts)
+        for key, count, severity_sum, max_severity, peak in zip(
+                keys[starts].tolist(), counts.tolist(), severity_sums.tolist(),
+                max_severities.tolist(), max_population.tolist()):
+            disaster, location = divmod(key, len(self.LOCATIONS))
+            self.correlator.add(_DISASTER_TYPES[disaster].value, self.LOCATIONS[location],
+                                timestamp_us, count, severity_sum, max_severity, peak)
+    
+    def _record_event(self, disaster: int, severity: int, location: int,
+                      population: int, timestamp_us: int) -> None:
+        """Fold a single event, given by its codes, into the running aggregates."""
+        self.version += 1
+        self._event_count += 1
+        self._severity_sum += severity
+        self._population_sum += population
+        self.severity_counts[severity] = self.severity_counts.get(severity, 0) + 1
+        self.windows.add(timestamp_us, 1, severity, population,
+                         1 if severity == SeverityLevel.CRITICAL.value else 0)
+        disaster_name = _DISASTER_TYPES[disaster].value
+        self.type_counts[disaster_name] = self.type_counts.get(disaster_name, 0) + 1
+        location_name = self._location_names[location]
+        self.location_counts[location_name] = self.location_counts.get(location_name, 0) + 1
+        if self.correlator is not None:
+            self.correlator.add(disaster_name, location_name, timestamp_us, 1,
+                                severity, severity, population)
+    
+    def _location_code(self, location: str) -> int:
+        code = self._location_codes.get(location)
+        if code is None:
+            code = len(self._location_names)
+            self._location_codes[location] = code
+            self._location_names.append(location)
+        return code
+    
+    def _encode_event(self, event: DisasterEvent) -> Tuple[int, ...]:
+        """Encode an event as a row for the columnar store."""
+        if not event.event_id.startswith("EVT_"):
+            raise ValueError(f"Cannot store event with non-standard id: {event.event_id}")
+        return (
+            int(event.event_id[4:]),
+            _DISASTER_TYPE_CODES[event.disaster_type.value],
+            event.severity_level.value,
+            self._location_code(event.location),
+            event.damage_assessment,
+            event.affected_population,
+            _timestamp_to_micros(event.timestamp)
+        )
+    
+    def _decode_row(self, row: Tuple[int, ...]) -> DisasterEvent:
+        """Materialise a DisasterEvent from a columnar store row."""
+        number, disaster, severity, location, damage, population, micros = row
+        # Events of a batch share a timestamp; share the datetime object too
+        last_micros, timestamp = self._last_decoded_timestamp
+        if micros != last_micros:
+            timestamp = _micros_to_timestamp(micros)
+            self._last_decoded_timestamp = (micros, timestamp)
+        return DisasterEvent(
+            event_id=f"EVT_{number:04d}",
+            disaster_type=_DISASTER_TYPES[disaster],
+            location=self._location_names[location],
+            severity_level=_SEVERITY_LEVELS[severity],
+            damage_assessment=damage,
+            timestamp=timestamp,
+            affected_population=population
+        )
+    
+    def query(self, disaster_type=None, location: Optional[str] = None,
+              min_severity=None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None,
+              limit: Optional[int] = None) -> List[DisasterEvent]:
+        """
+        Find retained events matching all of the given filters.
+        
+        Uses the secondary indexes rather than scanning the history, e.g.
+        query(DisasterType.FLOOD, "Hospital Area", SeverityLevel.CRITICAL,
+        since=datetime.now() - timedelta(minutes=10)).
+        
+        Args:
+            disaster_type: DisasterType (or its value) to match
+            location: Location name to match
+            min_severity: Minimum SeverityLevel (or its value)
+            since: Only events at or after this timestamp
+            until: Only events at or before this timestamp
+            limit: Return only the most recent `limit` matches
+        
+        Returns:
+            Matching events, oldest first
+        """
+        type_codes = None
+        if disaster_type is not None:
+            type_codes = [_DISASTER_TYPE_CODES[getattr(disaster_type, "value", disaster_type)]]
+        location_codes = None
+        if location is not None:
+            if location not in self._location_codes:
+                return []
+            location_codes = [self._location_codes[location]]
+        severities = None
+        if min_severity is not None:
+            floor = getattr(min_severity, "value", min_severity)
+            severities = [value for value in _SEVERITY_LEVELS if value >= floor]
+        
+        seqs = self.index.query(
+            type_codes=type_codes,
+            location_codes=location_codes,
+            severities=severities,
+            since_us=_timestamp_to_micros(since) if since is not None else None,
+            until_us=_timestamp_to_micros(until) if until is not None else None
+        )
+        if limit is not None:
+            seqs = seqs[-limit:] if limit > 0 else seqs[:0]
+        
+        offset = self.store.dropped if self.store is not None else 0
+        return [self.events[seq - offset] for seq in seqs.tolist()]
+    
+    def events_within(self, x: float, y: float, radius: float) -> List[DisasterEvent]:
+        """
+        Find retained events whose affected area intersects a disk.
+        
+        Requires a spatial model. Uses its grid index, so only events near
+        the disk are examined.
+        
+        Args:
+            x: Disk centre x coordinate in km
+            y: Disk centre y coordinate in km
+            radius: Disk radius in km
+        
+        Returns:
+            Matching events, oldest first
+        """
+        if self.spatial is None:
+            raise ValueError("This environment has no spatial model")
+        seqs = self.spatial.within(x, y, radius)
+        offset = self.store.dropped if self.store is not None else 0
+        return [self.events[seq - offset] for seq in seqs.tolist()]
+    
+    def position_of(self, event: DisasterEvent) -> Tuple[float, float, float]:
+        """
+        Return the (x, y, radius) in km of a retained event.
+        
+        Requires a spatial model. Works for generated and ingested events,
+        including ingested ones that reuse the id of another event.
+        
+        Raises:
+            ValueError: If there is no spatial model or the event is not
+                retained, e.g. evicted under max_events
+        """
+        if self.spatial is None:
+            raise ValueError("This environment has no spatial model")
+        return self.spatial.position(self._sequence_of(event))
+    
+    def _serialize_rows(self, rows: List[Tuple[int, ...]]) -> List[Tuple]:
+        """Format columnar store rows as to_records() tuples without building events."""
+        names = self._location_names
+        records = []
+        append = records.append
+        last_micros = None
+        last_iso = None
+        for number, disaster, severity, location, damage, population, micros in rows:
+            if micros != last_micros:
+                last_micros = micros
+                last_iso = _micros_to_timestamp(micros).isoformat()
+            append((
+                f"EVT_{number:04d}",
+                _DISASTER_TYPE_VALUES[disaster],
+                names[location],
+                severity,
+                _damage_label(damage),
+                last_iso,
+                population
+            ))
+        return records
+    
     def get_event_summary(self) -> Dict:
         """
         Get a summary of all events and environmental conditions.
         
+        Runs in O(1) using the aggregates maintained by generate_event().
+        The summary covers every generated event, including any evicted by
+        bounded retention.
+        
         Returns:
-            Dictionary containing event statistics and environment state
+            Dictionary containing event statistics and environment state;
+            with a correlator, "incidents" holds its summary, which counts
+            population and critical events once per incident
+        """
+        total_events = self._event_count
+        avg_severity = self._severity_sum / total_events if total_events > 0 else 0
+        
+        summary = {
+            "total_events": total_events,
+            "average_severity": round(avg_severity, 2),
+            "total_affected_population": self._population_sum,
+            "critical_events": self.severity_counts.get(SeverityLevel.CRITICAL.value, 0),
+            "environmental_status": "Unstable" if avg_severity > 3 else "Monitoring"
+        }
+        if self.correlator is not None:
+            summary["incidents"] = self.correlator.summary(_timestamp_to_micros(self._now()))
+        return summary
+    
+    def summary_horizon(self) -> Optional[int]:
+        """
+        Return what, besides version, get_event_summary() depends on.
+        
+        Without a correlator the summary only changes when events are
+        added, and this is None. With one, open incidents also expire as
+        the clock advances, a whole correlation window at a time, so this
+        is the index of the current window.
+        """
+        if self.correlator is None:
+            return None
+        return _timestamp_to_micros(self._now()) // self.correlator.window_us
+    
+    def get_window_summary(self) -> Dict[str, Dict]:
+        """
+        Get rolling statistics for recent activity.
+        
+        Unlike get_event_summary(), which averages over the whole history,
+        each window only reflects events from the last minute, five minutes
+        or hour, so its environmental_status follows current conditions.
+        
+        Returns:
+            Mapping of window label ("1m", "5m", "1h") to a summary with the
+            same fields as get_event_summary() plus window_seconds
+        """
+        return self.windows.summary(_timestamp_to_micros(self._now()))
+    
+    def recompute_event_summary(self) -> Dict:
+        """
+        Recompute the event summary with a full scan of the event history.
+        
+        This is the reference implementation the running aggregates must
+        agree with; it is O(n) and intended for verification only. With
+        bounded retention it only covers the events still retained.
+        
+        Returns:
+            Dictionary with the same layout as get_event_summary()
         """
         total_events = len(self.events)
         avg_severity = sum(e.severity_level.value for e in self.events) / total_events if total_events > 0 else 0
@@ -139,22 +801,69 @@ class DisasterEnvironment:
             "total_events": total_events,
             "average_severity": round(avg_severity, 2),
             "total_affected_population": total_affected,
-            "critical_events": sum(1 for e in self.events if e.severity_level == SeverityLevel.CRITICAL),
+            "critical_events": sum(1 for e in self.events if e.severity_level.value == SeverityLevel.CRITICAL.value),
             "environmental_status": "Unstable" if avg_severity > 3 else "Monitoring"
         }
     
+    def verify_aggregates(self) -> bool:
+        """
+        Check the running aggregates against a full recompute.
+        
+        Compares the summary as well as the per-severity, per-type and
+        per-location counters. The correlator's "incidents" figures are not
+        part of the recompute and are left out of the comparison.
+        
+        Returns:
+            True if the incremental state matches the event history
+        
+        Raises:
+            ValueError: If events have been evicted by bounded retention
+        """
+        if self.store is not None and self.store.dropped:
+            raise ValueError("Cannot verify aggregates after events were evicted")
+        
+        severity_counts: Dict[int, int] = {}
+        type_counts: Dict[str, int] = {}
+        location_counts: Dict[str, int] = {}
+        for e in self.events:
+            severity_counts[e.severity_level.value] = severity_counts.get(e.severity_level.value, 0) + 1
+            type_counts[e.disaster_type.value] = type_counts.get(e.disaster_type.value, 0) + 1
+            location_counts[e.location] = location_counts.get(e.location, 0) + 1
+        
+        summary = self.get_event_summary()
+        summary.pop("incidents", None)
+        return (
+            summary == self.recompute_event_summary()
+            and severity_counts == self.severity_counts
+            and type_counts == self.type_counts
+            and location_counts == self.location_counts
+        )
+    
     def get_recent_events(self, limit: int = 5) -> List[DisasterEvent]:
-        """Get the most recent events."""
+        """
+        Get the most recent events.
+        
+        With a columnar store only the requested events are materialised.
+        """
         return self.events[-limit:] if self.events else []
 
 
 # Singleton instance for global environment access
 _environment_instance = None
+_environment_lock = threading.Lock()
 
 
 def get_environment() -> DisasterEnvironment:
-    """Get or create the global disaster environment instance."""
+    """
+    Get or create the global disaster environment instance.
+    
+    Creation is locked, so threads calling this concurrently all get the
+    same instance. The instance itself is not thread-safe; sensors in
+    several threads should share a ConcurrentDisasterEnvironment instead.
+    """
     global _environment_instance
     if _environment_instance is None:
-        _environment_instance = DisasterEnvironment()
+        with _environment_lock:
+            if _environment_instance is None:
+                _environment_instance = DisasterEnvironment()
     return _environment_instance
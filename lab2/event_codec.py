@@ -0,0 +1,189 @@
+"""
+LAB 2: Compact Event Batch Encoding
+
+This module encodes batches of DisasterEvents into the compact payloads
+that agents exchange, and decodes them again. A batch of n events is one
+JSON envelope:
+
+    {"v": 1, "seq": 7, "n": 250, "id0": 1201, "t0": 1700000000000000,
+     "loc": ["Downtown District", ...], "cols": "<base64>"}
+
+- v: payload format version; decoders reject versions they do not know
+- seq: batch sequence number of the publisher, so receivers can detect gaps
+- id0, t0: event number and timestamp (microseconds) of the first event
+- loc: the batch's location names; events refer to them by index
+- cols: the events as zlib-compressed little-endian columns, in this
+  order: event number deltas (int32), timestamp deltas in microseconds
+  (int64), disaster type codes (uint8, DisasterType declaration order),
+  severity levels (uint8), location indices (uint16), damage (int16) and
+  affected population (int32)
+
+Event numbers and timestamps are delta-encoded against the previous
+event, so the consecutive IDs and shared timestamps of a sensor's events
+compress to almost nothing. A batch costs a few bytes per event instead
+of the ~200 bytes of a to_dict() JSON record.
+"""
+
+import base64
+import json
+import sys
+import zlib
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .disaster_environment import (
+        DisasterEvent, _DISASTER_TYPE_CODES, _DISASTER_TYPES, _SEVERITY_LEVELS,
+        _micros_to_timestamp, _timestamp_to_micros
+    )
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from disaster_environment import (
+        DisasterEvent, _DISASTER_TYPE_CODES, _DISASTER_TYPES, _SEVERITY_LEVELS,
+        _micros_to_timestamp, _timestamp_to_micros
+    )
+
+FORMAT_VERSION = 1
+
+# Column dtypes of format version 1, in payload order
+_COLUMNS = (
+    ("id_deltas", np.dtype("<i4")),
+    ("time_deltas", np.dtype("<i8")),
+    ("types", np.dtype("u1")),
+    ("severities", np.dtype("u1")),
+    ("locations", np.dtype("<u2")),
+    ("damage", np.dtype("<i2")),
+    ("population", np.dtype("<i4"))
+)
+
+
+def _event_number(event_id: str) -> int:
+    suffix = event_id[4:]
+    if not event_id.startswith("EVT_") or not suffix.isdigit():
+        raise ValueError(f"Cannot encode event with non-standard id: {event_id}")
+    return int(suffix)
+
+
+def encode_batch(events: Sequence[DisasterEvent], sequence: int = 0,
+                 compresslevel: int = 1) -> str:
+    """
+    Encode events into one compact, versioned payload.
+
+    Args:
+        events: Events to encode, e.g. the events of one publishing window
+        sequence: Batch sequence number to put in the payload
+        compresslevel: zlib compression level for the columns
+
+    Returns:
+        The payload as a string, suitable as a message body
+
+    Raises:
+        ValueError: If an event has an id other than EVT_<number>, or a
+            value outside its column's range
+    """
+    n = len(events)
+    numbers = np.empty(n, dtype=np.int64)
+    micros = np.empty(n, dtype=np.int64)
+    types = np.empty(n, dtype=np.int64)
+    severities = np.empty(n, dtype=np.int64)
+    locations = np.empty(n, dtype=np.int64)
+    damage = np.empty(n, dtype=np.int64)
+    population = np.empty(n, dtype=np.int64)
+    location_codes: Dict[str, int] = {}
+
+    # Events of a batch mostly share timestamps; convert each one once
+    last_timestamp, last_micros = None, 0
+    for i, event in enumerate(events):
+        numbers[i] = _event_number(event.event_id)
+        if event.timestamp != last_timestamp:
+            last_timestamp = event.timestamp
+            last_micros = _timestamp_to_micros(last_timestamp)
+        micros[i] = last_micros
+        types[i] = _DISASTER_TYPE_CODES[event.disaster_type.value]
+        severities[i] = event.severity_level.value
+        locations[i] = location_codes.setdefault(event.location, len(location_codes))
+        damage[i] = event.damage_assessment
+        population[i] = event.affected_population
+
+    columns = (np.diff(numbers, prepend=numbers[:1]), np.diff(micros, prepend=micros[:1]),
+               types, severities, locations, damage, population)
+    packed = []
+    for (name, dtype), values in zip(_COLUMNS, columns):
+        info = np.iinfo(dtype)
+        if n and (values.min() < info.min or values.max() > info.max):
+            raise ValueError(f"Column {name} out of range for {dtype}")
+        packed.append(values.astype(dtype).tobytes())
+
+    return json.dumps({
+        "v": FORMAT_VERSION,
+        "seq": sequence,
+        "n": n,
+        "id0": int(numbers[0]) if n else 0,
+        "t0": int(micros[0]) if n else 0,
+        "loc": list(location_codes),
+        "cols": base64.b64encode(zlib.compress(b"".join(packed), compresslevel)).decode("ascii")
+    }, separators=(",", ":"))
+
+
+def decode_batch(payload: str) -> Tuple[int, List[DisasterEvent]]:
+    """
+    Decode a payload produced by encode_batch().
+
+    Args:
+        payload: Payload string, e.g. a message body
+
+    Returns:
+        Tuple of the batch sequence number and the events, in encoding order
+
+    Raises:
+        ValueError: If the payload is malformed or of an unknown version
+    """
+    try:
+        envelope = json.loads(payload)
+        version = envelope["v"]
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported event batch version: {version}")
+        n = envelope["n"]
+        raw = zlib.decompress(base64.b64decode(envelope["cols"]))
+    except KeyError as e:
+        raise ValueError(f"Malformed event batch: missing field {e}") from e
+    except (TypeError, zlib.error) as e:
+        raise ValueError(f"Malformed event batch: {e}") from e
+
+    if len(raw) != n * sum(dtype.itemsize for _, dtype in _COLUMNS):
+        raise ValueError("Malformed event batch: column data does not match event count")
+    columns = []
+    offset = 0
+    for _, dtype in _COLUMNS:
+        columns.append(np.frombuffer(raw, dtype=dtype, count=n, offset=offset))
+        offset += n * dtype.itemsize
+    id_deltas, time_deltas, types, severities, locations, damage, population = columns
+
+    numbers = (np.cumsum(id_deltas, dtype=np.int64) + envelope["id0"]).tolist()
+    micros = (np.cumsum(time_deltas, dtype=np.int64) + envelope["t0"]).tolist()
+    location_names = envelope["loc"]
+
+    events = []
+    append = events.append
+    last_micros, timestamp = None, None
+    rows = zip(numbers, micros, types.tolist(), severities.tolist(), locations.tolist(),
+               damage.tolist(), population.tolist())
+    try:
+        for number, event_micros, disaster, severity, location, event_damage, people in rows:
+            # Events that share a timestamp share the datetime object too
+            if event_micros != last_micros:
+                last_micros, timestamp = event_micros, _micros_to_timestamp(event_micros)
+            append(DisasterEvent(
+                event_id=f"EVT_{number:04d}",
+                disaster_type=_DISASTER_TYPES[disaster],
+                location=location_names[location],
+                severity_level=_SEVERITY_LEVELS[severity],
+                damage_assessment=event_damage,
+                timestamp=timestamp,
+                affected_population=people
+            ))
+    except (IndexError, KeyError) as e:
+        raise ValueError(f"Malformed event batch: unknown code {e}") from e
+    return envelope["seq"], events
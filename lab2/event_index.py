@@ -0,0 +1,208 @@
+"""
+LAB 2: Event Indexes
+
+This module maintains secondary indexes over the events of a
+DisasterEnvironment so that filtered queries ("critical floods in the
+Hospital Area during the last ten minutes") can be answered by
+intersecting posting lists instead of scanning the full history.
+
+Events are identified by their sequence number: the 0-based position at
+which they were added to the environment over its lifetime.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+def _view(values: array) -> np.ndarray:
+    """Zero-copy int64 NumPy view of an array('q')."""
+    if not values:
+        return np.empty(0, dtype=np.int64)
+    return np.frombuffer(values, dtype=np.int64)
+
+
+class EventIndex:
+    """
+    Incremental indexes by disaster type, location and severity, plus a
+    time index on event timestamps.
+
+    Each categorical index maps a code to a posting list of sequence
+    numbers in insertion order. The time index stores every event's
+    timestamp in epoch microseconds; while timestamps arrive in
+    non-decreasing order (the normal case) a time range maps to a contiguous
+    range of sequence numbers found by binary search.
+    """
+
+    def __init__(self):
+        """Initialize empty indexes."""
+        self.by_type: Dict[int, array] = {}
+        self.by_location: Dict[int, array] = {}
+        self.by_severity: Dict[int, array] = {}
+        self.timestamps = array('q')
+        self.time_sorted = True
+        self.base = 0
+        self._timestamps_base = 0
+        self._postings_base = 0
+
+    def __len__(self) -> int:
+        """Number of indexed (not evicted) events."""
+        return self._timestamps_base + len(self.timestamps) - self.base
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number the next added event will receive."""
+        return self._timestamps_base + len(self.timestamps)
+
+    @staticmethod
+    def _posting(index: Dict[int, array], code: int) -> array:
+        posting = index.get(code)
+        if posting is None:
+            posting = index[code] = array('q')
+        return posting
+
+    def add(self, type_code: int, location_code: int, severity: int, timestamp_us: int) -> int:
+        """
+        Index one event.
+
+        Returns:
+            The event's sequence number
+        """
+        seq = self.next_seq
+        if self.timestamps and timestamp_us < self.timestamps[-1]:
+            self.time_sorted = False
+        self.timestamps.append(timestamp_us)
+        self._posting(self.by_type, type_code).append(seq)
+        self._posting(self.by_location, location_code).append(seq)
+        self._posting(self.by_severity, severity).append(seq)
+        return seq
+
+    def add_batch(self, type_codes: np.ndarray, location_codes: np.ndarray,
+                  severities: np.ndarray, timestamps_us: np.ndarray) -> int:
+        """
+        Index a batch of events given as equally sized NumPy arrays.
+
+        Returns:
+            Sequence number of the first event in the batch
+        """
+        first = self.next_seq
+        timestamps_us = np.asarray(timestamps_us, dtype=np.int64)
+        if len(timestamps_us):
+            if ((self.timestamps and timestamps_us[0] < self.timestamps[-1])
+                    or np.any(timestamps_us[1:] < timestamps_us[:-1])):
+                self.time_sorted = False
+        self.timestamps.frombytes(timestamps_us.tobytes())
+
+        for index, codes in ((self.by_type, type_codes),
+                             (self.by_location, location_codes),
+                             (self.by_severity, severities)):
+            codes = np.asarray(codes)
+            for code in np.unique(codes).tolist():
+                seqs = np.flatnonzero(codes == code).astype(np.int64) + first
+                self._posting(index, code).frombytes(seqs.tobytes())
+        return first
+
+    def evict_before(self, seq: int) -> None:
+        """
+        Forget all events with a sequence number below seq.
+
+        Storage is reclaimed in amortized O(1) per evicted event: dead prefixes
+        are only cut once they outgrow the live part of the index.
+        """
+        if seq <= self.base:
+            return
+        self.base = seq
+        live = len(self)
+
+        dead = self.base - self._timestamps_base
+        if dead > live:
+            del self.timestamps[:dead]
+            self._timestamps_base = self.base
+
+        if self.base - self._postings_base > live:
+            for index in (self.by_type, self.by_location, self.by_severity):
+                for posting in index.values():
+                    del posting[:bisect_left(posting, self.base)]
+            self._postings_base = self.base
+
+    def _live(self, posting: array, lo: int, hi: int) -> np.ndarray:
+        """Slice of a posting list with sequence numbers in [lo, hi)."""
+        view = _view(posting)
+        return view[np.searchsorted(view, lo):np.searchsorted(view, hi)]
+
+    def query(self, type_codes: Optional[Iterable[int]] = None,
+              location_codes: Optional[Iterable[int]] = None,
+              severities: Optional[Iterable[int]] = None,
+              since_us: Optional[int] = None, until_us: Optional[int] = None) -> np.ndarray:
+        """
+        Find events matching every given constraint.
+
+        Each categorical constraint is a set of acceptable codes. Posting
+        lists are first narrowed to the time range, then intersected
+        smallest-first by binary search.
+
+        Args:
+            type_codes: Acceptable disaster type codes
+            location_codes: Acceptable location codes
+            severities: Acceptable severity values
+            since_us: Inclusive lower timestamp bound in epoch microseconds
+            until_us: Inclusive upper timestamp bound in epoch microseconds
+
+        Returns:
+            Sorted int64 array of matching sequence numbers, owned by the
+            caller: it never shares memory with the index
+        """
+        lo, hi = self.base, self.next_seq
+        timestamps = _view(self.timestamps)
+        if self.time_sorted:
+            # Timestamps are sorted, so the time range is a sequence range
+            offset = self._timestamps_base
+            start = self.base - offset
+            if since_us is not None:
+                lo = offset + start + int(np.searchsorted(timestamps[start:], since_us, 'left'))
+            if until_us is not None:
+                hi = offset + start + int(np.searchsorted(timestamps[start:], until_us, 'right'))
+            if lo >= hi:
+                return np.empty(0, dtype=np.int64)
+
+        candidates: List[np.ndarray] = []
+        for index, codes in ((self.by_type, type_codes),
+                             (self.by_location, location_codes),
+                             (self.by_severity, severities)):
+            if codes is None:
+                continue
+            parts = [self._live(index[code], lo, hi) for code in set(codes) if code in index]
+            if not parts:
+                return np.empty(0, dtype=np.int64)
+            # Postings of different codes are disjoint; merge them in order
+            candidates.append(parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts)))
+
+        if not candidates:
+            result = np.arange(lo, hi, dtype=np.int64)
+        else:
+            candidates.sort(key=len)
+            result = candidates[0]
+            for other in candidates[1:]:
+                if not len(result):
+                    break
+                positions = np.searchsorted(other, result)
+                positions[positions == len(other)] = 0
+                result = result[other[positions] == result] if len(other) else result[:0]
+
+        if not self.time_sorted and (since_us is not None or until_us is not None) and len(result):
+            stamps = timestamps[result - self._timestamps_base]
+            mask = np.ones(len(result), dtype=bool)
+            if since_us is not None:
+                mask &= stamps >= since_us
+            if until_us is not None:
+                mask &= stamps <= until_us
+            result = result[mask]
+
+        # A zero-copy view of a posting list would pin its buffer, and
+        # array('q') cannot grow or shrink while a view of it exists
+        del timestamps
+        if not result.flags.owndata:
+            result = result.copy()
+        return result
@@ -8,20 +8,35 @@ detected by the SensorAgent.
 import json
 import logging
 import sys
+import threading
+import weakref
+from collections import OrderedDict, deque
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
 
-# Handle imports for both direct and package execution
+# Handle imports for both direct and package execution. Package imports
+# come first so that lab2.event_logger shares lab2.disaster_environment
+# (and its global environment) instead of loading a second copy.
 try:
-    from disaster_environment import DisasterEvent, get_environment
+    from .disaster_environment import DisasterEvent, get_environment, to_dicts
+    from .log_writers import BackgroundLogWriter, JsonlLogWriter, read_event_log
+    from .segmented_log import SegmentedLog, SegmentedLogWriter
+    from .sqlite_log import SqliteEventLog, SqliteLogWriter
 except ImportError:
     sys.path.insert(0, str(Path(__file__).parent))
-    from disaster_environment import DisasterEvent, get_environment
+    from disaster_environment import DisasterEvent, get_environment, to_dicts
+    from log_writers import BackgroundLogWriter, JsonlLogWriter, read_event_log
+    from segmented_log import SegmentedLog, SegmentedLogWriter
+    from sqlite_log import SqliteEventLog, SqliteLogWriter
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Analysis snapshots kept per environment, least recently used evicted first
+ANALYSIS_CACHE_SIZE = 16
+_analysis_caches: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_analysis_lock = threading.Lock()
+
 
 class EventLogger:
     """
@@ -29,64 +44,282 @@ class EventLogger:
     
     Maintains a persistent record of all perceived events for
     analysis and historical reference.
+    
+    By default events are kept in memory and written out as a JSON array by
+    save_logs(). In streaming mode each event is appended to the log file
+    as one JSON line as soon as it is logged, and save_logs() only flushes.
+    In background mode the file writes additionally happen on a dedicated
+    writer thread, so logging from an asyncio event loop never waits on disk.
+    In segmented mode log_file is a directory of rolling, compressed
+    segments (see segmented_log.SegmentedLogWriter) that can be read back
+    by time range. In SQLite mode log_file is a database (see
+    sqlite_log.SqliteLogWriter): events are inserted in batches, and
+    iter_events(), query() and generate_report() run as indexed SQL, so
+    they work over logs far larger than memory.
     """
     
-    def __init__(self, log_file: str = "event_logs.json"):
+    def __init__(self, log_file: str = "event_logs.json", streaming: bool = False,
+                 keep_in_memory: Optional[bool] = None,
+                 flush_records: Optional[int] = 100,
+                 flush_bytes: Optional[int] = 64 * 1024,
+                 flush_interval: Optional[float] = 5.0,
+                 background: bool = False, max_queue: int = 10000,
+                 overflow: str = "block", segmented: bool = False,
+                 max_segment_bytes: Optional[int] = 64 * 1024 * 1024,
+                 max_segment_seconds: Optional[float] = 3600.0,
+                 compress: bool = True, sqlite: bool = False):
         """
         Initialize the event logger.
         
         Args:
             log_file: Path to the file where events will be logged
+            streaming: Append events to log_file as JSON lines when logged
+            keep_in_memory: Also keep events in events_log; defaults to True
+                unless streaming
+            flush_records: Streaming mode flush threshold in records
+            flush_bytes: Streaming mode flush threshold in bytes
+            flush_interval: Streaming mode flush threshold in seconds
+            background: Stream through a BackgroundLogWriter thread (implies streaming)
+            max_queue: Background mode queue capacity in records
+            overflow: Background mode policy when the queue is full:
+                "block", "drop_oldest" or "spill"
+            segmented: Stream into a segmented log directory at log_file
+                (implies streaming; combines with background)
+            max_segment_bytes: Segmented mode size limit per segment
+            max_segment_seconds: Segmented mode time span per segment
+            compress: Segmented mode gzip compression of closed segments
+            sqlite: Insert events into a SQLite database at log_file
+                (implies streaming; combines with background)
         """
+        if segmented and sqlite:
+            raise ValueError("segmented and sqlite are mutually exclusive")
+        streaming = streaming or background or segmented or sqlite
         self.log_file = log_file
+        self.streaming = streaming
+        self.keep_in_memory = (not streaming) if keep_in_memory is None else keep_in_memory
         self.events_log: List[Dict] = []
+        
+        # Report counters, maintained as events are logged
+        self.total_events = 0
+        self.severity_counts: Dict[int, int] = {}
+        self.disaster_counts: Dict[str, int] = {}
+        
+        self.segmented = segmented
+        self.sqlite = sqlite
+        self._database: Optional[SqliteEventLog] = None
+        self.writer = None
+        if sqlite:
+            self.writer = SqliteLogWriter(
+                log_file,
+                flush_records=flush_records,
+                flush_interval=flush_interval
+            )
+        elif segmented:
+            self.writer = SegmentedLogWriter(
+                log_file,
+                max_segment_bytes=max_segment_bytes,
+                max_segment_seconds=max_segment_seconds,
+                compress=compress,
+                flush_records=flush_records,
+                flush_bytes=flush_bytes,
+                flush_interval=flush_interval
+            )
+        elif streaming:
+            self.writer = JsonlLogWriter(
+                log_file,
+                flush_records=flush_records,
+                flush_bytes=flush_bytes,
+                flush_interval=flush_interval
+            )
+        if background:
+            self.writer = BackgroundLogWriter(self.writer, max_queue=max_queue, overflow=overflow)
         logger.info(f"EventLogger initialized with log file: {log_file}")
     
     def log_event(self, event: DisasterEvent) -> None:
         """
         Log a disaster event.
         
+        The event is serialised with to_dict(), which formats it exactly as
+        to_dicts() does but without the per-batch setup that only pays off
+        for many events; use log_events() for batches. The per-event log
+        line is at DEBUG level and is not even formatted unless enabled, so
+        that logging many events does not flood the INFO log.
+        
         Args:
             event: The DisasterEvent to log
         """
         event_dict = event.to_dict()
-        self.events_log.append(event_dict)
+        self._count(event_dict['severity_level'], event_dict['disaster_type'])
+        if self.keep_in_memory:
+            self.events_log.append(event_dict)
+        if self.writer is not None:
+            self.writer.write(event_dict)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Event logged: {event.event_id}")
+    
+    def log_events(self, events: Sequence[DisasterEvent]) -> None:
+        """
+        Log many disaster events at once.
         
-        logger.info(f"Event logged: {event.event_id}")
+        Events are serialised in a single pass with to_dicts(), which is
+        several times faster than logging them one by one.
+        
+        Args:
+            events: The DisasterEvents to log, e.g. a generate_events() batch
+        """
+        event_dicts = to_dicts(events)
+        for event_dict in event_dicts:
+            self._count(event_dict['severity_level'], event_dict['disaster_type'])
+        if self.keep_in_memory:
+            self.events_log.extend(event_dicts)
+        if self.writer is not None:
+            for event_dict in event_dicts:
+                self.writer.write(event_dict)
+        
+        logger.info(f"Events logged: {len(event_dicts)}")
+    
+    def _count(self, severity: int, disaster: str) -> None:
+        self.total_events += 1
+        self.severity_counts[severity] = self.severity_counts.get(severity, 0) + 1
+        self.disaster_counts[disaster] = self.disaster_counts.get(disaster, 0) + 1
     
     def save_logs(self) -> None:
-        """Save all logged events to the log file."""
+        """
+        Save all logged events to the log file.
+        
+        In streaming mode events are already on disk, so this only flushes
+        the records buffered since the last flush. In background mode it
+        blocks until every event logged so far has been written and synced.
+        """
         try:
+            if self.writer is not None:
+                self.writer.flush()
+                logger.info(f"Logs flushed to {self.log_file}")
+                return
             with open(self.log_file, 'w') as f:
                 json.dump(self.events_log, f, indent=2)
             logger.info(f"Logs saved to {self.log_file}")
         except Exception as e:
             logger.error(f"Error saving logs: {e}")
     
+    def close(self) -> None:
+        """Flush and close the streaming writer, if any."""
+        if self.writer is not None:
+            self.writer.close()
+        if self._database is not None:
+            self._database.close()
+            self._database = None
+    
+    def database(self) -> SqliteEventLog:
+        """
+        Read access to the SQLite log, with everything logged so far committed.
+        
+        Returns:
+            SqliteEventLog over log_file
+        
+        Raises:
+            ValueError: If the logger is not in SQLite mode
+        """
+        if not self.sqlite:
+            raise ValueError("EventLogger is not in SQLite mode")
+        self.writer.flush()
+        if self._database is None:
+            self._database = SqliteEventLog(self.log_file)
+        return self._database
+    
+    def iter_events(self, since: Optional[datetime] = None,
+                    until: Optional[datetime] = None) -> Iterator[Dict]:
+        """
+        Iterate over logged events, optionally only those in a time range.
+        
+        Reads events_log when events are kept in memory, otherwise streams
+        them back from the log file. A segmented log only opens the
+        segments that overlap the range, and a SQLite log selects the range
+        with its timestamp index.
+        
+        Args:
+            since: Earliest event timestamp to include
+            until: Latest event timestamp to include
+        """
+        if self.sqlite:
+            return self.database().read(since, until)
+        if self.keep_in_memory or self.writer is None:
+            events = iter(self.events_log)
+        elif self.segmented:
+            self.writer.flush()
+            return SegmentedLog(self.log_file).read(since, until)
+        else:
+            self.writer.flush()
+            events = read_event_log(self.log_file)
+        if since is None and until is None:
+            return events
+        since = since.isoformat() if since is not None else None
+        until = until.isoformat() if until is not None else None
+        return (event for event in events
+                if (since is None or event["timestamp"] >= since)
+                and (until is None or event["timestamp"] <= until))
+    
+    def query(self, disaster_type=None, location: Optional[str] = None,
+              min_severity=None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None,
+              limit: Optional[int] = None) -> List[Dict]:
+        """
+        Find logged events matching all of the given filters.
+        
+        Takes the same filters as DisasterEnvironment.query(). A SQLite log
+        answers from its indexes; other logs are scanned with iter_events()
+        and return matches in log order.
+        
+        Args:
+            disaster_type: DisasterType (or its value) to match
+            location: Location name to match
+            min_severity: Minimum SeverityLevel (or its value)
+            since: Only events at or after this timestamp
+            until: Only events at or before this timestamp
+            limit: Return only the most recent `limit` matches
+        
+        Returns:
+            Matching logged event dictionaries, oldest first
+        """
+        if self.sqlite:
+            return self.database().query(disaster_type, location, min_severity,
+                                         since, until, limit)
+        if limit is not None and limit <= 0:
+            return []
+        disaster_type = getattr(disaster_type, "value", disaster_type)
+        min_severity = getattr(min_severity, "value", min_severity)
+        matches = deque(maxlen=limit)
+        for event in self.iter_events(since, until):
+            if ((disaster_type is None or event["disaster_type"] == disaster_type)
+                    and (location is None or event["location"] == location)
+                    and (min_severity is None or event["severity_level"] >= min_severity)):
+                matches.append(event)
+        return list(matches)
+    
     def generate_report(self) -> Dict:
         """
         Generate an analysis report of all logged events.
         
+        Built from counters maintained by log_event(), so the cost depends
+        only on the number of severity levels and disaster types. A SQLite
+        log is reported with SQL aggregates instead, so the report also
+        covers events logged by earlier runs into the same database. Reports
+        from several loggers can be combined with merge_reports().
+        
         Returns:
             Dictionary containing event statistics and analysis
         """
-        if not self.events_log:
-            return {"error": "No events logged"}
+        if self.sqlite:
+            return self.database().report()
         
-        severity_counts = {}
-        disaster_counts = {}
-        
-        for event in self.events_log:
-            severity = event['severity_level']
-            disaster = event['disaster_type']
-            
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
-            disaster_counts[disaster] = disaster_counts.get(disaster, 0) + 1
+        if not self.total_events:
+            return {"error": "No events logged"}
         
         report = {
-            "total_events": len(self.events_log),
-            "severity_distribution": severity_counts,
-            "disaster_distribution": disaster_counts,
+            "total_events": self.total_events,
+            "severity_distribution": dict(self.severity_counts),
+            "disaster_distribution": dict(self.disaster_counts),
             "log_file": self.log_file,
             "report_generated": datetime.now().isoformat()
         }
@@ -94,21 +327,116 @@ class EventLogger:
         return report
 
 
-def analyze_environment_state() -> Dict:
+def merge_reports(reports: Iterable[Dict]) -> Dict:
+    """
+    Combine reports from several EventLoggers into one fleet-wide report.
+    
+    Accepts reports as returned by generate_report() or merge_reports(),
+    including ones that went through JSON (where severity keys become
+    strings), so partial reports can be produced per sensor or per process
+    and merged without any logger holding every event.
+    
+    Args:
+        reports: Reports to merge; "No events logged" reports are skipped
+    
+    Returns:
+        Report with summed counts and the list of contributing log files
+    """
+    severity_counts: Dict[int, int] = {}
+    disaster_counts: Dict[str, int] = {}
+    total_events = 0
+    log_files: List[str] = []
+    
+    for report in reports:
+        if "error" in report:
+            continue
+        total_events += report["total_events"]
+        for severity, count in report["severity_distribution"].items():
+            severity = int(severity)
+            severity_counts[severity] = severity_counts.get(severity, 0) + count
+        for disaster, count in report["disaster_distribution"].items():
+            disaster_counts[disaster] = disaster_counts.get(disaster, 0) + count
+        if "log_files" in report:
+            log_files.extend(report["log_files"])
+        else:
+            log_files.append(report["log_file"])
+    
+    if not total_events:
+        return {"error": "No events logged"}
+    
+    return {
+        "total_events": total_events,
+        "severity_distribution": severity_counts,
+        "disaster_distribution": disaster_counts,
+        "log_files": log_files,
+        "report_generated": datetime.now().isoformat()
+    }
+
+
+def _change_token(environment):
+    """
+    Value that changes whenever a new analysis would differ.
+    
+    This is the environment version, paired with its summary_horizon()
+    when it has one, since a correlator's incidents expire as time passes.
+    """
+    horizon = getattr(environment, "summary_horizon", None)
+    horizon = horizon() if horizon is not None else None
+    return environment.version if horizon is None else (environment.version, horizon)
+
+
+def analyze_environment_state(environment=None, recent: int = 3,
+                              since_version: Optional[Union[int, Tuple[int, int]]] = None
+                              ) -> Optional[Dict]:
     """
     Analyze the current state of the disaster environment.
     
+    Analyses are memoized per change token and parameters, so polling an
+    environment that has not changed returns the cached snapshot in O(1).
+    The token is the environment version or, with an incident correlator,
+    a (version, summary_horizon()) pair. Snapshots are shared between
+    callers and must be treated as read-only; analysis_timestamp is the
+    time the snapshot was taken.
+    
+    Args:
+        environment: DisasterEnvironment to analyze (default: the global environment)
+        recent: Number of most recent events to include
+        since_version: "version" of a previous analysis; if the environment
+            has not changed since, None is returned instead of a snapshot
+    
     Returns:
-        Dictionary containing environmental analysis
+        Dictionary containing environmental analysis and its change token
+        under "version", or None if the environment is still at since_version
     """
-    environment = get_environment()
+    if environment is None:
+        environment = get_environment()
+    token = _change_token(environment)
+    if (since_version is not None and type(since_version) is type(token)
+            and since_version >= token):
+        return None
+    
+    key = (token, recent)
+    with _analysis_lock:
+        cache = _analysis_caches.get(environment)
+        if cache is None:
+            cache = _analysis_caches[environment] = OrderedDict()
+        analysis = cache.get(key)
+        if analysis is not None:
+            cache.move_to_end(key)
+            return analysis
+    
     summary = environment.get_event_summary()
-    recent = environment.get_recent_events(3)
+    recent_events = environment.get_recent_events(recent) if recent > 0 else []
     
     analysis = {
         "environment_summary": summary,
-        "recent_events": [e.to_dict() for e in recent],
-        "analysis_timestamp": datetime.now().isoformat()
+        "recent_events": to_dicts(recent_events),
+        "analysis_timestamp": environment.now().isoformat(),
+        "version": token
     }
     
+    with _analysis_lock:
+        cache[key] = analysis
+        if len(cache) > ANALYSIS_CACHE_SIZE:
+            cache.popitem(last=False)
     return analysis
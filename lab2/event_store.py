@@ -0,0 +1,239 @@
+"""
+LAB 2: Columnar Event Store
+
+This module provides a struct-of-arrays store for disaster events. Each
+event field is kept in a typed ``array`` column (small-int codes for
+enumerations, int32 for damage and population, int64 for timestamps), so
+a stored event costs a few dozen bytes instead of a full Python object.
+The store can be unbounded or capped, in which case it behaves as a ring
+buffer that overwrites the oldest events.
+"""
+
+from array import array
+from collections.abc import Sequence
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Column layout: (name, array typecode)
+COLUMNS = (
+    ("event_number", "q"),
+    ("disaster_type", "b"),
+    ("severity_level", "b"),
+    ("location", "h"),
+    ("damage_assessment", "i"),
+    ("affected_population", "i"),
+    ("timestamp", "q"),
+)
+
+Row = Tuple[int, int, int, int, int, int, int]
+
+
+class ColumnarEventStore:
+    """
+    Struct-of-arrays storage for encoded disaster events.
+
+    Rows are tuples of integers in COLUMNS order. The store knows nothing
+    about DisasterEvent itself; encoding and decoding is left to the owner.
+
+    Attributes:
+        capacity: Maximum number of retained rows, or None for unbounded
+        columns: Mapping of column name to its typed array
+        total_appended: Number of rows ever appended, including evicted ones
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        """
+        Initialize an empty store.
+
+        Args:
+            capacity: Maximum number of rows to retain (None for unbounded)
+        """
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+
+        self.capacity = capacity
+        self.columns: Dict[str, array] = {name: array(code) for name, code in COLUMNS}
+        self._arrays: List[array] = list(self.columns.values())
+        self._start = 0
+        self.total_appended = 0
+
+    def __len__(self) -> int:
+        return len(self._arrays[0])
+
+    @property
+    def dropped(self) -> int:
+        """Number of rows evicted because of the capacity limit."""
+        return self.total_appended - len(self)
+
+    def _is_full(self) -> bool:
+        return self.capacity is not None and len(self) >= self.capacity
+
+    def append(self, row: Row) -> None:
+        """
+        Append one encoded row, evicting the oldest row when full.
+
+        Args:
+            row: Tuple of integers in COLUMNS order
+        """
+        if self._is_full():
+            pos = self._start
+            for column, value in zip(self._arrays, row):
+                column[pos] = value
+            self._start = (pos + 1) % self.capacity
+        else:
+            for column, value in zip(self._arrays, row):
+                column.append(value)
+        self.total_appended += 1
+
+    def extend(self, batch: Dict[str, array]) -> None:
+        """
+        Append a batch of rows given as one typed array per column.
+
+        Args:
+            batch: Mapping of column name to an array with the column's typecode
+        """
+        arrays = [batch[name] for name, _ in COLUMNS]
+        count = len(arrays[0])
+        if any(len(a) != count for a in arrays):
+            raise ValueError("all batch columns must have the same length")
+
+        offset = 0
+        if self.capacity is not None:
+            # Only the newest `capacity` rows of the batch can survive
+            if count > self.capacity:
+                offset = count - self.capacity
+                self.total_appended += offset
+
+            room = self.capacity - len(self)
+            if room > 0:
+                take = min(room, count - offset)
+                for column, values in zip(self._arrays, arrays):
+                    column.extend(values[offset:offset + take])
+                offset += take
+                self.total_appended += take
+
+            # Overwrite the oldest rows in at most two contiguous runs
+            while offset < count:
+                pos = self._start
+                take = min(self.capacity - pos, count - offset)
+                for column, values in zip(self._arrays, arrays):
+                    column[pos:pos + take] = values[offset:offset + take]
+                self._start = (pos + take) % self.capacity
+                offset += take
+                self.total_appended += take
+        else:
+            for column, values in zip(self._arrays, arrays):
+                column.extend(values)
+            self.total_appended += count
+
+    def _physical(self, index: int) -> int:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("event store index out of range")
+        return (self._start + index) % size if self._start else index
+
+    def row(self, index: int) -> Row:
+        """Return the encoded row at a logical index (0 is the oldest)."""
+        pos = self._physical(index)
+        return tuple(column[pos] for column in self._arrays)
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> List[Row]:
+        """Return encoded rows for the logical range [start, stop)."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if start >= stop:
+            return []
+        return list(zip(*(self.column(name, start, stop) for name, _ in COLUMNS)))
+
+    def column(self, name: str, start: int = 0, stop: Optional[int] = None) -> array:
+        """
+        Return a column for the logical range [start, stop) in oldest-first order.
+
+        Args:
+            name: Column name from COLUMNS
+            start: First logical index
+            stop: End logical index (exclusive), defaults to the store length
+
+        Returns:
+            A typed array (a copy, safe to keep across appends)
+        """
+        data = self.columns[name]
+        size = len(data)
+        start, stop, _ = slice(start, stop).indices(size)
+        if not self._start:
+            return data[start:stop]
+
+        # Ring buffer has wrapped: logical order is data[_start:] + data[:_start]
+        first = size - self._start
+        if stop <= first:
+            return data[self._start + start:self._start + stop]
+        if start >= first:
+            return data[start - first:stop - first]
+        return data[self._start + start:] + data[:stop - first]
+
+    def clear(self) -> None:
+        """Remove all rows."""
+        for column in self._arrays:
+            del column[:]
+        self._start = 0
+        self.total_appended = 0
+
+
+class StoredEventList(Sequence):
+    """
+    Read-only sequence view over a ColumnarEventStore.
+
+    Events are materialised through the supplied decoder only when they are
+    indexed or iterated, so the backing store never holds event objects.
+    Events are added through the owning environment, which also updates
+    its aggregates and indexes, never through the view.
+    """
+
+    def __init__(self, store: ColumnarEventStore, decode: Callable[[Row], object],
+                 serialize: Optional[Callable[[List[Row]], List[tuple]]] = None):
+        """
+        Initialize the view.
+
+        Args:
+            store: The backing columnar store
+            decode: Function converting an encoded row to an event
+            serialize: Optional function converting many encoded rows to
+                serialised records in one pass
+        """
+        self.store = store
+        self._decode = decode
+        self._serialize = serialize
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self.store))
+            if step != 1:
+                return [self._decode(self.store.row(i)) for i in range(start, stop, step)]
+            return [self._decode(row) for row in self.store.rows(start, stop)]
+        return self._decode(self.store.row(index))
+
+    def __iter__(self):
+        decode = self._decode
+        # Decode in chunks so iteration does not copy the whole store at once
+        size = len(self.store)
+        for start in range(0, size, 4096):
+            for row in self.store.rows(start, min(start + 4096, size)):
+                yield decode(row)
+
+    def to_records(self, start: int = 0, stop: Optional[int] = None) -> List[tuple]:
+        """
+        Serialise the events in the logical range [start, stop) as records.
+
+        Requires a serialize function; rows are converted directly without
+        materialising events.
+        """
+        if self._serialize is None:
+            raise TypeError("StoredEventList was created without a serialize function")
+        return self._serialize(self.store.rows(start, stop))
+
+    def append(self, event) -> None:
+        raise TypeError("StoredEventList is read-only; add events with "
+                        "DisasterEnvironment.ingest_event()")
@@ -0,0 +1,133 @@
+"""
+LAB 2: Local In-Process Transport
+
+This module lets the SPADE agents of the labs start without an XMPP
+server. SPADE's Container already delivers messages between agents that
+live in the same process; what still needs a server is the connection
+and login done in Agent.start(). A local agent replaces the XMPP client
+with LocalXMPPClient, an in-memory stand-in, so any number of agents can
+be started in one process for development and load testing.
+
+Messages to agents outside the process cannot be delivered and are
+counted and dropped.
+"""
+
+import logging
+from typing import Callable, Dict, List, Type
+
+from spade.agent import Agent
+from spade.behaviour import FSMBehaviour
+from spade.presence import PresenceManager
+
+logger = logging.getLogger(__name__)
+
+
+class _LocalStanza(dict):
+    """Minimal message stanza for recipients outside the process."""
+
+    def __init__(self, client: "LocalXMPPClient"):
+        super().__init__()
+        self._client = client
+
+    def chat(self) -> None:
+        pass
+
+    def append(self, item) -> None:
+        pass
+
+    def send(self) -> None:
+        self._client.undeliverable(self)
+
+
+class LocalXMPPClient:
+    """
+    In-memory stand-in for SPADE's XMPP client.
+
+    Provides the subset of the client interface that an agent uses when it
+    starts, sets its presence and stops. It never opens a network connection.
+    """
+
+    def __init__(self, jid):
+        """
+        Initialize the client.
+
+        Args:
+            jid: The JID of the owning agent
+        """
+        self.boundjid = jid
+        self.handlers: Dict[str, List[Callable]] = {}
+        self.presence_updates = 0
+        self.undelivered = 0
+
+    def add_event_handler(self, name: str, handler: Callable) -> None:
+        self.handlers.setdefault(name, []).append(handler)
+
+    def send_presence(self, **kwargs) -> None:
+        self.presence_updates += 1
+
+    def Message(self) -> _LocalStanza:
+        return _LocalStanza(self)
+
+    def send(self, stanza) -> None:
+        self.undeliverable(stanza)
+
+    def undeliverable(self, stanza) -> None:
+        self.undelivered += 1
+        logger.warning(f"{self.boundjid}: no local agent for {stanza.get('to')}, message dropped")
+
+    async def disconnect(self) -> None:
+        pass
+
+
+class LocalAgentMixin:
+    """
+    Agent mixin that starts the agent on LocalXMPPClient.
+
+    Mix it in before the SPADE agent class (or use local_agent()) to run
+    the agent without a server; messages to other agents in the same
+    process are routed by SPADE's Container as usual.
+    """
+
+    async def _async_start(self, auto_register: bool = True) -> None:
+        """Start the agent like Agent._async_start, minus the XMPP login."""
+        await self._hook_plugin_before_connection()
+
+        self.client = LocalXMPPClient(self.jid)
+        self.presence = PresenceManager(agent=self, approve_all=False)
+
+        await self._hook_plugin_after_connection()
+
+        await self.setup()
+        self._alive.set()
+        for behaviour in self.behaviours:
+            if not behaviour.is_running:
+                behaviour.set_agent(self)
+                if issubclass(type(behaviour), FSMBehaviour):
+                    for _, state in behaviour.get_states().items():
+                        state.set_agent(self)
+                behaviour.start()
+
+    async def _async_stop(self) -> None:
+        """Stop the agent and leave SPADE's Container."""
+        await super()._async_stop()
+        self.container.unregister(self.jid)
+
+
+_local_classes: Dict[type, type] = {}
+
+
+def local_agent(agent_class: Type[Agent]) -> Type[Agent]:
+    """
+    Return a variant of a SPADE agent class that runs on the local transport.
+
+    Args:
+        agent_class: An Agent subclass, e.g. SensorAgent
+
+    Returns:
+        A subclass of agent_class with LocalAgentMixin applied
+    """
+    local_class = _local_classes.get(agent_class)
+    if local_class is None:
+        local_class = type(f"Local{agent_class.__name__}", (LocalAgentMixin, agent_class), {})
+        _local_classes[agent_class] = local_class
+    return local_class
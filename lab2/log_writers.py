@@ -0,0 +1,450 @@
+"""
+LAB 2: Event Log Writers
+
+This module provides append-only writers used by EventLogger to persist
+events incrementally, plus a lazy reader for the files they produce.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterator, List, Optional
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "spill")
+
+
+class JsonlLogWriter:
+    """
+    Appends log records to a file as one JSON object per line.
+
+    Records go through a buffered file object and are flushed to the
+    operating system when any of the configured thresholds is reached, so
+    the cost of a write is proportional to the new record only.
+    """
+
+    def __init__(self, path: str, flush_records: Optional[int] = 100,
+                 flush_bytes: Optional[int] = 64 * 1024,
+                 flush_interval: Optional[float] = 5.0,
+                 buffer_size: int = 64 * 1024):
+        """
+        Open the log file for appending.
+
+        Args:
+            path: File to append JSON lines to
+            flush_records: Flush after this many buffered records (None to disable)
+            flush_bytes: Flush after this many buffered bytes (None to disable)
+            flush_interval: Flush when a write happens this many seconds after
+                the previous flush (None to disable)
+            buffer_size: Size of the underlying file buffer in bytes
+        """
+        self.path = path
+        self.flush_records = flush_records
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.records_written = 0
+        self._file = open(path, 'a', encoding='utf-8', buffering=buffer_size)
+        self._pending_records = 0
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def write(self, record: Dict) -> None:
+        """
+        Append one record, flushing if a threshold has been reached.
+
+        Args:
+            record: JSON-serialisable dictionary
+        """
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        self._file.write(line)
+        self.records_written += 1
+        self._pending_records += 1
+        self._pending_bytes += len(line)
+
+        if ((self.flush_records is not None and self._pending_records >= self.flush_records)
+                or (self.flush_bytes is not None and self._pending_bytes >= self.flush_bytes)
+                or (self.flush_interval is not None
+                    and time.monotonic() - self._last_flush >= self.flush_interval)):
+            self.flush()
+
+    def flush(self, fsync: bool = False) -> None:
+        """
+        Push buffered records to the operating system.
+
+        Args:
+            fsync: Also ask the operating system to commit the file to disk
+        """
+        self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+        self._pending_records = 0
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class BackgroundLogWriter:
+    """
+    Hands log records to a dedicated writer thread through a bounded queue.
+
+    write() only enqueues, so callers running on an asyncio event loop never
+    wait on file I/O unless they choose the "block" overflow policy. The
+    writer thread drains the queue in batches into the wrapped writer.
+
+    Overflow policies when the queue is full:
+        block: wait until the writer thread makes room
+        drop_oldest: discard the oldest queued record
+        spill: append records to a spill file until the writer catches up;
+            spilled records are written back in order afterwards
+    """
+
+    def __init__(self, writer: JsonlLogWriter, max_queue: int = 10000,
+                 overflow: str = "block", batch_size: int = 256,
+                 spill_path: Optional[str] = None):
+        """
+        Start the writer thread.
+
+        Args:
+            writer: Writer that performs the actual file output
+            max_queue: Maximum number of queued records
+            overflow: One of OVERFLOW_POLICIES
+            batch_size: Maximum number of records written per batch
+            spill_path: Spill file prefix for the "spill" policy (default: <path>.spill);
+                each spill episode writes its own numbered file
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        if max_queue <= 0:
+            raise ValueError("max_queue must be a positive integer")
+
+        self.writer = writer
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.spill_path = spill_path or f"{writer.path}.spill"
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._spill_file = None
+        self._spill_episode = 0
+        self._accepted = 0
+        self._done = 0
+        self._flush_target = 0
+        self._flushed = 0
+        self._error: Optional[BaseException] = None
+
+        self.max_queue_depth = 0
+        self.records_written = 0
+        self.dropped = 0
+        self.spilled = 0
+        self._latencies = deque(maxlen=1024)
+
+        self._thread = threading.Thread(target=self._run, name="BackgroundLogWriter", daemon=True)
+        self._thread.start()
+
+    @property
+    def path(self) -> str:
+        return self.writer.path
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def write(self, record: Dict) -> None:
+        """
+        Enqueue one record for the writer thread.
+
+        Args:
+            record: JSON-serialisable dictionary
+        """
+        with self._cond:
+            self._raise_error()
+            if self._closed:
+                raise ValueError("write to closed BackgroundLogWriter")
+            self._accepted += 1
+
+            # Once spilling has started, later records must follow the spill
+            # file to keep the output in order
+            if self._spill_file is not None:
+                self._spill(record)
+                return
+
+            if len(self._queue) >= self.max_queue:
+                if self.overflow == "block":
+                    while (len(self._queue) >= self.max_queue and not self._closed
+                           and self._error is None):
+                        self._cond.wait()
+                    self._raise_error()
+                elif self.overflow == "drop_oldest":
+                    self._queue.popleft()
+                    self.dropped += 1
+                    self._done += 1
+                else:
+                    self._spill_episode += 1
+                    self._spill_file = open(f"{self.spill_path}.{self._spill_episode}", 'w',
+                                            encoding='utf-8')
+                    self._spill(record)
+                    return
+
+            self._queue.append(record)
+            if len(self._queue) > self.max_queue_depth:
+                self.max_queue_depth = len(self._queue)
+            self._cond.notify_all()
+
+    def _spill(self, record: Dict) -> None:
+        self._spill_file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self.spilled += 1
+
+    def _raise_error(self) -> None:
+        """Re-raise a failure of the writer thread in the calling thread."""
+        if self._error is not None:
+            raise RuntimeError("BackgroundLogWriter thread failed") from self._error
+
+    def _run(self) -> None:
+        """Writer thread: run the write loop and record why it stopped."""
+        try:
+            self._write_loop()
+        except BaseException as error:
+            with self._cond:
+                self._error = error
+        finally:
+            # Wake callers blocked in write() or flush() so they see the error
+            with self._cond:
+                self._cond.notify_all()
+
+    def _write_loop(self) -> None:
+        """Drain the queue and the spill file in batches."""
+        while True:
+            spill_path = None
+            with self._cond:
+                while (not self._queue and self._spill_file is None and not self._closed
+                       and self._flushed >= self._flush_target):
+                    self._cond.wait()
+
+                batch: List[Dict] = []
+                for _ in range(min(self.batch_size, len(self._queue))):
+                    batch.append(self._queue.popleft())
+                if not batch and self._spill_file is not None:
+                    self._spill_file.close()
+                    spill_path = self._spill_file.name
+                    self._spill_file = None
+                if not batch and spill_path is None and self._closed:
+                    break
+                self._cond.notify_all()
+
+            written = 0
+            start = time.perf_counter()
+            for record in batch:
+                self.writer.write(record)
+            written += len(batch)
+            if spill_path is not None:
+                for record in read_event_log(spill_path):
+                    self.writer.write(record)
+                    written += 1
+                os.remove(spill_path)
+            elapsed = time.perf_counter() - start
+
+            with self._cond:
+                if written:
+                    self._latencies.append(elapsed)
+                self._done += written
+                self.records_written += written
+                target = self._flush_target
+            if target > self._flushed and self._done >= target:
+                self.writer.flush(fsync=True)
+                with self._cond:
+                    self._flushed = target
+                    self._cond.notify_all()
+
+        self.writer.close()
+
+    def flush(self) -> None:
+        """
+        Block until every record written so far is on disk.
+
+        Raises:
+            RuntimeError: If the writer thread failed or stopped before the
+                records were written
+        """
+        with self._cond:
+            self._raise_error()
+            target = self._accepted
+            if target <= self._flushed:
+                return
+            self._flush_target = max(self._flush_target, target)
+            self._cond.notify_all()
+            while self._flushed < target and self._thread.is_alive() and self._error is None:
+                self._cond.wait()
+            self._raise_error()
+            if self._flushed < target:
+                raise RuntimeError("BackgroundLogWriter thread stopped with records unwritten")
+
+    def close(self) -> None:
+        """
+        Flush outstanding records, stop the writer thread and close the file.
+
+        Raises:
+            RuntimeError: If the writer thread failed; the thread is stopped
+                and the wrapped writer closed regardless
+        """
+        try:
+            self.flush()
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            self._thread.join()
+            if self._error is not None and not self.writer.closed:
+                # Release the file; the thread's error is the one reported
+                try:
+                    self.writer.close()
+                except Exception:
+                    pass
+        with self._cond:
+            self._raise_error()
+
+    def metrics(self) -> Dict:
+        """
+        Report queue and write-latency statistics.
+
+        Returns:
+            Dictionary with queue depth, counters and batch write latency in ms
+        """
+        with self._cond:
+            latencies = sorted(self._latencies)
+        count = len(latencies)
+
+        def percentile(p: float) -> float:
+            return round(latencies[min(count - 1, int(p * count))] * 1000, 3) if count else 0.0
+
+        return {
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self.max_queue_depth,
+            "queue_capacity": self.max_queue,
+            "records_written": self.records_written,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "batch_write_latency_ms": {
+                "count": count,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "max": round(latencies[-1] * 1000, 3) if count else 0.0
+            }
+        }
+
+
+# Characters that can end an element of a JSON array
+_DELIMITERS = frozenset(",] \t\r\n")
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
+def _iter_json_array(f, chunk_size: int = 64 * 1024) -> Iterator:
+    """
+    Incrementally decode the elements of a JSON array from a text file.
+
+    The file is read in chunks and each element is decoded as soon as it is
+    complete, so memory use is bounded by the chunk size and the largest
+    element rather than by the size of the file.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace() -> str:
+        """Advance past whitespace and return the next character ('' at end of file)."""
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ""
+
+    if skip_whitespace() != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+    if skip_whitespace() == "]":
+        return
+
+    while True:
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The element is cut off at the end of the buffer
+                if not fill():
+                    raise
+                continue
+            # A number split across chunks decodes as a shorter number, so
+            # only accept one that is followed by a delimiter
+            if (end == len(buffer) or (not isinstance(value, (dict, list, str))
+                                       and buffer[end] not in _DELIMITERS)) and fill():
+                continue
+            break
+        pos = end
+        yield value
+
+        separator = skip_whitespace()
+        pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, found {separator!r}")
+        skip_whitespace()
+
+
+def read_event_log(path: str, chunk_size: int = 64 * 1024) -> Iterator[Dict]:
+    """
+    Lazily iterate over the records of an event log file.
+
+    JSON-lines files are streamed one record at a time. Files holding a
+    single JSON array (the format written by EventLogger.save_logs) are
+    decoded incrementally, element by element, so neither format is ever
+    loaded whole.
+
+    Args:
+        path: Path to the log file
+        chunk_size: Characters read at a time from a JSON array file
+
+    Yields:
+        Logged event dictionaries in file order
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+
+        if first == '[':
+            yield from _iter_json_array(f, chunk_size)
+            return
+
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
@@ -0,0 +1,359 @@
+"""
+LAB 2: Event Publication Between Agents
+
+This module lets sensors share their observations with other agents over
+SPADE messages without sending one message per event:
+
+- EventPublisherBehaviour buffers a sensor's events and sends them to its
+  subscribers as one message per batch, when max_batch events have been
+  buffered or max_delay seconds after the first buffered event, whichever
+  comes first.
+- SubscriptionBehaviour adds and removes subscribers when agents send
+  "subscribe" or "cancel" requests.
+- EventBatchReceiverBehaviour decodes incoming batches, optionally adds
+  the events to an environment, and counts events per message.
+- EventSubscriberAgent subscribes to a list of publishers and receives
+  their batches.
+
+Batches are encoded with event_codec, a compact versioned format; the
+messages carry the "disaster-events" ontology so receivers can match them
+with batch_template().
+"""
+
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from spade.agent import Agent
+from spade.behaviour import CyclicBehaviour, OneShotBehaviour
+from spade.message import Message
+from spade.template import Template
+
+try:
+    from .disaster_environment import DisasterEnvironment, DisasterEvent
+    from .event_codec import FORMAT_VERSION, decode_batch, encode_batch
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from disaster_environment import DisasterEnvironment, DisasterEvent
+    from event_codec import FORMAT_VERSION, decode_batch, encode_batch
+
+logger = logging.getLogger(__name__)
+
+ONTOLOGY = "disaster-events"
+LANGUAGE = f"lab2-event-batch/{FORMAT_VERSION}"
+
+
+def batch_template() -> Template:
+    """Template matching event batch messages."""
+    return Template(metadata={"performative": "inform", "ontology": ONTOLOGY})
+
+
+def subscription_template() -> Template:
+    """Template matching subscribe and cancel requests."""
+    return (Template(metadata={"performative": "subscribe", "ontology": ONTOLOGY}) |
+            Template(metadata={"performative": "cancel", "ontology": ONTOLOGY}))
+
+
+def _sender(msg: Message) -> str:
+    return str(msg.sender.bare)
+
+
+class EventPublisherBehaviour(CyclicBehaviour):
+    """
+    Publishes events to subscribers in batches.
+
+    Events are handed over with publish() and sent by the behaviour, so
+    callers never wait for the network. Each batch is encoded once and
+    sent to every subscriber; while there are no subscribers, published
+    events are counted as dropped instead of buffered. A batch that
+    cannot be encoded, e.g. because an event has an id other than
+    EVT_<number>, is dropped with a warning and the rest are still sent.
+    """
+
+    def __init__(self, subscribers: Sequence[str] = (), max_batch: int = 100,
+                 max_delay: float = 1.0):
+        """
+        Initialize the publisher.
+
+        Args:
+            subscribers: JIDs to send batches to; more can subscribe later
+            max_batch: Most events per message; a full buffer is sent at once
+            max_delay: Longest time in seconds an event waits to be sent
+        """
+        super().__init__()
+        if max_batch <= 0:
+            raise ValueError("max_batch must be positive")
+        self.subscribers: List[str] = list(subscribers)
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.sequence = 0
+        self.batches = 0
+        self.messages = 0
+        self.events = 0
+        self.dropped = 0
+        self.bytes_sent = 0
+        self._buffer: List[DisasterEvent] = []
+        # Set by the first event of a window and when the buffer is full
+        self._ready = asyncio.Event()
+
+    def publish(self, event: DisasterEvent) -> None:
+        """Queue an event for the next batch."""
+        if not self.subscribers:
+            self.dropped += 1
+            return
+        self._buffer.append(event)
+        if len(self._buffer) == 1 or len(self._buffer) >= self.max_batch:
+            self._ready.set()
+
+    def publish_many(self, events: Sequence[DisasterEvent]) -> None:
+        """Queue several events, e.g. one generate_events() batch."""
+        if not self.subscribers:
+            self.dropped += len(events)
+            return
+        first = not self._buffer
+        self._buffer.extend(events)
+        if (first and self._buffer) or len(self._buffer) >= self.max_batch:
+            self._ready.set()
+
+    @property
+    def pending(self) -> int:
+        """Events buffered but not sent yet."""
+        return len(self._buffer)
+
+    async def run(self):
+        """Wait for a batch window to close, then send the buffered events."""
+        await self._ready.wait()
+        self._ready.clear()
+        if len(self._buffer) < self.max_batch:
+            try:
+                await asyncio.wait_for(self._ready.wait(), self.max_delay)
+            except asyncio.TimeoutError:
+                pass
+            self._ready.clear()
+        await self.flush()
+
+    async def on_end(self):
+        """Send what is still buffered when the behaviour ends."""
+        if self._buffer:
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"{self.agent.jid}: {len(self._buffer)} buffered events "
+                               f"not published: {e}")
+
+    async def flush(self) -> None:
+        """Send all buffered events now, in messages of at most max_batch events."""
+        events, self._buffer = self._buffer, []
+        for start in range(0, len(events), self.max_batch):
+            batch = events[start:start + self.max_batch]
+            subscribers = list(self.subscribers)
+            if not subscribers:
+                self.dropped += len(batch)
+                continue
+            try:
+                payload = encode_batch(batch, self.sequence)
+            except ValueError as e:
+                self.dropped += len(batch)
+                logger.warning(f"Dropped a batch of {len(batch)} events that cannot be "
+                               f"encoded: {e}")
+                continue
+            self.sequence += 1
+            for jid in subscribers:
+                msg = Message(to=jid, body=payload, metadata={
+                    "performative": "inform",
+                    "ontology": ONTOLOGY,
+                    "language": LANGUAGE
+                })
+                await self.send(msg)
+            self.batches += 1
+            self.events += len(batch)
+            self.messages += len(subscribers)
+            self.bytes_sent += len(payload) * len(subscribers)
+
+    def stats(self) -> Dict:
+        """
+        Summarise what has been published.
+
+        Returns:
+            Dictionary with batches, messages, events sent and dropped,
+            events per batch and payload bytes per event
+        """
+        return {
+            "batches": self.batches,
+            "messages": self.messages,
+            "events": self.events,
+            "dropped": self.dropped,
+            "pending": self.pending,
+            "events_per_batch": round(self.events / self.batches, 2) if self.batches else 0,
+            "bytes_per_event": (round(self.bytes_sent / (self.events * len(self.subscribers)), 2)
+                                if self.events and self.subscribers else 0)
+        }
+
+
+class SubscriptionBehaviour(CyclicBehaviour):
+    """Handles subscribe and cancel requests for an EventPublisherBehaviour."""
+
+    def __init__(self, publisher: EventPublisherBehaviour, timeout: float = 1.0):
+        """
+        Initialize the behaviour.
+
+        Args:
+            publisher: Publisher whose subscribers are managed
+            timeout: Seconds to wait for a request per cycle
+        """
+        super().__init__()
+        self.publisher = publisher
+        self.timeout = timeout
+
+    async def run(self):
+        """Apply the next subscription request, if any."""
+        msg = await self.receive(timeout=self.timeout)
+        if msg is None:
+            return
+        jid = _sender(msg)
+        subscribers = self.publisher.subscribers
+        if msg.get_metadata("performative") == "subscribe":
+            if jid not in subscribers:
+                subscribers.append(jid)
+                logger.info(f"{self.agent.jid}: {jid} subscribed to events")
+        elif jid in subscribers:
+            subscribers.remove(jid)
+            logger.info(f"{self.agent.jid}: {jid} unsubscribed from events")
+
+
+class EventBatchReceiverBehaviour(CyclicBehaviour):
+    """
+    Receives and decodes event batches.
+
+    Add it with batch_template() so that it only sees batch messages.
+    Batch sequence numbers are tracked per sender, so batches that never
+    arrived are counted as missed.
+    """
+
+    def __init__(self, environment: Optional[DisasterEnvironment] = None,
+                 on_events: Optional[Callable[[str, List[DisasterEvent]], None]] = None,
+                 timeout: float = 1.0):
+        """
+        Initialize the receiver.
+
+        Args:
+            environment: Environment to add received events to (default: none)
+            on_events: Called with the sender's JID and the events of every batch
+            timeout: Seconds to wait for a message per cycle
+        """
+        super().__init__()
+        self.environment = environment
+        self.on_events = on_events
+        self.timeout = timeout
+        self.messages = 0
+        self.events = 0
+        self.bytes_received = 0
+        self.missed_batches = 0
+        self.rejected = 0
+        self._sequences: Dict[str, int] = {}
+
+    async def run(self):
+        """Decode the next batch, if any."""
+        msg = await self.receive(timeout=self.timeout)
+        if msg is None:
+            return
+        sender = _sender(msg)
+        try:
+            sequence, events = decode_batch(msg.body)
+        except ValueError as e:
+            self.rejected += 1
+            logger.warning(f"{self.agent.jid}: rejected event batch from {sender}: {e}")
+            return
+        self.receive_batch(sender, sequence, events, len(msg.body))
+
+    def receive_batch(self, sender: str, sequence: int, events: List[DisasterEvent],
+                      size: int = 0) -> None:
+        """
+        Account for and deliver one decoded batch.
+
+        Args:
+            sender: JID of the publisher
+            sequence: The batch's sequence number
+            events: The decoded events
+            size: Payload size in bytes
+        """
+        last = self._sequences.get(sender)
+        if last is not None and sequence > last + 1:
+            self.missed_batches += sequence - last - 1
+        self._sequences[sender] = sequence
+        self.messages += 1
+        self.events += len(events)
+        self.bytes_received += size
+        if self.environment is not None:
+            for event in events:
+                self.environment.ingest_event(event)
+        if self.on_events is not None:
+            self.on_events(sender, events)
+
+    def stats(self) -> Dict:
+        """
+        Summarise what has been received.
+
+        Returns:
+            Dictionary with messages, events, events per message, payload
+            bytes per event, and missed and rejected batches
+        """
+        return {
+            "messages": self.messages,
+            "events": self.events,
+            "events_per_message": round(self.events / self.messages, 2) if self.messages else 0,
+            "bytes_per_event": round(self.bytes_received / self.events, 2) if self.events else 0,
+            "missed_batches": self.missed_batches,
+            "rejected": self.rejected
+        }
+
+
+class SubscribeBehaviour(OneShotBehaviour):
+    """Sends a subscribe request to each publisher."""
+
+    def __init__(self, publishers: Sequence[str]):
+        super().__init__()
+        self.publishers = list(publishers)
+
+    async def run(self):
+        """Request the publishers' event batches."""
+        for jid in self.publishers:
+            msg = Message(to=jid, metadata={"performative": "subscribe", "ontology": ONTOLOGY})
+            await self.send(msg)
+
+
+class EventSubscriberAgent(Agent):
+    """
+    An agent that subscribes to sensors and receives their event batches.
+
+    The received events can be added to an environment of the agent's
+    own, giving it a merged view of everything its publishers observe.
+    """
+
+    def __init__(self, jid: str, password: str, publishers: Sequence[str] = (),
+                 environment: Optional[DisasterEnvironment] = None,
+                 on_events: Optional[Callable[[str, List[DisasterEvent]], None]] = None,
+                 **kwargs):
+        """
+        Create a subscriber agent.
+
+        Args:
+            jid: The agent's XMPP identifier
+            password: The agent's XMPP password
+            publishers: JIDs of the sensors to subscribe to when starting
+            environment: Environment to add received events to (default: none)
+            on_events: Called with the sender's JID and the events of every batch
+            **kwargs: Passed on to spade.agent.Agent
+        """
+        super().__init__(jid, password, **kwargs)
+        self.publishers = list(publishers)
+        self.receiver = EventBatchReceiverBehaviour(environment, on_events)
+
+    async def setup(self):
+        """Start receiving batches, then subscribe to the publishers."""
+        logger.info(f"Setting up EventSubscriberAgent: {self.jid}")
+        self.add_behaviour(self.receiver, batch_template())
+        if self.publishers:
+            self.add_behaviour(SubscribeBehaviour(self.publishers))
@@ -0,0 +1,215 @@
+"""
+LAB 2: Monte Carlo Scenario Runner
+
+This module runs many independent seeded DisasterEnvironments for what-if
+analysis and aggregates them into distributions: severity and disaster
+type mix, population-at-risk percentiles and how often runs see critical
+events.
+
+Every environment draws from its own generator, so runs share no random
+state and can be spread across processes. Runs are submitted to a
+ProcessPoolExecutor in chunks of consecutive seeds; each chunk returns a
+small ScenarioStats partial result rather than its environments, and
+partial results are merged as they complete. Merging is order
+independent, so the outcome depends only on the seeds, not on the
+number of workers or the chunking.
+"""
+
+import logging
+import math
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set
+
+import numpy as np
+
+try:
+    from .disaster_environment import DisasterEnvironment
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from disaster_environment import DisasterEnvironment
+
+logger = logging.getLogger(__name__)
+
+# Scenario: called with a fresh seeded environment and simulates one run.
+# Must be a module-level function so that it can be sent to worker processes.
+Scenario = Callable[[DisasterEnvironment], None]
+
+
+class ScenarioStats:
+    """
+    Mergeable statistics over a set of simulation runs.
+
+    Category counts are summed across runs; population at risk and
+    critical events are kept per run so that percentiles stay exact.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.runs = 0
+        self.events = 0
+        self.severity_counts: Dict[int, int] = {}
+        self.disaster_counts: Dict[str, int] = {}
+        self.population = array("q")
+        self.critical = array("q")
+
+    def add_run(self, environment: DisasterEnvironment) -> None:
+        """Record the outcome of one simulated environment."""
+        summary = environment.get_event_summary()
+        self.runs += 1
+        self.events += summary["total_events"]
+        for severity, count in environment.severity_counts.items():
+            self.severity_counts[severity] = self.severity_counts.get(severity, 0) + count
+        for disaster, count in environment.type_counts.items():
+            self.disaster_counts[disaster] = self.disaster_counts.get(disaster, 0) + count
+        self.population.append(summary["total_affected_population"])
+        self.critical.append(summary["critical_events"])
+
+    def merge(self, other: "ScenarioStats") -> "ScenarioStats":
+        """
+        Add another partial result to this one.
+
+        Returns:
+            self, for chaining
+        """
+        self.runs += other.runs
+        self.events += other.events
+        for severity, count in other.severity_counts.items():
+            self.severity_counts[severity] = self.severity_counts.get(severity, 0) + count
+        for disaster, count in other.disaster_counts.items():
+            self.disaster_counts[disaster] = self.disaster_counts.get(disaster, 0) + count
+        self.population.extend(other.population)
+        self.critical.extend(other.critical)
+        return self
+
+    def summary(self) -> Dict:
+        """
+        Summarize the distributions over all recorded runs.
+
+        Returns:
+            Dictionary with the severity and disaster mix (fractions of all
+            events), population-at-risk and critical-event statistics per
+            run, and the fraction of runs with at least one critical event
+        """
+        if not self.runs:
+            return {"error": "No runs recorded"}
+        population = np.frombuffer(self.population, dtype=np.int64)
+        critical = np.frombuffer(self.critical, dtype=np.int64)
+        p5, p50, p95, p99 = np.percentile(population, [5, 50, 95, 99]).tolist()
+        events = self.events or 1
+        return {
+            "runs": self.runs,
+            "events": self.events,
+            "severity_mix": {severity: round(self.severity_counts[severity] / events, 4)
+                             for severity in sorted(self.severity_counts)},
+            "disaster_mix": {disaster: round(self.disaster_counts[disaster] / events, 4)
+                             for disaster in sorted(self.disaster_counts)},
+            "population_at_risk": {
+                "mean": round(float(population.mean()), 1),
+                "p5": p5,
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+                "max": int(population.max())
+            },
+            "critical_events_per_run": {
+                "mean": round(float(critical.mean()), 3),
+                "p50": float(np.percentile(critical, 50)),
+                "p95": float(np.percentile(critical, 95)),
+                "max": int(critical.max())
+            },
+            "critical_event_frequency": round(float(np.count_nonzero(critical)) / self.runs, 4)
+        }
+
+
+def _run_chunk(first_seed: int, runs: int, events_per_run: int,
+               events_per_cycle: Optional[int], scenario: Optional[Scenario]) -> ScenarioStats:
+    """Simulate runs with consecutive seeds and return their partial statistics."""
+    stats = ScenarioStats()
+    for seed in range(first_seed, first_seed + runs):
+        # Only the aggregates are needed; retain a single event
+        environment = DisasterEnvironment(seed=seed, max_events=1)
+        if scenario is not None:
+            scenario(environment)
+        else:
+            remaining = events_per_run
+            cycle = events_per_cycle or events_per_run
+            while remaining > 0:
+                environment.generate_events(min(cycle, remaining))
+                remaining -= cycle
+        stats.add_run(environment)
+    return stats
+
+
+def run_monte_carlo(runs: int, events_per_run: int = 1000, seed: int = 0,
+                    workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                    events_per_cycle: Optional[int] = None,
+                    scenario: Optional[Scenario] = None) -> Dict:
+    """
+    Run independent seeded simulations in parallel and aggregate them.
+
+    Run i uses seed `seed + i`, so results are reproducible and do not
+    depend on workers or chunk_size.
+
+    Args:
+        runs: Number of simulations
+        events_per_run: Events generated per simulation
+        seed: Seed of the first run
+        workers: Worker processes (default: one per CPU); 1 runs everything
+            in the calling process
+        chunk_size: Runs per submitted task (default: about eight tasks per
+            worker, for load balancing)
+        events_per_cycle: Generate each run's events in batches of this
+            size, like successive sensor cycles (default: one batch)
+        scenario: Module-level function that simulates one run on a fresh
+            environment, replacing the default event generation
+
+    Returns:
+        ScenarioStats.summary() plus workers, chunks and timing
+    """
+    if runs <= 0:
+        raise ValueError("runs must be positive")
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(runs / (workers * 8)))
+    chunk_count = math.ceil(runs / chunk_size)
+    chunks = ((seed + start, min(chunk_size, runs - start))
+              for start in range(0, runs, chunk_size))
+
+    start_time = time.perf_counter()
+    stats = ScenarioStats()
+    if workers == 1:
+        for first_seed, count in chunks:
+            stats.merge(_run_chunk(first_seed, count, events_per_run, events_per_cycle, scenario))
+    else:
+        # Keep a bounded number of chunks in flight so that pending tasks
+        # and their results never pile up
+        max_pending = workers * 2
+        pending: Set[Future] = set()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                for first_seed, count in chunks:
+                    pending.add(pool.submit(_run_chunk, first_seed, count, events_per_run,
+                                            events_per_cycle, scenario))
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stats.merge(future.result())
+    elapsed = time.perf_counter() - start_time
+
+    summary = stats.summary()
+    summary.update({
+        "workers": workers,
+        "chunks": chunk_count,
+        "elapsed_seconds": round(elapsed, 3),
+        "runs_per_second": round(runs / elapsed, 1) if elapsed > 0 else float("inf")
+    })
+    logger.info(f"Monte Carlo: {runs} runs on {workers} worker(s) in {elapsed:.2f}s")
+    return summary
@@ -0,0 +1,266 @@
+"""
+LAB 2: Event Log Replay
+
+This module replays recorded event logs into a DisasterEnvironment, so a
+captured incident can be run through the monitoring and analysis code
+again, for debugging or for regression tests:
+
+- iter_events(): streams DisasterEvents out of a log file. Both the JSON
+  array written by EventLogger.save_logs and the JSON-lines format of the
+  incremental writers are decoded record by record, so memory use does
+  not grow with the size of the log.
+- EventReplayer: injects events into an environment as fast as possible,
+  in real time, or accelerated by a speed factor, keeping the recorded
+  spacing between events.
+- ReplayClock: a clock that follows the recorded timestamps; give it to
+  the environment so that its rolling windows cover recorded time.
+
+Paced replays sleep with asyncio.sleep() on the running loop, so on a
+simulation.VirtualTimeEventLoop a recorded day replays in simulated time
+without waiting for it.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Union
+
+try:
+    from .disaster_environment import DisasterEnvironment, DisasterEvent
+    from .log_writers import read_event_log
+    from .segmented_log import SegmentedLog
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from disaster_environment import DisasterEnvironment, DisasterEvent
+    from log_writers import read_event_log
+    from segmented_log import SegmentedLog
+
+logger = logging.getLogger(__name__)
+
+EventSource = Union[str, os.PathLike, Iterable[Union[DisasterEvent, Dict]]]
+
+
+def iter_events(path: Union[str, os.PathLike],
+                chunk_size: int = 64 * 1024) -> Iterator[DisasterEvent]:
+    """
+    Stream the events of a recorded log.
+
+    Args:
+        path: JSON array or JSON-lines event log, or a segmented log directory
+        chunk_size: Characters read at a time from a JSON array file
+
+    Yields:
+        DisasterEvent for each logged record, in file order
+    """
+    path = os.fspath(path)
+    if os.path.isdir(path):
+        records = SegmentedLog(path).read()
+    else:
+        records = read_event_log(path, chunk_size)
+    # Events logged together share a timestamp string; parse it once
+    last_text, last_timestamp = None, None
+    for record in records:
+        text = record["timestamp"]
+        if text != last_text:
+            last_text, last_timestamp = text, datetime.fromisoformat(text)
+        record["timestamp"] = last_timestamp
+        yield DisasterEvent.from_dict(record)
+
+
+def _as_events(source: EventSource) -> Iterator[DisasterEvent]:
+    if isinstance(source, (str, os.PathLike)):
+        return iter_events(source)
+    return (item if isinstance(item, DisasterEvent) else DisasterEvent.from_dict(item)
+            for item in source)
+
+
+class ReplayClock:
+    """
+    Clock that reports the timestamp of the most recently replayed event.
+
+    Before the first event it reports `start`, or the wall clock if no
+    start was given.
+    """
+
+    def __init__(self, start: Optional[datetime] = None):
+        """
+        Initialize the clock.
+
+        Args:
+            start: Time to report until the first event is replayed
+        """
+        self.current = start
+
+    def now(self) -> datetime:
+        """Recorded time of the replay; a drop-in for datetime.now()."""
+        return self.current if self.current is not None else datetime.now()
+
+
+class EventReplayer:
+    """
+    Injects recorded events into an environment.
+
+    With a speed, event i is injected (t_i - t_0) / speed seconds after the
+    replay started, where t_i are the recorded timestamps. Deadlines are
+    computed from the start rather than from the previous event, so the
+    time spent injecting does not accumulate into drift. Without a speed,
+    events are injected back to back.
+    """
+
+    def __init__(self, environment: DisasterEnvironment, speed: Optional[float] = None,
+                 max_gap: Optional[float] = None,
+                 on_event: Optional[Callable[[DisasterEvent], None]] = None,
+                 clock: Optional[ReplayClock] = None, yield_every: int = 1000):
+        """
+        Initialize the replayer.
+
+        Args:
+            environment: Environment the events are added to
+            speed: Replay speed relative to the recording, e.g. 1.0 for real
+                time or 60.0 for one recorded minute per second (default: as
+                fast as possible)
+            max_gap: Longest pause between two events in recorded seconds;
+                longer quiet periods are shortened to this
+            on_event: Called with every event after it has been added, e.g.
+                EventLogger.log_event to record the replay again
+            clock: ReplayClock to move to each event's timestamp; defaults
+                to the environment's clock if that is a ReplayClock
+            yield_every: When replaying as fast as possible, let other tasks
+                run after this many events
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+        self.environment = environment
+        self.speed = speed
+        self.max_gap = max_gap
+        self.on_event = on_event
+        if clock is None and isinstance(environment.clock, ReplayClock):
+            clock = environment.clock
+        self.clock = clock
+        self.yield_every = max(1, yield_every)
+
+        self.events = 0
+        self.max_lateness = 0.0
+        self.first_timestamp: Optional[datetime] = None
+        self.last_timestamp: Optional[datetime] = None
+        self._offset = 0.0
+        self._previous = 0.0
+
+    def _delay(self, event: DisasterEvent, elapsed: float) -> float:
+        """Seconds to wait before injecting event, `elapsed` seconds into the replay."""
+        if self.first_timestamp is None:
+            self.first_timestamp = event.timestamp
+        if self.speed is None:
+            return 0.0
+        recorded = (event.timestamp - self.first_timestamp).total_seconds() - self._offset
+        if self.max_gap is not None and recorded - self._previous > self.max_gap:
+            self._offset += recorded - self._previous - self.max_gap
+            recorded = self._previous + self.max_gap
+        self._previous = max(self._previous, recorded)
+        delay = recorded / self.speed - elapsed
+        if delay < 0:
+            self.max_lateness = max(self.max_lateness, -delay)
+        return delay
+
+    def _inject(self, event: DisasterEvent) -> None:
+        if self.clock is not None:
+            self.clock.current = event.timestamp
+        self.environment.ingest_event(event)
+        self.events += 1
+        self.last_timestamp = event.timestamp
+        if self.on_event is not None:
+            self.on_event(event)
+
+    async def replay(self, source: EventSource) -> Dict:
+        """
+        Replay events on the running event loop.
+
+        Args:
+            source: Log file path, or an iterable of DisasterEvents or
+                logged event dictionaries
+
+        Returns:
+            Replay statistics, see stats()
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for event in _as_events(source):
+            delay = self._delay(event, loop.time() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif self.speed is None and self.events % self.yield_every == 0:
+                await asyncio.sleep(0)
+            self._inject(event)
+        return self.stats(loop.time() - start)
+
+    def replay_sync(self, source: EventSource) -> Dict:
+        """
+        Replay events in the calling thread, sleeping with time.sleep().
+
+        Args:
+            source: Log file path, or an iterable of DisasterEvents or
+                logged event dictionaries
+
+        Returns:
+            Replay statistics, see stats()
+        """
+        start = time.monotonic()
+        for event in _as_events(source):
+            delay = self._delay(event, time.monotonic() - start)
+            if delay > 0:
+                time.sleep(delay)
+            self._inject(event)
+        return self.stats(time.monotonic() - start)
+
+    def stats(self, elapsed: float) -> Dict:
+        """
+        Summarise a replay.
+
+        Args:
+            elapsed: Seconds the replay took
+
+        Returns:
+            Dictionary with the number of events, the recorded and replay
+            durations, the injection rate and the worst lateness
+        """
+        recorded = 0.0
+        if self.first_timestamp is not None:
+            recorded = (self.last_timestamp - self.first_timestamp).total_seconds()
+        return {
+            "events": self.events,
+            "recorded_seconds": recorded,
+            "elapsed_seconds": elapsed,
+            "events_per_second": self.events / elapsed if elapsed > 0 else float("inf"),
+            "max_lateness": self.max_lateness
+        }
+
+
+def replay_log(path: Union[str, os.PathLike], environment: Optional[DisasterEnvironment] = None,
+               speed: Optional[float] = None, **kwargs) -> Dict:
+    """
+    Replay a log file into an environment in the calling thread.
+
+    Args:
+        path: JSON array or JSON-lines event log, or a segmented log directory
+        environment: Environment to replay into (default: a new columnar
+            environment on a ReplayClock)
+        speed: Replay speed relative to the recording (default: as fast as
+            possible)
+        **kwargs: Further EventReplayer arguments
+
+    Returns:
+        Replay statistics, plus the environment and its summary
+    """
+    if environment is None:
+        environment = DisasterEnvironment(columnar=True, clock=ReplayClock())
+    replayer = EventReplayer(environment, speed, **kwargs)
+    stats = replayer.replay_sync(path)
+    logger.info(f"Replayed {stats['events']} events from {path} "
+                f"in {stats['elapsed_seconds']:.2f}s")
+    stats["environment"] = environment
+    stats["summary"] = environment.get_event_summary()
+    return stats
@@ -0,0 +1,271 @@
+"""
+LAB 2: Cycle Scheduler
+
+This module provides CycleScheduler, a shared timer for periodic agent
+behaviours. Instead of each behaviour sleeping for its period after doing
+its work, which drifts by the duration of the work every cycle, every
+behaviour registers a Ticker and awaits its ticks. Tick deadlines are
+fixed multiples of the period from the registration time, so the work
+done in a cycle does not shift later cycles.
+
+All pending deadlines live in one heap served by a single event-loop
+timer, however many behaviours are registered. Ticks can be jittered to
+spread the load of behaviours that share a period, periods can be
+changed at any time (adaptive cadence), and ticks that fire late or are
+skipped because a cycle overran its period are counted as missed
+deadlines.
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+import weakref
+from typing import Dict, List, Optional
+
+try:
+    from .metrics import MetricsRegistry
+except ImportError:
+    from metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class Ticker:
+    """
+    One behaviour's schedule within a CycleScheduler.
+
+    Created by CycleScheduler.register(); await wait() once per cycle.
+    """
+
+    def __init__(self, scheduler: "CycleScheduler", period: float, jitter: float, start: float):
+        self.scheduler = scheduler
+        self.period = period
+        self.jitter = jitter
+        self.nominal = start
+        self.first = True
+        self.cancelled = False
+        self.ticks = 0
+        self.missed = 0
+        self.max_lateness = 0.0
+        self._future: Optional[asyncio.Future] = None
+
+    def set_period(self, period: float) -> None:
+        """
+        Change the period from the next tick on.
+
+        The next deadline is the last nominal deadline plus the new period,
+        so switching cadence does not introduce drift either.
+        """
+        if period < 0:
+            raise ValueError("period must not be negative")
+        self.period = period
+
+    async def wait(self) -> float:
+        """
+        Wait for the next tick.
+
+        If the previous cycle overran one or more deadlines, the tick fires
+        immediately, the skipped deadlines are counted as missed and the
+        schedule continues from the latest passed deadline.
+
+        Returns:
+            Lateness of the tick in seconds (time past its deadline)
+        """
+        if self.cancelled:
+            raise RuntimeError("Ticker has been cancelled")
+        scheduler = self.scheduler
+        if self.first:
+            self.first = False
+        else:
+            self.nominal += self.period
+            now = scheduler.loop.time()
+            if self.period > 0 and now - self.nominal > self.period:
+                skipped = int((now - self.nominal) // self.period)
+                self.nominal += skipped * self.period
+                self.missed += skipped
+                scheduler._record_missed(skipped)
+
+        deadline = self.nominal
+        if self.jitter:
+            deadline += scheduler.rng.uniform(0.0, self.jitter * self.period)
+
+        self._future = scheduler.loop.create_future()
+        scheduler._push(deadline, self)
+        try:
+            lateness = await self._future
+        finally:
+            self._future = None
+
+        self.ticks += 1
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+        if lateness > scheduler.tolerance:
+            self.missed += 1
+            scheduler._record_missed(1)
+        return lateness
+
+    def cancel(self) -> None:
+        """Remove the ticker from the scheduler, cancelling a pending wait()."""
+        self.cancelled = True
+        if self._future is not None and not self._future.done():
+            self._future.cancel()
+        self.scheduler._unregister(self)
+
+    def stats(self) -> Dict:
+        return {
+            "period": self.period,
+            "ticks": self.ticks,
+            "missed_deadlines": self.missed,
+            "max_lateness_ms": round(self.max_lateness * 1000, 3)
+        }
+
+
+class CycleScheduler:
+    """
+    Heap-based scheduler firing the ticks of many periodic behaviours.
+
+    A scheduler belongs to one event loop; get_scheduler() returns the
+    shared scheduler of the running loop.
+    """
+
+    def __init__(self, tolerance: float = 0.05, seed: Optional[int] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            tolerance: Seconds a tick may fire after its deadline before it
+                counts as missed
+            seed: Seed for the jitter random number generator
+            metrics: Registry to record tick lateness and missed deadlines into
+        """
+        self.tolerance = tolerance
+        self.rng = random.Random(seed)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.tickers: "weakref.WeakSet[Ticker]" = weakref.WeakSet()
+        self.ticks = 0
+        self.missed = 0
+        self.max_lateness = 0.0
+        self._heap: List = []
+        self._sequence = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_when: Optional[float] = None
+        self._lateness = None
+        self._missed_counter = None
+        if metrics is not None:
+            self._lateness = metrics.histogram(
+                "scheduler_tick_lateness_seconds",
+                "How long after its deadline a scheduled tick fired"
+            )
+            self._missed_counter = metrics.counter(
+                "scheduler_missed_deadlines",
+                "Ticks that fired late or were skipped because a cycle overran"
+            )
+
+    def register(self, period: float, jitter: float = 0.0) -> Ticker:
+        """
+        Register a periodic behaviour.
+
+        Must be called from a coroutine running on the scheduler's loop.
+        The first tick is due immediately (plus jitter).
+
+        Args:
+            period: Seconds between ticks
+            jitter: Random delay added to each tick, as a fraction of the
+                period (0.1 = up to 10%); never accumulates into drift
+
+        Returns:
+            The behaviour's Ticker
+        """
+        if period < 0:
+            raise ValueError("period must not be negative")
+        if not 0.0 <= jitter <= 1.0:
+            raise ValueError("jitter must be between 0 and 1")
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+        ticker = Ticker(self, period, jitter, self.loop.time())
+        self.tickers.add(ticker)
+        return ticker
+
+    def _unregister(self, ticker: Ticker) -> None:
+        self.tickers.discard(ticker)
+
+    def _push(self, deadline: float, ticker: Ticker) -> None:
+        self._sequence += 1
+        heapq.heappush(self._heap, (deadline, self._sequence, ticker))
+        if self._timer_when is None or deadline < self._timer_when:
+            self._arm(deadline)
+
+    def _arm(self, deadline: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self.loop.call_at(deadline, self._fire)
+        self._timer_when = deadline
+
+    def _fire(self) -> None:
+        self._timer = None
+        self._timer_when = None
+        heap = self._heap
+        now = self.loop.time()
+        while heap and heap[0][0] <= now:
+            deadline, _, ticker = heapq.heappop(heap)
+            future = ticker._future
+            if future is None or future.done():
+                continue
+            lateness = now - deadline
+            future.set_result(lateness)
+            self.ticks += 1
+            if lateness > self.max_lateness:
+                self.max_lateness = lateness
+            if self._lateness is not None:
+                self._lateness.observe(lateness)
+        if heap:
+            self._arm(heap[0][0])
+
+    def _record_missed(self, count: int) -> None:
+        self.missed += count
+        if self._missed_counter is not None:
+            self._missed_counter.inc(count)
+        logger.debug(f"Scheduler missed {count} deadline(s), {self.missed} in total")
+
+    def stats(self) -> Dict:
+        """
+        Return scheduler-wide tick statistics.
+
+        Returns:
+            Dictionary with registered behaviours, ticks fired, missed
+            deadlines and the worst lateness seen
+        """
+        return {
+            "behaviours": len(self.tickers),
+            "ticks": self.ticks,
+            "missed_deadlines": self.missed,
+            "max_lateness_ms": round(self.max_lateness * 1000, 3)
+        }
+
+
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, CycleScheduler]" = \
+    weakref.WeakKeyDictionary()
+
+
+def get_scheduler() -> CycleScheduler:
+    """Get the shared scheduler of the running event loop, creating it if needed."""
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = CycleScheduler()
+        scheduler.loop = loop
+        _schedulers[loop] = scheduler
+    return scheduler
+
+
+def set_scheduler(scheduler: CycleScheduler) -> None:
+    """
+    Make a scheduler the shared scheduler of the running event loop.
+
+    Must be called before any behaviour on the loop calls get_scheduler().
+    """
+    loop = asyncio.get_running_loop()
+    scheduler.loop = loop
+    _schedulers[loop] = scheduler
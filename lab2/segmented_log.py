@@ -0,0 +1,513 @@
+"""
+LAB 2: Segmented Event Log
+
+This module stores an event log as a directory of segments instead of a
+single file:
+
+- SegmentedLogWriter appends JSON lines to an active segment and rolls to
+  a new one when the segment reaches a size limit or spans a time limit.
+  Closed segments are gzip-compressed on a background thread, so rolling
+  does not stall the caller. It has the write/flush/close
+  interface of JsonlLogWriter, so EventLogger and BackgroundLogWriter can
+  use it in place of a single file.
+- manifest.json records, for every closed segment, its first and last
+  event timestamp, its event count and its counts per severity, disaster
+  type and location.
+- SegmentedLog reads the directory back. Time-range reads only open the
+  segments whose timestamps overlap the range, and reports take the counts
+  of fully covered segments from the manifest without opening them.
+
+Timestamps are compared as ISO 8601 strings, which order like the naive
+datetimes the environment produces.
+"""
+
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Union
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+Timestamp = Union[datetime, str, None]
+
+
+def _iso(value: Timestamp) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _segment_name(number: int) -> str:
+    return f"segment-{number:06d}.jsonl"
+
+
+def _open_segment(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+class _SegmentStats:
+    """Timestamp range and category counts of one segment, built as records are written."""
+
+    def __init__(self):
+        self.events = 0
+        self.min_timestamp: Optional[str] = None
+        self.max_timestamp: Optional[str] = None
+        self.severity_counts: Dict[str, int] = {}
+        self.disaster_counts: Dict[str, int] = {}
+        self.location_counts: Dict[str, int] = {}
+
+    def add(self, record: Dict) -> None:
+        self.events += 1
+        timestamp = record.get("timestamp")
+        if timestamp is not None:
+            if self.min_timestamp is None or timestamp < self.min_timestamp:
+                self.min_timestamp = timestamp
+            if self.max_timestamp is None or timestamp > self.max_timestamp:
+                self.max_timestamp = timestamp
+        for field, counts in (("severity_level", self.severity_counts),
+                              ("disaster_type", self.disaster_counts),
+                              ("location", self.location_counts)):
+            value = record.get(field)
+            if value is not None:
+                value = str(value)
+                counts[value] = counts.get(value, 0) + 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "events": self.events,
+            "min_timestamp": self.min_timestamp,
+            "max_timestamp": self.max_timestamp,
+            "severity_counts": self.severity_counts,
+            "disaster_counts": self.disaster_counts,
+            "location_counts": self.location_counts
+        }
+
+
+def _read_manifest(directory: str) -> Dict:
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"version": MANIFEST_VERSION, "next_segment": 1, "active": None, "segments": []}
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version in {path}: {manifest.get('version')}")
+    return manifest
+
+
+class SegmentedLogWriter:
+    """
+    Appends log records to rolling, compressed segments in a directory.
+
+    A segment is closed when writing a record would take it past
+    max_segment_bytes, or when a record's timestamp is max_segment_seconds
+    or more after the segment's first record. Closing registers the
+    segment in the manifest, which is rewritten atomically, and queues it
+    for a compression thread that replaces it by its .gz file and updates
+    the manifest entry; close() waits for queued compressions. An active
+    segment left behind by a process that did not close its writer is
+    closed when the directory is opened again, and segments whose
+    compression was interrupted are compressed then.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: Optional[int] = 64 * 1024 * 1024,
+                 max_segment_seconds: Optional[float] = 3600.0, compress: bool = True,
+                 compresslevel: int = 6, flush_records: Optional[int] = 100,
+                 flush_bytes: Optional[int] = 64 * 1024,
+                 flush_interval: Optional[float] = 5.0,
+                 buffer_size: int = 64 * 1024):
+        """
+        Open the log directory for appending, creating it if needed.
+
+        Args:
+            directory: Directory holding the segments and the manifest
+            max_segment_bytes: Roll when a segment would exceed this many
+                uncompressed bytes (None to disable)
+            max_segment_seconds: Roll when a record is this many seconds
+                newer than the segment's first record (None to disable)
+            compress: Gzip segments in the background when they are closed
+            compresslevel: Gzip compression level, 1 (fastest) to 9
+            flush_records: Flush after this many buffered records (None to disable)
+            flush_bytes: Flush after this many buffered bytes (None to disable)
+            flush_interval: Flush when a write happens this many seconds after
+                the previous flush (None to disable)
+            buffer_size: Size of the underlying file buffer in bytes
+        """
+        self.path = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_seconds = max_segment_seconds
+        self.compress = compress
+        self.compresslevel = compresslevel
+        self.flush_records = flush_records
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.records_written = 0
+
+        # Guards the manifest, which the compression thread also updates
+        self._lock = threading.Lock()
+        self._compress_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._compressor: Optional[threading.Thread] = None
+        self._compress_error: Optional[BaseException] = None
+
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = _read_manifest(directory)
+        if compress:
+            for segment in self.manifest["segments"]:
+                if not segment["name"].endswith(".gz"):
+                    self._compress_later(segment["name"])
+        if self.manifest["active"] is not None:
+            self._recover(self.manifest["active"])
+
+        self._file = None
+        self._stats: Optional[_SegmentStats] = None
+        self._segment_bytes = 0
+        self._roll_at: Optional[str] = None
+        self._pending_records = 0
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, record: Dict) -> None:
+        """
+        Append one record, rolling the segment and flushing as configured.
+
+        Args:
+            record: JSON-serialisable dictionary
+        """
+        if self._closed:
+            raise ValueError("write to closed SegmentedLogWriter")
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        timestamp = record.get("timestamp")
+
+        if self._file is not None and (
+                (self.max_segment_bytes is not None
+                 and self._segment_bytes + len(line) > self.max_segment_bytes)
+                or (self._roll_at is not None and timestamp is not None
+                    and timestamp >= self._roll_at)):
+            self._close_segment()
+        if self._file is None:
+            self._open_segment(timestamp)
+
+        self._file.write(line)
+        self._stats.add(record)
+        self._segment_bytes += len(line)
+        self.records_written += 1
+        self._pending_records += 1
+        self._pending_bytes += len(line)
+
+        if ((self.flush_records is not None and self._pending_records >= self.flush_records)
+                or (self.flush_bytes is not None and self._pending_bytes >= self.flush_bytes)
+                or (self.flush_interval is not None
+                    and time.monotonic() - self._last_flush >= self.flush_interval)):
+            self.flush()
+
+    def _open_segment(self, first_timestamp: Optional[str]) -> None:
+        with self._lock:
+            name = _segment_name(self.manifest["next_segment"])
+            self.manifest["next_segment"] += 1
+            self.manifest["active"] = name
+            self._write_manifest()
+        self._file = open(os.path.join(self.path, name), 'a', encoding='utf-8',
+                          buffering=self.buffer_size)
+        self._stats = _SegmentStats()
+        self._segment_bytes = 0
+        self._roll_at = None
+        if self.max_segment_seconds is not None and first_timestamp is not None:
+            first = datetime.fromisoformat(first_timestamp)
+            self._roll_at = (first + timedelta(seconds=self.max_segment_seconds)).isoformat()
+
+    def _close_segment(self) -> None:
+        """Close and register the active segment and queue it for compression."""
+        name = self.manifest["active"]
+        self._file.close()
+        self._file = None
+        self._finish_segment(name, self._stats, self._segment_bytes)
+
+    def _finish_segment(self, name: str, stats: _SegmentStats, size: int) -> None:
+        entry = {"name": name, "bytes": size}
+        entry.update(stats.to_dict())
+        with self._lock:
+            self.manifest["segments"].append(entry)
+            self.manifest["active"] = None
+            self._write_manifest()
+        if self.compress:
+            self._compress_later(name)
+
+    def _compress_later(self, name: str) -> None:
+        """Queue a registered segment for the compression thread, starting it if needed."""
+        if self._compressor is None:
+            self._compressor = threading.Thread(target=self._run_compressor,
+                                                name="SegmentCompressor", daemon=True)
+            self._compressor.start()
+        self._compress_queue.put(name)
+
+    def _run_compressor(self) -> None:
+        """Compression thread: compress queued segments until sent None."""
+        while True:
+            name = self._compress_queue.get()
+            if name is None:
+                return
+            if self._compress_error is not None:
+                # Leave later segments uncompressed; they stay readable
+                continue
+            try:
+                self._compress_segment(name)
+            except BaseException as error:
+                self._compress_error = error
+
+    def _compress_segment(self, name: str) -> None:
+        """Gzip a closed segment, point its manifest entry at the result and remove it."""
+        path = os.path.join(self.path, name)
+        # The .gz file may already be complete if an earlier writer stopped
+        # before updating the manifest
+        if os.path.exists(path) or not os.path.exists(path + ".gz"):
+            temporary = path + ".gz.tmp"
+            with open(path, 'rb') as source, \
+                    gzip.open(temporary, 'wb', compresslevel=self.compresslevel) as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+            os.replace(temporary, path + ".gz")
+        with self._lock:
+            for segment in self.manifest["segments"]:
+                if segment["name"] == name:
+                    segment["name"] = name + ".gz"
+            self._write_manifest()
+        # Readers holding the old manifest fall back to the .gz file
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _recover(self, name: str) -> None:
+        """Register an active segment left open by an earlier writer."""
+        path = os.path.join(self.path, name)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            if os.path.exists(path):
+                os.remove(path)
+            with self._lock:
+                self.manifest["active"] = None
+                self._write_manifest()
+            return
+        stats = _SegmentStats()
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        stats.add(json.loads(line))
+                    except ValueError:
+                        # A record cut off by a crash; the rest is intact
+                        break
+        self._finish_segment(name, stats, os.path.getsize(path))
+
+    def _write_manifest(self) -> None:
+        """Atomically replace the manifest file; callers hold the lock."""
+        path = os.path.join(self.path, MANIFEST_NAME)
+        temporary = path + ".tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temporary, path)
+
+    def flush(self, fsync: bool = False) -> None:
+        """
+        Push buffered records of the active segment to the operating system.
+
+        Args:
+            fsync: Also ask the operating system to commit the file to disk
+        """
+        if self._file is not None:
+            self._file.flush()
+            if fsync:
+                os.fsync(self._file.fileno())
+        self._pending_records = 0
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+
+    def roll(self) -> None:
+        """Close the active segment now, e.g. at the end of a run."""
+        if self._file is not None:
+            self._close_segment()
+
+    def close(self) -> None:
+        """
+        Close and register the active segment and wait for queued compressions.
+
+        Raises:
+            RuntimeError: If compressing a segment failed; the segments it
+                did not compress remain readable uncompressed
+        """
+        if not self._closed:
+            self.roll()
+            self._closed = True
+            if self._compressor is not None:
+                self._compress_queue.put(None)
+                self._compressor.join()
+                self._compressor = None
+            if self._compress_error is not None:
+                raise RuntimeError("Segment compression failed") from self._compress_error
+
+
+class SegmentedLog:
+    """
+    Read access to a directory written by SegmentedLogWriter.
+
+    The manifest is read once, when the log is opened; call reload() to
+    see segments closed since then. The active segment, which the manifest
+    has no statistics for yet, is always scanned.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Open a segmented log.
+
+        Args:
+            directory: Directory holding the segments and the manifest
+        """
+        self.path = directory
+        self.reload()
+
+    def reload(self) -> None:
+        """Re-read the manifest."""
+        self.manifest = _read_manifest(self.path)
+
+    @property
+    def segments(self) -> List[Dict]:
+        """Manifest entries of the closed segments, oldest first."""
+        return self.manifest["segments"]
+
+    def _select(self, since: Optional[str], until: Optional[str]) -> List[Dict]:
+        """Closed segments that may hold records in [since, until]."""
+        selected = []
+        for segment in self.segments:
+            if segment["events"] == 0:
+                continue
+            if segment["min_timestamp"] is not None:
+                if since is not None and segment["max_timestamp"] < since:
+                    continue
+                if until is not None and segment["min_timestamp"] > until:
+                    continue
+            selected.append(segment)
+        return selected
+
+    def _scan(self, name: str, since: Optional[str], until: Optional[str]) -> Iterator[Dict]:
+        """Stream the records of one segment file that fall in [since, until]."""
+        path = os.path.join(self.path, name)
+        if not os.path.exists(path):
+            # Compressed since the manifest was read
+            path += ".gz"
+            if not os.path.exists(path):
+                return
+        with _open_segment(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Partially written last line of the active segment
+                    break
+                timestamp = record.get("timestamp")
+                if timestamp is not None and (
+                        (since is not None and timestamp < since)
+                        or (until is not None and timestamp > until)):
+                    continue
+                yield record
+
+    def read(self, since: Timestamp = None, until: Timestamp = None) -> Iterator[Dict]:
+        """
+        Stream the records with timestamps in [since, until].
+
+        Records without a timestamp are always included.
+
+        Args:
+            since: Earliest timestamp to include (default: no lower bound)
+            until: Latest timestamp to include (default: no upper bound)
+
+        Yields:
+            Logged event dictionaries in write order
+        """
+        since, until = _iso(since), _iso(until)
+        for segment in self._select(since, until):
+            yield from self._scan(segment["name"], since, until)
+        if self.manifest["active"] is not None:
+            yield from self._scan(self.manifest["active"], since, until)
+
+    def report(self, since: Timestamp = None, until: Timestamp = None) -> Dict:
+        """
+        Build an EventLogger-style report for [since, until].
+
+        Segments entirely inside the range contribute the counts stored in
+        the manifest; only segments straddling a bound and the active
+        segment are read.
+
+        Args:
+            since: Earliest timestamp to include (default: no lower bound)
+            until: Latest timestamp to include (default: no upper bound)
+
+        Returns:
+            Report in the layout of EventLogger.generate_report(), plus
+            location_distribution and the number of segments read and skipped
+        """
+        since, until = _iso(since), _iso(until)
+        severity_counts: Dict[int, int] = {}
+        disaster_counts: Dict[str, int] = {}
+        location_counts: Dict[str, int] = {}
+        total_events = 0
+        scanned = 0
+        selected = self._select(since, until)
+
+        def count(severity, disaster, location, amount=1):
+            if severity is not None:
+                severity = int(severity)
+                severity_counts[severity] = severity_counts.get(severity, 0) + amount
+            if disaster is not None:
+                disaster_counts[disaster] = disaster_counts.get(disaster, 0) + amount
+            if location is not None:
+                location_counts[location] = location_counts.get(location, 0) + amount
+
+        to_scan = []
+        for segment in selected:
+            if (segment["min_timestamp"] is not None
+                    and (since is None or segment["min_timestamp"] >= since)
+                    and (until is None or segment["max_timestamp"] <= until)):
+                total_events += segment["events"]
+                for severity, amount in segment["severity_counts"].items():
+                    count(severity, None, None, amount)
+                for disaster, amount in segment["disaster_counts"].items():
+                    count(None, disaster, None, amount)
+                for location, amount in segment["location_counts"].items():
+                    count(None, None, location, amount)
+            else:
+                to_scan.append(segment["name"])
+        if self.manifest["active"] is not None:
+            to_scan.append(self.manifest["active"])
+
+        for name in to_scan:
+            scanned += 1
+            for record in self._scan(name, since, until):
+                total_events += 1
+                count(record.get("severity_level"), record.get("disaster_type"),
+                      record.get("location"))
+
+        if not total_events:
+            return {"error": "No events logged"}
+
+        segment_count = len(self.segments) + (self.manifest["active"] is not None)
+        return {
+            "total_events": total_events,
+            "severity_distribution": severity_counts,
+            "disaster_distribution": disaster_counts,
+            "location_distribution": location_counts,
+            "log_file": self.path,
+            "segments_read": scanned,
+            "segments_skipped": segment_count - scanned,
+            "report_generated": datetime.now().isoformat()
+        }
@@ -8,17 +8,51 @@ perceives events, and logs observations.
 
 import asyncio
 import logging
+import sys
+import time
 from datetime import datetime
+from typing import Optional, Sequence
 from spade.agent import Agent
 from spade.behaviour import CyclicBehaviour, OneShotBehaviour
 from .disaster_environment import DisasterEnvironment, get_environment
+from .messaging import EventPublisherBehaviour, SubscriptionBehaviour, subscription_template
+from .metrics import MetricsRegistry, start_http_server
+from .scheduler import CycleScheduler, Ticker, get_scheduler
+from .structured_logging import StructuredMessage, configure_logging
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - SensorAgent - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+LOG_FORMATS = ("text", "structured")
+
+
+class SensorEventMessage(StructuredMessage):
+    """One-record summary of a sensor cycle for structured logging."""
+    
+    name = "sensor_event"
+    
+    def __init__(self, event, summary: dict, current: dict):
+        self.event = event
+        self.summary = summary
+        self.current = current
+    
+    def fields(self) -> dict:
+        event, summary, current = self.event, self.summary, self.current
+        return {
+            "event_id": event.event_id,
+            "type": event.disaster_type.value,
+            "location": event.location,
+            "severity": event.severity_level.value,
+            "damage": event.damage_assessment,
+            "population": event.affected_population,
+            "timestamp": event.timestamp.isoformat(),
+            "total_events": summary['total_events'],
+            "average_severity": summary['average_severity'],
+            "critical_events": summary['critical_events'],
+            "status": summary['environmental_status'],
+            "last_minute_events": current['total_events'],
+            "last_minute_status": current['environmental_status']
+        }
+
 
 class EnvironmentMonitorBehaviour(CyclicBehaviour):
     """
@@ -28,38 +62,173 @@ class EnvironmentMonitorBehaviour(CyclicBehaviour):
     - Periodically checks for new events
     - Logs environmental conditions
     - Maintains sensor observations
+    
+    When given a MetricsRegistry it also records the latency of each cycle
+    phase (generate, summarize, log, sleep), event-loop lag and event
+    counts. Without one, no timing is done at all.
+    
+    Each cycle is logged either as the human-readable report ("text") or
+    as a single SensorEventMessage record ("structured"). Neither builds
+    any strings when INFO is disabled for the logger.
+    
+    Cycles are paced by a CycleScheduler ticker, so they start every
+    `period` seconds regardless of how long the cycle itself takes. With
+    `unstable_period` set, the behaviour switches to that period while the
+    last minute's environmental status is "Unstable".
+    
+    With a publisher, every perceived event is also handed to it, to be
+    sent to subscribed agents in batches.
     """
     
+    def __init__(self, environment: Optional[DisasterEnvironment] = None, period: float = 2.0,
+                 metrics: Optional[MetricsRegistry] = None, log_format: str = "text",
+                 scheduler: Optional[CycleScheduler] = None,
+                 unstable_period: Optional[float] = None, jitter: float = 0.0,
+                 publisher: Optional[EventPublisherBehaviour] = None):
+        """
+        Initialize the monitoring behaviour.
+        
+        Args:
+            environment: Environment to monitor (default: the global environment)
+            period: Seconds between the starts of sensor cycles
+            metrics: Registry to record cycle metrics into (default: no metrics)
+            log_format: "text" for the readable report, "structured" for one record per cycle
+            scheduler: Scheduler to pace cycles with (default: the event loop's shared one)
+            unstable_period: Period to use while conditions are "Unstable" (default: period)
+            jitter: Random delay added to each cycle, as a fraction of the period
+            publisher: Publisher to hand perceived events to (default: none)
+        """
+        super().__init__()
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"log_format must be one of {LOG_FORMATS}, got {log_format!r}")
+        self.environment = environment
+        self.period = period
+        self.metrics = metrics
+        self.log_format = log_format
+        self.scheduler = scheduler
+        self.unstable_period = unstable_period
+        self.jitter = jitter
+        self.publisher = publisher
+        self.ticker: Optional[Ticker] = None
+        self.current_status: Optional[str] = None
+        if metrics is not None:
+            phases = metrics.histogram(
+                "sensor_cycle_phase_seconds",
+                "Time spent in each phase of a sensor cycle",
+                ["phase"]
+            )
+            self._generate_latency = phases.labels("generate")
+            self._summarize_latency = phases.labels("summarize")
+            self._log_latency = phases.labels("log")
+            self._sleep_latency = phases.labels("sleep")
+            self._loop_lag = metrics.histogram(
+                "sensor_event_loop_lag_seconds",
+                "How much later than its deadline a sensor cycle started"
+            )
+            self._cycles = metrics.counter("sensor_cycles", "Sensor cycles completed")
+            self._events = metrics.counter("sensor_events", "Disaster events perceived")
+    
     async def run(self):
         """Execute the monitoring cycle."""
-        environment = get_environment()
+        if self.ticker is None:
+            self.ticker = (self.scheduler or get_scheduler()).register(self.period, self.jitter)
+        
+        # Wait for the next scheduled sensor cycle
+        if self.metrics is None:
+            await self.ticker.wait()
+        else:
+            started = time.perf_counter()
+            lateness = await self.ticker.wait()
+            self._sleep_latency.observe(time.perf_counter() - started)
+            self._loop_lag.observe(lateness)
+        
+        await self.run_cycle()
+        
+        # Adapt the cadence to current conditions
+        if self.unstable_period is not None:
+            unstable = self.current_status == "Unstable"
+            self.ticker.set_period(self.unstable_period if unstable else self.period)
+    
+    async def on_end(self):
+        """Release the scheduler ticker when the behaviour ends."""
+        if self.ticker is not None:
+            self.ticker.cancel()
+            self.ticker = None
+    
+    async def run_cycle(self):
+        """
+        Perceive and report one event without waiting for the next cycle.
+        
+        Does not need a running agent, so cycles can be driven directly,
+        e.g. by benchmarks, without an XMPP connection.
+        """
+        environment = self.environment or get_environment()
         
-        # Generate a new disaster event
+        if self.metrics is None:
+            event = environment.generate_event()
+            if self.publisher is not None:
+                self.publisher.publish(event)
+            summary = environment.get_event_summary()
+            current = environment.get_window_summary()["1m"]
+            self.current_status = current['environmental_status']
+            self._report(event, summary, current)
+            return
+        
+        clock = time.perf_counter
+        t0 = clock()
         event = environment.generate_event()
+        if self.publisher is not None:
+            self.publisher.publish(event)
+        t1 = clock()
+        summary = environment.get_event_summary()
+        current = environment.get_window_summary()["1m"]
+        self.current_status = current['environmental_status']
+        t2 = clock()
+        self._report(event, summary, current)
+        t3 = clock()
+        
+        self._generate_latency.observe(t1 - t0)
+        self._summarize_latency.observe(t2 - t1)
+        self._log_latency.observe(t3 - t2)
+        self._cycles.inc()
+        self._events.inc()
+    
+    def _report(self, event, summary: dict, current: dict) -> None:
+        """Log a perceived event and the environmental status."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        if self.log_format == "structured":
+            logger.info(SensorEventMessage(event, summary, current))
+            return
+        
+        # Lines of the report share one rate-limit decision
+        report = {"report": event}
         
         # Log the perceived event
-        logger.info("=" * 70)
-        logger.info(f"SENSOR PERCEPTION - Event Detected: {event.event_id}")
-        logger.info("=" * 70)
-        logger.info(f"  Disaster Type      : {event.disaster_type.value.upper()}")
-        logger.info(f"  Location           : {event.location}")
-        logger.info(f"  Severity Level     : {event.severity_level.value}/5")
-        logger.info(f"  Damage Assessment  : {event.damage_assessment}%")
-        logger.info(f"  Affected Population: {event.affected_population} people")
-        logger.info(f"  Timestamp          : {event.timestamp.isoformat()}")
-        logger.info("=" * 70)
+        logger.info("=" * 70, extra=report)
+        logger.info(f"SENSOR PERCEPTION - Event Detected: {event.event_id}", extra=report)
+        logger.info("=" * 70, extra=report)
+        logger.info(f"  Disaster Type      : {event.disaster_type.value.upper()}", extra=report)
+        logger.info(f"  Location           : {event.location}", extra=report)
+        logger.info(f"  Severity Level     : {event.severity_level.value}/5", extra=report)
+        logger.info(f"  Damage Assessment  : {event.damage_assessment}%", extra=report)
+        logger.info(f"  Affected Population: {event.affected_population} people", extra=report)
+        logger.info(f"  Timestamp          : {event.timestamp.isoformat()}", extra=report)
+        logger.info("=" * 70, extra=report)
         
         # Log environmental summary
-        summary = environment.get_event_summary()
-        logger.info("ENVIRONMENTAL STATUS UPDATE:")
-        logger.info(f"  Total Events Detected    : {summary['total_events']}")
-        logger.info(f"  Average Severity Level   : {summary['average_severity']}/5")
-        logger.info(f"  Total Affected Population: {summary['total_affected_population']} people")
-        logger.info(f"  Critical Events          : {summary['critical_events']}")
-        logger.info(f"  Environment Status       : {summary['environmental_status']}")
+        logger.info("ENVIRONMENTAL STATUS UPDATE:", extra=report)
+        logger.info(f"  Total Events Detected    : {summary['total_events']}", extra=report)
+        logger.info(f"  Average Severity Level   : {summary['average_severity']}/5", extra=report)
+        logger.info(f"  Total Affected Population: {summary['total_affected_population']} people", extra=report)
+        logger.info(f"  Critical Events          : {summary['critical_events']}", extra=report)
+        logger.info(f"  Environment Status       : {summary['environmental_status']}", extra=report)
         
-        # Wait before next sensor cycle
-        await asyncio.sleep(2)
+        # Log current conditions from the rolling one-minute window
+        logger.info(f"  Last Minute              : {current['total_events']} events, "
+                    f"average severity {current['average_severity']}/5, "
+                    f"status {current['environmental_status']}", extra=report)
 
 
 class InitializationBehaviour(OneShotBehaviour):
@@ -67,16 +236,17 @@ class InitializationBehaviour(OneShotBehaviour):
     
     async def run(self):
         """Initialize the sensor agent and its monitoring capabilities."""
-        logger.info("=" * 70)
-        logger.info(f"SensorAgent {self.agent.jid} Initializing")
-        logger.info("=" * 70)
-        logger.info("Sensor Configuration:")
-        logger.info("  - Type: Environmental Disaster Monitor")
-        logger.info("  - Monitoring Interval: 2 seconds")
-        logger.info("  - Event Types: Earthquake, Flood, Wildfire, Hurricane, Landslide")
-        logger.info("  - Perception Modality: Event Detection and Assessment")
-        logger.info("  - Severity Levels: Critical (5), Severe (4), Moderate (3), Minor (2), Low (1)")
-        logger.info("=" * 70)
+        report = {"report": self}
+        logger.info("=" * 70, extra=report)
+        logger.info(f"SensorAgent {self.agent.jid} Initializing", extra=report)
+        logger.info("=" * 70, extra=report)
+        logger.info("Sensor Configuration:", extra=report)
+        logger.info("  - Type: Environmental Disaster Monitor", extra=report)
+        logger.info(f"  - Monitoring Interval: {self.agent.period:g} seconds", extra=report)
+        logger.info("  - Event Types: Earthquake, Flood, Wildfire, Hurricane, Landslide", extra=report)
+        logger.info("  - Perception Modality: Event Detection and Assessment", extra=report)
+        logger.info("  - Severity Levels: Critical (5), Severe (4), Moderate (3), Minor (2), Low (1)", extra=report)
+        logger.info("=" * 70, extra=report)
 
 
 class SensorAgent(Agent):
@@ -88,9 +258,47 @@ class SensorAgent(Agent):
     - Detects and logs disaster events
     - Assesses damage severity levels
     - Maintains environmental state information
-    - Communicates observations to other agents (in extended versions)
+    - Communicates observations to other agents
+    
+    Observations are only published when the agent is created with a
+    subscribers list (which may be empty): the agent then sends its events
+    in batches to the listed agents and to any agent that subscribes.
     """
     
+    def __init__(self, jid: str, password: str,
+                 environment: Optional[DisasterEnvironment] = None,
+                 period: float = 2.0, metrics: Optional[MetricsRegistry] = None,
+                 log_format: str = "text", unstable_period: Optional[float] = None,
+                 jitter: float = 0.0, subscribers: Optional[Sequence[str]] = None,
+                 batch_size: int = 100, batch_window: float = 1.0, **kwargs):
+        """
+        Create a sensor agent.
+        
+        Args:
+            jid: The agent's XMPP identifier
+            password: The agent's XMPP password
+            environment: Environment to monitor (default: the global environment)
+            period: Seconds between sensor cycles
+            metrics: Registry to record cycle metrics into (default: no metrics)
+            log_format: "text" or "structured" cycle logging
+            unstable_period: Seconds between sensor cycles while conditions are "Unstable"
+            jitter: Random delay added to each cycle, as a fraction of the period
+            subscribers: JIDs to publish events to; None disables publishing
+            batch_size: Most events per published message
+            batch_window: Longest time in seconds an event waits to be published
+            **kwargs: Passed on to spade.agent.Agent
+        """
+        super().__init__(jid, password, **kwargs)
+        self.environment = environment
+        self.period = period
+        self.metrics = metrics
+        self.log_format = log_format
+        self.unstable_period = unstable_period
+        self.jitter = jitter
+        self.publisher: Optional[EventPublisherBehaviour] = None
+        if subscribers is not None:
+            self.publisher = EventPublisherBehaviour(subscribers, batch_size, batch_window)
+    
     async def setup(self):
         """
         Called when the agent starts. Registers all required behaviors.
@@ -101,26 +309,59 @@ class SensorAgent(Agent):
         init_behaviour = InitializationBehaviour()
         self.add_behaviour(init_behaviour)
         
+        # Register event publication behaviors
+        if self.publisher is not None:
+            self.add_behaviour(self.publisher)
+            self.add_behaviour(SubscriptionBehaviour(self.publisher), subscription_template())
+        
         # Register continuous monitoring behavior
-        monitor_behaviour = EnvironmentMonitorBehaviour()
+        monitor_behaviour = EnvironmentMonitorBehaviour(
+            self.environment, self.period, self.metrics, self.log_format,
+            unstable_period=self.unstable_period, jitter=self.jitter,
+            publisher=self.publisher
+        )
         self.add_behaviour(monitor_behaviour)
         
         logger.info("All behaviors registered successfully")
 
 
-async def run_sensor_agent(duration: int = 30):
+async def run_sensor_agent(duration: int = 30, jid: str = "james_016@xmpp.jp",
+                           password: str = "dk1963", local: bool = False,
+                           metrics_port: Optional[int] = None, log_format: str = "text",
+                           log_rate: Optional[float] = None):
     """
     Create and run the SensorAgent for a specified duration.
     
     Args:
         duration: How long the agent should run in seconds (default: 30)
+        jid: XMPP identifier of the agent
+        password: XMPP password of the agent
+        local: Run on the in-process transport instead of an XMPP server
+        metrics_port: Serve Prometheus metrics on this port (default: no metrics)
+        log_format: "text" or "structured" cycle logging
+        log_rate: Limit INFO records to this many per second and log through
+            a background queue (structured logging always uses the queue)
     """
-    jid = "james_016@xmpp.jp"
-    password = "dk1963"
+    agent_class = SensorAgent
+    if local:
+        from .local_transport import local_agent
+        agent_class = local_agent(SensorAgent)
     
-    agent = SensorAgent(jid, password)
+    metrics = None
+    server = None
+    if metrics_port is not None:
+        metrics = MetricsRegistry()
+        server = start_http_server(metrics, metrics_port)
+        logger.info(f"Serving metrics on http://127.0.0.1:{server.server_port}/metrics")
     
+    listener = None
     try:
+        if log_format == "structured" or log_rate is not None:
+            listener = configure_logging(structured=log_format == "structured",
+                                         rate_limit=log_rate)
+        
+        agent = agent_class(jid, password, metrics=metrics, log_format=log_format)
+        
         logger.info("=" * 70)
         logger.info("LAB 2: Starting SensorAgent - Disaster Environment Monitoring")
         logger.info("=" * 70)
@@ -136,7 +377,22 @@ async def run_sensor_agent(duration: int = 30):
     except Exception as e:
         logger.error(f"Error running SensorAgent: {e}")
         raise
+    
+    finally:
+        if listener is not None:
+            listener.stop()
+        # Release the metrics port
+        if server is not None:
+            server.shutdown()
+            server.server_close()
 
 
 if __name__ == "__main__":
-    asyncio.run(run_sensor_agent())
\ No newline at end of file
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - SensorAgent - %(levelname)s - %(message)s'
+    )
+    asyncio.run(run_sensor_agent(
+        local="--local" in sys.argv,
+        log_format="structured" if "--structured" in sys.argv else "text"
+    ))
\ No newline at end of file
@@ -0,0 +1,219 @@
+"""
+LAB 2: Simulated Time
+
+This module runs the environment and its sensors against a virtual clock
+instead of the wall clock, so days or months of disaster activity can be
+simulated in seconds:
+
+- VirtualClock: simulated time, injectable into DisasterEnvironment
+- VirtualTimeEventLoop: an asyncio event loop whose time() is the virtual
+  clock. When no callback is ready it does not sleep until the next timer;
+  it jumps the clock straight to it. The loop's timer heap is therefore
+  the simulation's event queue, and asyncio.sleep(), wait_for() timeouts
+  and the CycleScheduler all run on simulated time unchanged.
+- run_simulation(): asyncio.run() on a virtual-time loop
+- simulate_monitoring(): runs sensor cycles over a simulated period
+
+Given the same seed, a simulation produces the same events, timestamps
+and summaries on every run. Work done in other threads (executors, the
+background log writer) is not synchronised with virtual time.
+"""
+
+import asyncio
+import logging
+import selectors
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Coroutine, Dict, Optional
+
+try:
+    from .disaster_environment import DisasterEnvironment
+    from .scheduler import CycleScheduler, get_scheduler, set_scheduler
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from disaster_environment import DisasterEnvironment
+    from scheduler import CycleScheduler, get_scheduler, set_scheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_START = datetime(2024, 1, 1)
+
+
+class VirtualClock:
+    """
+    Simulated clock.
+
+    Time only moves when advance() is called, which VirtualTimeEventLoop
+    does whenever every task is waiting on a timer.
+    """
+
+    def __init__(self, start: datetime = DEFAULT_START):
+        """
+        Initialize the clock.
+
+        Args:
+            start: Simulated date and time at which the clock starts
+        """
+        self.start = start
+        self.elapsed = 0.0
+
+    def time(self) -> float:
+        """Seconds of simulated time since the start."""
+        return self.elapsed
+
+    def now(self) -> datetime:
+        """Current simulated date and time; a drop-in for datetime.now()."""
+        return self.start + timedelta(seconds=self.elapsed)
+
+    def advance(self, seconds: float) -> None:
+        if seconds < 0:
+            raise ValueError("Cannot move a clock backwards")
+        self.elapsed += seconds
+
+
+class _VirtualTimeSelector:
+    """Selector that advances the virtual clock instead of blocking on timeouts."""
+
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self._selector = selectors.DefaultSelector()
+
+    def register(self, fileobj, events, data=None):
+        return self._selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj):
+        return self._selector.unregister(fileobj)
+
+    def modify(self, fileobj, events, data=None):
+        return self._selector.modify(fileobj, events, data)
+
+    def get_key(self, fileobj):
+        return self._selector.get_key(fileobj)
+
+    def get_map(self):
+        return self._selector.get_map()
+
+    def close(self) -> None:
+        self._selector.close()
+
+    def select(self, timeout: Optional[float] = None):
+        # Always poll first: other threads wake the loop through its self-pipe
+        ready = self._selector.select(0)
+        if ready or timeout == 0:
+            return ready
+        if timeout is None:
+            # Nothing scheduled at all; only I/O can make progress
+            return self._selector.select(None)
+        self.clock.advance(timeout)
+        return []
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """Event loop that runs on a VirtualClock and never sleeps on timers."""
+
+    def __init__(self, clock: Optional[VirtualClock] = None):
+        """
+        Initialize the loop.
+
+        Args:
+            clock: Clock to run on (default: a new VirtualClock)
+        """
+        self.clock = clock or VirtualClock()
+        super().__init__(selector=_VirtualTimeSelector(self.clock))
+
+    def time(self) -> float:
+        return self.clock.time()
+
+
+def run_simulation(main: Coroutine, clock: Optional[VirtualClock] = None,
+                   seed: Optional[int] = 0):
+    """
+    Run a coroutine to completion on simulated time, like asyncio.run().
+
+    The loop gets a CycleScheduler seeded with `seed`, so jittered
+    behaviours are deterministic as well.
+
+    Args:
+        main: Coroutine to run
+        clock: Clock to run on (default: a new VirtualClock)
+        seed: Seed of the loop's shared scheduler
+
+    Returns:
+        The coroutine's result
+    """
+    loop = VirtualTimeEventLoop(clock)
+
+    async def _main():
+        set_scheduler(CycleScheduler(seed=seed))
+        return await main
+
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(_main())
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+def simulate_monitoring(duration: timedelta, sensors: int = 1, period: float = 2.0,
+                        seed: Optional[int] = 0, start: datetime = DEFAULT_START,
+                        columnar: bool = True, jitter: float = 0.0,
+                        unstable_period: Optional[float] = None) -> Dict:
+    """
+    Run sensor cycles against one environment over a simulated period.
+
+    Each sensor is an EnvironmentMonitorBehaviour driven directly on a
+    virtual-time loop, without an agent or XMPP connection.
+
+    Args:
+        duration: Simulated time to cover
+        sensors: Number of sensor behaviours
+        period: Seconds between each sensor's cycles
+        seed: Seed for event generation and scheduling
+        start: Simulated start date and time
+        columnar: Use a columnar event store
+        jitter: Cycle jitter as a fraction of the period
+        unstable_period: Cycle period while conditions are "Unstable"
+
+    Returns:
+        Dictionary with the environment, its summary and the scheduler statistics
+    """
+    # Imported here so that using the clock alone does not load SPADE
+    from .sensor_agent import EnvironmentMonitorBehaviour
+
+    clock = VirtualClock(start)
+    environment = DisasterEnvironment(seed=seed, columnar=columnar, clock=clock)
+    end = duration.total_seconds()
+
+    async def sensor_loop(behaviour):
+        while True:
+            await behaviour.run()
+
+    async def main():
+        behaviours = [
+            EnvironmentMonitorBehaviour(environment, period, jitter=jitter,
+                                        unstable_period=unstable_period)
+            for _ in range(sensors)
+        ]
+        tasks = [asyncio.ensure_future(sensor_loop(behaviour)) for behaviour in behaviours]
+        await asyncio.sleep(end)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for behaviour in behaviours:
+            await behaviour.on_end()
+        return get_scheduler().stats()
+
+    scheduler_stats = run_simulation(main(), clock, seed)
+    logger.info(f"Simulated {duration} with {sensors} sensor(s): "
+                f"{environment.event_counter} events")
+    return {
+        "environment": environment,
+        "summary": environment.get_event_summary(),
+        "scheduler": scheduler_stats,
+        "simulated_until": clock.now()
+    }
@@ -0,0 +1,517 @@
+"""
+LAB 2: Spatial Model
+
+This module adds an optional notion of space to the disaster scenario:
+
+- SpatialModel: coordinates for the scenario's locations, a position and
+  radius for every event, and "events within r of a point" queries
+- GridIndex: uniform-grid spatial index over event positions; a query
+  only inspects the grid buckets around the query circle
+- HazardGrid, WildfireGrid, FloodGrid: raster hazard maps with a
+  NumPy-vectorized propagation step, fast enough for 1000x1000 cells per
+  tick
+
+Coordinates are in kilometres on a map whose origin is the south-west
+corner.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Map coordinates (km) of DisasterEnvironment.LOCATIONS on a 100 x 100 km map
+LOCATION_COORDINATES: Dict[str, Tuple[float, float]] = {
+    "Downtown District": (50.0, 50.0),
+    "Industrial Zone": (72.0, 38.0),
+    "Residential Area": (35.0, 62.0),
+    "Port District": (88.0, 55.0),
+    "University Campus": (42.0, 40.0),
+    "Hospital Area": (56.0, 63.0),
+    "Shopping District": (60.0, 47.0),
+    "Agricultural Region": (18.0, 22.0)
+}
+
+
+def _view(values: array, dtype) -> np.ndarray:
+    """Zero-copy NumPy view of an array."""
+    if not values:
+        return np.empty(0, dtype=dtype)
+    return np.frombuffer(values, dtype=dtype)
+
+
+class GridIndex:
+    """
+    Uniform-grid index of circles (event position and radius).
+
+    Circles are bucketed by the grid cell containing their centre. A query
+    for circles intersecting a disk visits only the buckets within the
+    disk's radius plus the largest indexed radius, so its cost depends on
+    local event density rather than on the total number of events.
+
+    Entries are identified by sequence number, as in EventIndex, and can
+    be evicted from the oldest end in the same way.
+    """
+
+    def __init__(self, bucket_size: float = 5.0):
+        """
+        Initialize an empty index.
+
+        Args:
+            bucket_size: Side length of the grid buckets in km
+        """
+        if bucket_size <= 0:
+            raise ValueError("bucket_size must be positive")
+        self.bucket_size = bucket_size
+        self.buckets: Dict[Tuple[int, int], array] = {}
+        self.xs = array('d')
+        self.ys = array('d')
+        self.radii = array('d')
+        self.max_radius = 0.0
+        self.base = 0
+        self._compacted_base = 0
+
+    def __len__(self) -> int:
+        """Number of indexed (not evicted) circles."""
+        return self._compacted_base + len(self.xs) - self.base
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number the next added circle will receive."""
+        return self._compacted_base + len(self.xs)
+
+    def _bucket(self, key: Tuple[int, int]) -> array:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = array('q')
+        return bucket
+
+    def add(self, x: float, y: float, radius: float) -> int:
+        """
+        Index one circle.
+
+        Returns:
+            Its sequence number
+        """
+        seq = self.next_seq
+        self.xs.append(x)
+        self.ys.append(y)
+        self.radii.append(radius)
+        if radius > self.max_radius:
+            self.max_radius = radius
+        size = self.bucket_size
+        self._bucket((int(x // size), int(y // size))).append(seq)
+        return seq
+
+    def add_batch(self, xs: np.ndarray, ys: np.ndarray, radii: np.ndarray) -> int:
+        """
+        Index a batch of circles given as equally sized NumPy arrays.
+
+        Returns:
+            Sequence number of the first circle in the batch
+        """
+        first = self.next_seq
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        radii = np.asarray(radii, dtype=np.float64)
+        if not len(xs):
+            return first
+        self.xs.frombytes(xs.tobytes())
+        self.ys.frombytes(ys.tobytes())
+        self.radii.frombytes(radii.tobytes())
+        self.max_radius = max(self.max_radius, float(radii.max()))
+
+        # Group the batch by bucket; a stable sort keeps sequence order
+        bx = np.floor_divide(xs, self.bucket_size).astype(np.int64)
+        by = np.floor_divide(ys, self.bucket_size).astype(np.int64)
+        order = np.lexsort((by, bx))
+        seqs = np.arange(first, first + len(xs), dtype=np.int64)[order]
+        bx, by = bx[order], by[order]
+        boundaries = np.flatnonzero((bx[1:] != bx[:-1]) | (by[1:] != by[:-1])) + 1
+        starts = np.concatenate(([0], boundaries)).tolist()
+        ends = np.concatenate((boundaries, [len(seqs)])).tolist()
+        for start, end in zip(starts, ends):
+            key = (int(bx[start]), int(by[start]))
+            self._bucket(key).frombytes(seqs[start:end].tobytes())
+        return first
+
+    def within(self, x: float, y: float, r: float) -> np.ndarray:
+        """
+        Find circles that intersect the disk of radius r around (x, y).
+
+        Returns:
+            Sorted int64 array of sequence numbers
+        """
+        reach = r + self.max_radius
+        size = self.bucket_size
+        x0, x1 = int((x - reach) // size), int((x + reach) // size)
+        y0, y1 = int((y - reach) // size), int((y + reach) // size)
+        found = []
+        buckets = self.buckets
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(buckets):
+            # Query covers more buckets than exist; walk the existing ones
+            for (bx, by), bucket in buckets.items():
+                if x0 <= bx <= x1 and y0 <= by <= y1:
+                    found.append(_view(bucket, np.int64))
+        else:
+            for bx in range(x0, x1 + 1):
+                for by in range(y0, y1 + 1):
+                    bucket = buckets.get((bx, by))
+                    if bucket:
+                        found.append(_view(bucket, np.int64))
+        if not found:
+            return np.empty(0, dtype=np.int64)
+
+        candidates = np.concatenate(found)
+        if self.base:
+            candidates = candidates[candidates >= self.base]
+        offsets = candidates - self._compacted_base
+        dx = _view(self.xs, np.float64)[offsets] - x
+        dy = _view(self.ys, np.float64)[offsets] - y
+        limit = r + _view(self.radii, np.float64)[offsets]
+        return np.sort(candidates[dx * dx + dy * dy <= limit * limit])
+
+    def position(self, seq: int) -> Tuple[float, float, float]:
+        """
+        Return the (x, y, radius) of an indexed circle.
+
+        Raises:
+            KeyError: If seq was evicted or never indexed
+        """
+        if not self.base <= seq < self.next_seq:
+            raise KeyError(seq)
+        offset = seq - self._compacted_base
+        return self.xs[offset], self.ys[offset], self.radii[offset]
+
+    def evict_before(self, seq: int) -> None:
+        """
+        Forget all circles with a sequence number below seq.
+
+        As in EventIndex, storage is reclaimed in amortized O(1) per evicted
+        circle: dead prefixes are only cut once they outgrow the live part.
+        max_radius is not lowered, which only widens later queries.
+        """
+        if seq <= self.base:
+            return
+        self.base = min(seq, self.next_seq)
+        dead = self.base - self._compacted_base
+        if dead <= len(self):
+            return
+
+        del self.xs[:dead]
+        del self.ys[:dead]
+        del self.radii[:dead]
+        for key in list(self.buckets):
+            bucket = self.buckets[key]
+            del bucket[:bisect_left(bucket, self.base)]
+            if not bucket:
+                del self.buckets[key]
+        self._compacted_base = self.base
+
+
+class SpatialModel:
+    """
+    Places disaster events on a map and answers spatial queries.
+
+    Each event is positioned around the coordinates of its location, with
+    a normally distributed offset, and gets an affected radius that grows
+    with its severity. Positions are kept in a GridIndex under the same
+    sequence numbers as the environment's EventIndex.
+    """
+
+    def __init__(self, width: float = 100.0, height: float = 100.0,
+                 locations: Optional[Dict[str, Tuple[float, float]]] = None,
+                 spread: float = 2.0, radius_per_severity: float = 0.5,
+                 bucket_size: float = 5.0, seed: Optional[int] = None):
+        """
+        Initialize the spatial model.
+
+        Args:
+            width: Map width in km
+            height: Map height in km
+            locations: Coordinates of each location (default: LOCATION_COORDINATES)
+            spread: Standard deviation in km of event positions around their location
+            radius_per_severity: Affected radius in km per severity level
+            bucket_size: GridIndex bucket size in km
+            seed: Seed for this model's own random generator (default: one
+                derived from the seed of the environment it is bound to)
+        """
+        self.width = width
+        self.height = height
+        self.locations = dict(LOCATION_COORDINATES if locations is None else locations)
+        self.spread = spread
+        self.radius_per_severity = radius_per_severity
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.index = GridIndex(bucket_size)
+        self._coordinates = np.empty((0, 2))
+
+    def bind(self, location_names: List[str], seed=None) -> None:
+        """
+        Resolve location codes to coordinates.
+
+        Args:
+            location_names: Location names in code order
+            seed: Seed (or SeedSequence) for the random generator, used only
+                if the model was created without a seed
+        """
+        if self.seed is None and seed is not None:
+            self.rng = np.random.default_rng(seed)
+        missing = [name for name in location_names if name not in self.locations]
+        if missing:
+            raise ValueError(f"No coordinates for locations: {missing}")
+        self._coordinates = np.array([self.locations[name] for name in location_names],
+                                     dtype=np.float64)
+
+    def place(self, location_code: int, severity: int) -> Tuple[float, float, float]:
+        """
+        Position one event and add it to the index.
+
+        Returns:
+            The event's (x, y, radius)
+        """
+        cx, cy = self._coordinates[location_code]
+        dx, dy = self.rng.normal(0.0, self.spread, 2)
+        x = min(max(cx + dx, 0.0), self.width)
+        y = min(max(cy + dy, 0.0), self.height)
+        radius = severity * self.radius_per_severity
+        self.index.add(x, y, radius)
+        return x, y, radius
+
+    def place_batch(self, location_codes: np.ndarray, severities: np.ndarray) -> None:
+        """Position a batch of events and add them to the index."""
+        n = len(location_codes)
+        centres = self._coordinates[np.asarray(location_codes, dtype=np.intp)]
+        offsets = self.rng.normal(0.0, self.spread, (n, 2))
+        xs = np.clip(centres[:, 0] + offsets[:, 0], 0.0, self.width)
+        ys = np.clip(centres[:, 1] + offsets[:, 1], 0.0, self.height)
+        radii = np.asarray(severities, dtype=np.float64) * self.radius_per_severity
+        self.index.add_batch(xs, ys, radii)
+
+    def within(self, x: float, y: float, r: float) -> np.ndarray:
+        """Sequence numbers of events whose affected area intersects the disk."""
+        return self.index.within(x, y, r)
+
+    def position(self, seq: int) -> Tuple[float, float, float]:
+        """The (x, y, radius) of the event with the given sequence number."""
+        return self.index.position(seq)
+
+    def evict_before(self, seq: int) -> None:
+        """Forget the positions of events with a sequence number below seq."""
+        self.index.evict_before(seq)
+
+
+class HazardGrid:
+    """
+    Raster map of hazard intensity over the scenario map.
+
+    Cell (row, col) covers the square whose south-west corner is at
+    (col * cell_size, row * cell_size). Subclasses implement step(), which
+    advances the hazard by one tick with whole-array NumPy operations.
+    """
+
+    def __init__(self, width: int = 1000, height: int = 1000, cell_size: float = 0.1,
+                 seed: Optional[int] = None):
+        """
+        Initialize an empty grid.
+
+        Args:
+            width: Number of columns
+            height: Number of rows
+            cell_size: Cell side length in km
+            seed: Seed for stochastic propagation
+        """
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.rng = np.random.default_rng(seed)
+        self.intensity = np.zeros((height, width), dtype=np.float32)
+        self.ticks = 0
+
+    def cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        """Return the (row, col) of the cell containing a point."""
+        return int(y // self.cell_size), int(x // self.cell_size)
+
+    def cells_within(self, x: float, y: float, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the cells whose centres lie within radius of a point.
+
+        Only the cells in the circle's bounding box are examined.
+
+        Returns:
+            (rows, cols) index arrays
+        """
+        size = self.cell_size
+        r0 = max(int((y - radius) // size), 0)
+        r1 = min(int((y + radius) // size), self.height - 1)
+        c0 = max(int((x - radius) // size), 0)
+        c1 = min(int((x + radius) // size), self.width - 1)
+        if r0 > r1 or c0 > c1:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        cy = (np.arange(r0, r1 + 1) + 0.5) * size - y
+        cx = (np.arange(c0, c1 + 1) + 0.5) * size - x
+        rows, cols = np.nonzero(cy[:, None] ** 2 + cx[None, :] ** 2 <= radius * radius)
+        return rows + r0, cols + c0
+
+    def apply_event(self, x: float, y: float, radius: float, intensity: float = 1.0) -> int:
+        """
+        Raise the hazard intensity of every cell within radius of a point.
+
+        Returns:
+            Number of cells affected
+        """
+        rows, cols = self.cells_within(x, y, radius)
+        self.intensity[rows, cols] = np.maximum(self.intensity[rows, cols], intensity)
+        return len(rows)
+
+    def affected_cells(self, threshold: float = 0.0) -> int:
+        """Number of cells with intensity above threshold."""
+        return int(np.count_nonzero(self.intensity > threshold))
+
+    def affected_area(self, threshold: float = 0.0) -> float:
+        """Area in km^2 of the cells with intensity above threshold."""
+        return self.affected_cells(threshold) * self.cell_size ** 2
+
+    def step(self) -> None:
+        raise NotImplementedError
+
+    def run(self, ticks: int) -> None:
+        """Advance the hazard by several ticks."""
+        for _ in range(ticks):
+            self.step()
+
+
+def _neighbour_any(mask: np.ndarray) -> np.ndarray:
+    """Cells with at least one of their four neighbours set in mask (no wrap-around)."""
+    out = np.zeros_like(mask)
+    out[1:, :] |= mask[:-1, :]
+    out[:-1, :] |= mask[1:, :]
+    out[:, 1:] |= mask[:, :-1]
+    out[:, :-1] |= mask[:, 1:]
+    return out
+
+
+class WildfireGrid(HazardGrid):
+    """
+    Stochastic wildfire spread.
+
+    Intensity is the fire intensity of a cell (0 = not burning). Each tick
+    a burning cell consumes fuel, burns out when its fuel is gone, and
+    sets each unburnt neighbour alight with a probability proportional to
+    that neighbour's fuel.
+    """
+
+    def __init__(self, width: int = 1000, height: int = 1000, cell_size: float = 0.1,
+                 seed: Optional[int] = None, spread_probability: float = 0.4,
+                 burn_rate: float = 0.25, fuel: Optional[np.ndarray] = None):
+        """
+        Initialize the wildfire grid.
+
+        Args:
+            width: Number of columns
+            height: Number of rows
+            cell_size: Cell side length in km
+            seed: Seed for the spread draws
+            spread_probability: Chance per tick of igniting a neighbour with full fuel
+            burn_rate: Fuel consumed per tick by a burning cell
+            fuel: Initial fuel per cell in [0, 1] (default: 1 everywhere)
+        """
+        super().__init__(width, height, cell_size, seed)
+        self.spread_probability = spread_probability
+        self.burn_rate = burn_rate
+        if fuel is None:
+            self.fuel = np.ones((height, width), dtype=np.float32)
+        else:
+            self.fuel = np.asarray(fuel, dtype=np.float32).copy()
+
+    def step(self) -> None:
+        burning = self.intensity > 0
+        candidates = _neighbour_any(burning)
+        candidates &= ~burning
+        candidates &= self.fuel > 0
+
+        # Draw random numbers only for the cells that can catch fire
+        flat = np.flatnonzero(candidates)
+        chance = self.spread_probability * self.fuel.ravel()[flat]
+        ignited = flat[self.rng.random(len(flat)) < chance]
+
+        self.fuel[burning] -= self.burn_rate
+        burnt_out = burning & (self.fuel <= 0)
+        self.fuel[burnt_out] = 0
+        self.intensity[burnt_out] = 0
+        self.intensity.ravel()[ignited] = 1.0
+        self.ticks += 1
+
+    def burnt_cells(self) -> int:
+        """Number of cells whose fuel is exhausted."""
+        return int(np.count_nonzero(self.fuel <= 0))
+
+
+class FloodGrid(HazardGrid):
+    """
+    Flood spread as water flowing downhill.
+
+    Intensity is water depth. Each tick every cell passes a share of its
+    water to each lower neighbour (by water surface height, terrain plus
+    depth), proportional to the height difference. Water is conserved
+    except where absorption is set.
+    """
+
+    def __init__(self, width: int = 1000, height: int = 1000, cell_size: float = 0.1,
+                 seed: Optional[int] = None, flow_rate: float = 0.2,
+                 absorption: float = 0.0, elevation: Optional[np.ndarray] = None):
+        """
+        Initialize the flood grid.
+
+        Args:
+            width: Number of columns
+            height: Number of rows
+            cell_size: Cell side length in km
+            seed: Unused; accepted for a uniform HazardGrid interface
+            flow_rate: Fraction of a surface height difference that flows per tick (<= 0.25)
+            absorption: Fraction of water absorbed by the ground per tick
+            elevation: Terrain height per cell (default: flat)
+        """
+        super().__init__(width, height, cell_size, seed)
+        if not 0 < flow_rate <= 0.25:
+            raise ValueError("flow_rate must be in (0, 0.25] to keep the flow stable")
+        self.flow_rate = flow_rate
+        self.absorption = absorption
+        if elevation is None:
+            self.elevation = np.zeros((height, width), dtype=np.float32)
+        else:
+            self.elevation = np.asarray(elevation, dtype=np.float32)
+
+    def step(self) -> None:
+        depth = self.intensity
+        surface = self.elevation + depth
+        # No cell can pass more than a quarter of its water to one neighbour,
+        # so depths never go negative
+        quarter = 0.25 * depth
+        delta = np.zeros_like(depth)
+
+        # Positive flow moves water from the lower-index cell of each
+        # neighbouring pair to the higher-index one
+        flow = surface[:-1, :] - surface[1:, :]
+        flow *= self.flow_rate
+        np.clip(flow, -quarter[1:, :], quarter[:-1, :], out=flow)
+        delta[:-1, :] -= flow
+        delta[1:, :] += flow
+
+        flow = surface[:, :-1] - surface[:, 1:]
+        flow *= self.flow_rate
+        np.clip(flow, -quarter[:, 1:], quarter[:, :-1], out=flow)
+        delta[:, :-1] -= flow
+        delta[:, 1:] += flow
+
+        depth += delta
+        if self.absorption:
+            depth *= 1.0 - self.absorption
+        np.maximum(depth, 0, out=depth)
+        self.ticks += 1
+
+    def total_water(self) -> float:
+        """Total water volume in cell-depth units."""
+        return float(self.intensity.sum(dtype=np.float64))
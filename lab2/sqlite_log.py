@@ -0,0 +1,299 @@
+"""
+LAB 2: SQLite Event Log
+
+This module stores an event log in a SQLite database instead of a JSON
+file, so that historical analysis does not have to load the log:
+
+- SqliteLogWriter buffers records and inserts them with executemany(),
+  one transaction per batch. It has the write/flush/close interface of
+  JsonlLogWriter, so EventLogger and BackgroundLogWriter can use it in
+  place of a file. The database runs in WAL mode, so readers see
+  committed batches while the writer keeps appending.
+- SqliteEventLog reads the database. Time-range reads, filtered queries
+  and reports are answered by SQL over indexes on timestamp, disaster
+  type, severity and location; reports are GROUP BY aggregates, so only
+  the counts reach Python.
+
+Timestamps are stored as the ISO 8601 strings of the log records, which
+order like the naive datetimes the environment produces.
+"""
+
+import sqlite3
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+Timestamp = Union[datetime, str, None]
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY,
+        event_id TEXT NOT NULL,
+        disaster_type TEXT NOT NULL,
+        location TEXT NOT NULL,
+        severity_level INTEGER NOT NULL,
+        damage_assessment INTEGER NOT NULL,
+        timestamp TEXT NOT NULL,
+        affected_population INTEGER NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS events_timestamp ON events (timestamp)",
+    "CREATE INDEX IF NOT EXISTS events_disaster_type ON events (disaster_type)",
+    "CREATE INDEX IF NOT EXISTS events_severity_level ON events (severity_level)",
+    "CREATE INDEX IF NOT EXISTS events_location ON events (location)"
+)
+
+_INSERT = (
+    "INSERT INTO events (event_id, disaster_type, location, severity_level, "
+    "damage_assessment, timestamp, affected_population) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+_COLUMNS = (
+    "event_id, disaster_type, location, severity_level, damage_assessment, "
+    "timestamp, affected_population"
+)
+
+
+def _iso(value: Timestamp) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _connect(path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open the database in WAL mode and make sure the schema exists."""
+    connection = sqlite3.connect(path, check_same_thread=check_same_thread)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # In WAL mode NORMAL only syncs at checkpoints and stays crash-safe
+    connection.execute("PRAGMA synchronous=NORMAL")
+    with connection:
+        for statement in _SCHEMA:
+            connection.execute(statement)
+    return connection
+
+
+def _to_row(record: Dict) -> Tuple:
+    damage = record["damage_assessment"]
+    if isinstance(damage, str):
+        damage = damage.rstrip("%")
+    return (
+        record["event_id"],
+        record["disaster_type"],
+        record["location"],
+        int(record["severity_level"]),
+        int(damage),
+        _iso(record["timestamp"]),
+        int(record["affected_population"])
+    )
+
+
+def _to_record(row: Tuple) -> Dict:
+    event_id, disaster_type, location, severity_level, damage, timestamp, population = row
+    return {
+        "event_id": event_id,
+        "disaster_type": disaster_type,
+        "location": location,
+        "severity_level": severity_level,
+        "damage_assessment": f"{damage}%",
+        "timestamp": timestamp,
+        "affected_population": population
+    }
+
+
+class SqliteLogWriter:
+    """
+    Appends log records to a SQLite database in batches.
+
+    Records are buffered and inserted with one executemany() per batch
+    when any of the configured thresholds is reached. The connection may
+    be used from a thread other than the one that opened it, e.g. by a
+    BackgroundLogWriter, but only by one thread at a time.
+    """
+
+    def __init__(self, path: str, flush_records: Optional[int] = 100,
+                 flush_interval: Optional[float] = 5.0):
+        """
+        Open the database for appending, creating it if needed.
+
+        Args:
+            path: Database file
+            flush_records: Insert after this many buffered records (None to disable)
+            flush_interval: Insert when a write happens this many seconds after
+                the previous flush (None to disable)
+        """
+        self.path = path
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self.records_written = 0
+        self._connection: Optional[sqlite3.Connection] = _connect(path, check_same_thread=False)
+        self._pending: List[Tuple] = []
+        self._last_flush = time.monotonic()
+
+    @property
+    def closed(self) -> bool:
+        return self._connection is None
+
+    def write(self, record: Dict) -> None:
+        """
+        Buffer one record, inserting the batch if a threshold has been reached.
+
+        Args:
+            record: Logged event dictionary, as produced by DisasterEvent.to_dict()
+        """
+        if self._connection is None:
+            raise ValueError("write to closed SqliteLogWriter")
+        self._pending.append(_to_row(record))
+        self.records_written += 1
+
+        if ((self.flush_records is not None and len(self._pending) >= self.flush_records)
+                or (self.flush_interval is not None
+                    and time.monotonic() - self._last_flush >= self.flush_interval)):
+            self.flush()
+
+    def flush(self, fsync: bool = False) -> None:
+        """
+        Insert and commit the buffered records.
+
+        Args:
+            fsync: Also checkpoint the write-ahead log, which syncs it to disk
+        """
+        if self._pending:
+            with self._connection:
+                self._connection.executemany(_INSERT, self._pending)
+            self._pending = []
+        if fsync:
+            self._connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Insert outstanding records and close the database."""
+        if self._connection is not None:
+            self.flush()
+            self._connection.close()
+            self._connection = None
+
+
+class SqliteEventLog:
+    """
+    Read access to a database written by SqliteLogWriter.
+
+    Every read sees the batches committed before it started.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a SQLite event log.
+
+        Args:
+            path: Database file
+        """
+        self.path = path
+        self._connection = _connect(path)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    @staticmethod
+    def _where(disaster_type=None, location: Optional[str] = None, min_severity=None,
+               since: Timestamp = None, until: Timestamp = None) -> Tuple[str, List]:
+        """SQL WHERE clause and parameters for the given filters."""
+        clauses = []
+        params: List = []
+        if disaster_type is not None:
+            clauses.append("disaster_type = ?")
+            params.append(getattr(disaster_type, "value", disaster_type))
+        if location is not None:
+            clauses.append("location = ?")
+            params.append(location)
+        if min_severity is not None:
+            clauses.append("severity_level >= ?")
+            params.append(getattr(min_severity, "value", min_severity))
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_iso(since))
+        if until is not None:
+            clauses.append("timestamp <= ?")
+            params.append(_iso(until))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def read(self, since: Timestamp = None, until: Timestamp = None) -> Iterator[Dict]:
+        """
+        Stream the records with timestamps in [since, until].
+
+        Rows are fetched from the cursor as they are consumed, so memory
+        use does not grow with the size of the range.
+
+        Args:
+            since: Earliest timestamp to include (default: no lower bound)
+            until: Latest timestamp to include (default: no upper bound)
+
+        Yields:
+            Logged event dictionaries, in write order without bounds and in
+            timestamp order with them
+        """
+        where, params = self._where(since=since, until=until)
+        order = " ORDER BY timestamp, id" if where else " ORDER BY id"
+        cursor = self._connection.execute(f"SELECT {_COLUMNS} FROM events{where}{order}", params)
+        for row in cursor:
+            yield _to_record(row)
+
+    def query(self, disaster_type=None, location: Optional[str] = None,
+              min_severity=None, since: Timestamp = None, until: Timestamp = None,
+              limit: Optional[int] = None) -> List[Dict]:
+        """
+        Find logged events matching all of the given filters.
+
+        Takes the same filters as DisasterEnvironment.query().
+
+        Args:
+            disaster_type: DisasterType (or its value) to match
+            location: Location name to match
+            min_severity: Minimum SeverityLevel (or its value)
+            since: Only events at or after this timestamp
+            until: Only events at or before this timestamp
+            limit: Return only the most recent `limit` matches
+
+        Returns:
+            Matching logged event dictionaries, oldest first
+        """
+        if limit is not None and limit <= 0:
+            return []
+        where, params = self._where(disaster_type, location, min_severity, since, until)
+        if limit is None:
+            sql = f"SELECT {_COLUMNS} FROM events{where} ORDER BY timestamp, id"
+            return [_to_record(row) for row in self._connection.execute(sql, params)]
+        sql = f"SELECT {_COLUMNS} FROM events{where} ORDER BY timestamp DESC, id DESC LIMIT ?"
+        rows = self._connection.execute(sql, params + [limit]).fetchall()
+        return [_to_record(row) for row in reversed(rows)]
+
+    def report(self, since: Timestamp = None, until: Timestamp = None) -> Dict:
+        """
+        Build an EventLogger-style report for [since, until] with SQL aggregates.
+
+        Args:
+            since: Earliest timestamp to include (default: no lower bound)
+            until: Latest timestamp to include (default: no upper bound)
+
+        Returns:
+            Report in the layout of EventLogger.generate_report(), plus
+            location_distribution
+        """
+        where, params = self._where(since=since, until=until)
+        distributions = {}
+        for column in ("severity_level", "disaster_type", "location"):
+            sql = f"SELECT {column}, COUNT(*) FROM events{where} GROUP BY {column}"
+            distributions[column] = dict(self._connection.execute(sql, params).fetchall())
+
+        total_events = sum(distributions["severity_level"].values())
+        if not total_events:
+            return {"error": "No events logged"}
+
+        return {
+            "total_events": total_events,
+            "severity_distribution": distributions["severity_level"],
+            "disaster_distribution": distributions["disaster_type"],
+            "location_distribution": distributions["location"],
+            "log_file": self.path,
+            "report_generated": datetime.now().isoformat()
+        }
@@ -0,0 +1,190 @@
+"""
+LAB 2: Structured Logging
+
+This module provides a compact logging mode for high event rates:
+
+- StructuredMessage: a log message that holds references to its data
+  and renders itself only when a handler formats it, either as
+  "name key=value ..." text or as fields for JsonFormatter
+- JsonFormatter: one JSON object per line
+- RateLimitFilter: token-bucket rate limiting that reports how many
+  records it suppressed and keeps multi-line reports whole
+- configure_logging(): routes a logger through a QueueHandler, so
+  formatting and handler I/O happen on a listener thread instead of the
+  asyncio event loop
+"""
+
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+
+class StructuredMessage:
+    """
+    Log message whose fields are built only when it is formatted.
+
+    Subclasses implement fields(). Pass an instance as the message of a
+    logging call; nothing is formatted unless a handler emits the record.
+    """
+
+    name = "message"
+
+    def fields(self) -> Dict:
+        raise NotImplementedError
+
+    def __str__(self) -> str:
+        return self.name + " " + " ".join(f"{key}={value}" for key, value in self.fields().items())
+
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as a single-line JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name
+        }
+        message = record.msg
+        if isinstance(message, StructuredMessage) and not record.args:
+            entry["event"] = message.name
+            entry.update(message.fields())
+        else:
+            entry["message"] = record.getMessage()
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token-bucket filter that lets through at most `rate` records per second.
+
+    Records at or above `always_level` (default WARNING) always pass. The
+    first record let through after a suppression carries the number of
+    dropped records in its `suppressed` attribute.
+
+    Consecutive records logged with the same object as their `report`
+    attribute (e.g. extra={"report": event}) form one multi-line report:
+    the first of them takes a token and the rest share its outcome, so a
+    report is either emitted whole or suppressed whole.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None,
+                 always_level: int = logging.WARNING):
+        """
+        Initialize the filter.
+
+        Args:
+            rate: Records per second to let through on average
+            burst: Bucket size, i.e. records that may pass at once (default: max(1, rate))
+            always_level: Records at this level or above are never limited
+        """
+        super().__init__()
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.always_level = always_level
+        self.suppressed = 0
+        self.total_suppressed = 0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._report = None
+        self._report_passed = True
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.always_level:
+            return True
+        report = getattr(record, "report", None)
+        with self._lock:
+            if report is not None and report is self._report:
+                if not self._report_passed:
+                    self.suppressed += 1
+                    self.total_suppressed += 1
+                return self._report_passed
+            self._report = report
+            self._report_passed = False
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                self.suppressed += 1
+                self.total_suppressed += 1
+                return False
+            self._tokens -= 1
+            self._report_passed = True
+            if self.suppressed:
+                record.suppressed = self.suppressed
+                self.suppressed = 0
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The standard QueueHandler formats the message before enqueueing it,
+    which would keep that cost on the logging thread. Records are passed
+    through unformatted instead, so messages and their arguments must not
+    be mutated after logging; StructuredMessage data is read-only.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(logger: Optional[logging.Logger] = None, structured: bool = True,
+                      level: int = logging.INFO, rate_limit: Optional[float] = None,
+                      burst: Optional[int] = None,
+                      handler: Optional[logging.Handler] = None) -> QueueListener:
+    """
+    Send a logger's records through a queue to a handler on a listener thread.
+
+    Replaces the logger's handlers and stops propagation, so the records
+    are emitted exactly once.
+
+    Args:
+        logger: Logger to configure (default: the root logger)
+        structured: Use JsonFormatter instead of the human-readable format
+        level: Logger level
+        rate_limit: Records per second to let through below WARNING (default: unlimited)
+        burst: Rate limit bucket size
+        handler: Handler that emits the records (default: a stderr StreamHandler)
+
+    Returns:
+        The started QueueListener; call stop() on it to flush and shut down
+    """
+    if logger is None:
+        logger = logging.getLogger()
+    if handler is None:
+        handler = logging.StreamHandler(sys.stderr)
+    if structured:
+        handler.setFormatter(JsonFormatter())
+    elif handler.formatter is None:
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+    records = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(records)
+    if rate_limit is not None:
+        queue_handler.addFilter(RateLimitFilter(rate_limit, burst))
+
+    for existing in list(logger.handlers):
+        logger.removeHandler(existing)
+    logger.addHandler(queue_handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+    listener = QueueListener(records, handler, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,150 @@
+"""
+LAB 2: Sliding Window Statistics
+
+This module keeps rolling event statistics (last minute, last five
+minutes, last hour, ...) for the disaster environment. Each window is a
+queue of fixed-width time buckets with running totals: adding events
+updates one bucket, and expired buckets are popped from the front and
+subtracted, so both operations are amortized O(1) regardless of the
+event rate.
+"""
+
+from collections import deque
+from typing import Dict, Tuple
+
+# Default windows reported by WindowedEventStats: (label, seconds)
+DEFAULT_WINDOWS: Tuple[Tuple[str, int], ...] = (("1m", 60), ("5m", 300), ("1h", 3600))
+
+
+class SlidingWindowStats:
+    """
+    Rolling totals over a fixed time window.
+
+    The window is divided into `buckets` equal slices; statistics are exact
+    per bucket, so the window edge has a resolution of one bucket width.
+    """
+
+    def __init__(self, window_seconds: float, buckets: int = 60):
+        """
+        Initialize an empty window.
+
+        Args:
+            window_seconds: Length of the window in seconds
+            buckets: Number of buckets the window is divided into
+        """
+        self.window_seconds = window_seconds
+        self.buckets = buckets
+        self.bucket_us = max(1, int(window_seconds * 1_000_000) // buckets)
+        # Each bucket: [bucket_id, events, severity_sum, population, critical]
+        self._buckets = deque()
+        self.events = 0
+        self.severity_sum = 0
+        self.population = 0
+        self.critical = 0
+
+    def add(self, timestamp_us: int, events: int, severity_sum: int,
+            population: int, critical: int) -> None:
+        """
+        Add aggregated statistics for events sharing one timestamp.
+
+        Args:
+            timestamp_us: Event timestamp in epoch microseconds
+            events: Number of events
+            severity_sum: Sum of their severity levels
+            population: Sum of their affected population
+            critical: Number of critical events among them
+        """
+        bucket_id = timestamp_us // self.bucket_us
+        buckets = self._buckets
+
+        if not buckets or bucket_id > buckets[-1][0]:
+            buckets.append([bucket_id, events, severity_sum, population, critical])
+            # Keep memory bounded when summary() is not called: drop buckets
+            # outside the window ending at the newest bucket
+            self._expire_through(bucket_id - self.buckets)
+        else:
+            # Late event: find its bucket, searching from the newest end
+            position = len(buckets) - 1
+            while position >= 0 and buckets[position][0] > bucket_id:
+                position -= 1
+            if position >= 0 and buckets[position][0] == bucket_id:
+                bucket = buckets[position]
+                bucket[1] += events
+                bucket[2] += severity_sum
+                bucket[3] += population
+                bucket[4] += critical
+            elif bucket_id > buckets[-1][0] - self.buckets:
+                buckets.insert(position + 1, [bucket_id, events, severity_sum, population, critical])
+            else:
+                # Already outside the window of the newest data
+                return
+
+        self.events += events
+        self.severity_sum += severity_sum
+        self.population += population
+        self.critical += critical
+
+    def expire(self, now_us: int) -> None:
+        """Drop buckets that have fallen out of the window ending at now_us."""
+        self._expire_through(now_us // self.bucket_us - self.buckets)
+
+    def _expire_through(self, oldest: int) -> None:
+        """Pop buckets with ids up to and including oldest, subtracting their totals."""
+        buckets = self._buckets
+        while buckets and buckets[0][0] <= oldest:
+            _, events, severity_sum, population, critical = buckets.popleft()
+            self.events -= events
+            self.severity_sum -= severity_sum
+            self.population -= population
+            self.critical -= critical
+
+    def summary(self, now_us: int) -> Dict:
+        """
+        Summarize the window ending at now_us.
+
+        Returns:
+            Dictionary with the same fields as DisasterEnvironment.get_event_summary
+            plus the window length
+        """
+        self.expire(now_us)
+        average = self.severity_sum / self.events if self.events > 0 else 0
+        return {
+            "window_seconds": self.window_seconds,
+            "total_events": self.events,
+            "average_severity": round(average, 2),
+            "total_affected_population": self.population,
+            "critical_events": self.critical,
+            "environmental_status": "Unstable" if average > 3 else "Monitoring"
+        }
+
+
+class WindowedEventStats:
+    """A set of SlidingWindowStats fed from the same event stream."""
+
+    def __init__(self, windows: Tuple[Tuple[str, float], ...] = DEFAULT_WINDOWS,
+                 buckets: int = 60):
+        """
+        Initialize the windows.
+
+        Args:
+            windows: Pairs of (label, window length in seconds)
+            buckets: Number of buckets per window
+        """
+        self.windows: Dict[str, SlidingWindowStats] = {
+            label: SlidingWindowStats(seconds, buckets) for label, seconds in windows
+        }
+
+    def add(self, timestamp_us: int, events: int, severity_sum: int,
+            population: int, critical: int) -> None:
+        """Add aggregated statistics for events sharing one timestamp to every window."""
+        for window in self.windows.values():
+            window.add(timestamp_us, events, severity_sum, population, critical)
+
+    def summary(self, now_us: int) -> Dict[str, Dict]:
+        """
+        Summarize every window ending at now_us.
+
+        Returns:
+            Mapping of window label to its summary
+        """
+        return {label: window.summary(now_us) for label, window in self.windows.items()}
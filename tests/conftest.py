@@ -0,0 +1,17 @@
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "benchmarks"))
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging():
+    """Per-event INFO logging would dominate the test run."""
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
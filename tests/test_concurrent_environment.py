@@ -0,0 +1,20 @@
+import pytest
+
+from lab2.concurrent_environment import ConcurrentDisasterEnvironment
+from stress_environment import check, run_writers
+
+
+@pytest.mark.parametrize("threads,batch", [(1, 1), (4, 1), (8, 1), (4, 50)])
+def test_concurrent_writers_lose_nothing(threads, batch):
+    events = 2000
+    environment = ConcurrentDisasterEnvironment(seed=0)
+    run_writers(environment, threads, events, batch)
+    assert check(environment, threads * events) == []
+
+
+def test_event_ids_are_unique_across_threads():
+    environment = ConcurrentDisasterEnvironment(seed=0, block_size=16)
+    run_writers(environment, 8, 500, 7)
+    ids = [event.event_id for event in environment.events]
+    assert len(ids) == 8 * 500
+    assert len(set(ids)) == len(ids)
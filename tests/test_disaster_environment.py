@@ -0,0 +1,109 @@
+from datetime import datetime
+
+import pytest
+
+from lab2.correlation import IncidentCorrelator
+from lab2.disaster_environment import DisasterEnvironment
+from lab2.event_logger import analyze_environment_state
+from lab2.simulation import VirtualClock
+
+
+def make_environment(**kwargs):
+    return DisasterEnvironment(seed=7, clock=VirtualClock(datetime(2024, 1, 1)), **kwargs)
+
+
+def generate(environment, batches=20):
+    """Mix single events and batches across simulated time."""
+    for i in range(batches):
+        environment.clock.advance(30)
+        environment.generate_event()
+        environment.generate_events(i * 5)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_aggregates_match_recompute(columnar):
+    environment = make_environment(columnar=columnar)
+    generate(environment)
+    assert environment.verify_aggregates()
+
+
+def test_aggregates_with_max_events_before_eviction():
+    environment = make_environment(max_events=10000)
+    generate(environment)
+    assert environment.store.dropped == 0
+    assert environment.verify_aggregates()
+
+
+def test_aggregates_with_max_events_cover_evicted_events():
+    bounded = make_environment(max_events=50)
+    unbounded = make_environment()
+    generate(bounded)
+    generate(unbounded)
+    assert len(bounded.events) == 50
+    with pytest.raises(ValueError):
+        bounded.verify_aggregates()
+    assert bounded.get_event_summary() == unbounded.get_event_summary()
+    assert bounded.severity_counts == unbounded.severity_counts
+    assert bounded.type_counts == unbounded.type_counts
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_aggregates_with_ingested_events(columnar):
+    source = make_environment()
+    generate(source)
+    environment = make_environment(columnar=columnar)
+    environment.generate_events(10)
+    for event in source.events:
+        environment.ingest_event(event)
+    environment.generate_events(10)
+    assert environment.get_event_summary()["total_events"] == len(source.events) + 20
+    assert environment.verify_aggregates()
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_aggregates_with_correlator(columnar):
+    environment = make_environment(columnar=columnar, correlator=IncidentCorrelator())
+    generate(environment)
+    source = make_environment()
+    generate(source, batches=5)
+    for event in source.events:
+        environment.ingest_event(event)
+    assert "incidents" in environment.get_event_summary()
+    assert environment.verify_aggregates()
+
+
+def test_stored_event_list_is_read_only():
+    environment = make_environment(columnar=True)
+    event = environment.generate_event()
+    with pytest.raises(TypeError):
+        environment.events.append(event)
+    assert len(environment.events) == 1
+    assert environment.verify_aggregates()
+
+
+def test_cached_analysis_follows_correlator_expiry():
+    environment = make_environment(correlator=IncidentCorrelator(window_seconds=60))
+    environment.generate_events(50)
+    before = analyze_environment_state(environment)
+    assert analyze_environment_state(environment) is before
+    assert analyze_environment_state(environment, since_version=before["version"]) is None
+    assert before["environment_summary"]["incidents"]["open_incidents"] > 0
+
+    environment.clock.advance(600)
+    after = analyze_environment_state(environment, since_version=before["version"])
+    assert after is not None
+    assert after["version"] != before["version"]
+    assert after["environment_summary"]["incidents"]["open_incidents"] == 0
+    assert analyze_environment_state(environment, since_version=after["version"]) is None
+
+
+def test_conditional_analysis_without_correlator():
+    environment = make_environment()
+    environment.generate_events(10)
+    state = analyze_environment_state(environment)
+    assert state["version"] == environment.version
+    environment.clock.advance(600)
+    assert analyze_environment_state(environment, since_version=state["version"]) is None
+    environment.generate_event()
+    update = analyze_environment_state(environment, since_version=state["version"])
+    assert update["environment_summary"]["total_events"] == 11
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+import pytest
+
+from lab2.disaster_environment import DisasterEnvironment, DisasterEvent
+from lab2.event_codec import decode_batch, encode_batch
+from lab2.simulation import VirtualClock
+
+
+@pytest.mark.parametrize("size", [0, 1, 10, 1000])
+def test_round_trip_batch(size):
+    events = list(DisasterEnvironment(seed=1).generate_events(size))
+    sequence, decoded = decode_batch(encode_batch(events, sequence=3))
+    assert sequence == 3
+    assert decoded == events
+
+
+def test_round_trip_events_with_distinct_timestamps():
+    clock = VirtualClock(datetime(2024, 1, 1))
+    environment = DisasterEnvironment(seed=2, clock=clock)
+    events = []
+    for _ in range(100):
+        clock.advance(1.5)
+        events.append(environment.generate_event())
+    assert decode_batch(encode_batch(events))[1] == events
+
+
+def test_encode_rejects_non_standard_ids():
+    event = DisasterEnvironment(seed=3).generate_event()
+    foreign = DisasterEvent.from_dict(dict(event.to_dict(), event_id="SENSOR-1"))
+    with pytest.raises(ValueError):
+        encode_batch([event, foreign])
+
+
+@pytest.mark.parametrize("payload", ["", "{}", '{"v": 2}', '{"v": 1, "n": 1, "cols": ""}'])
+def test_decode_rejects_malformed_payloads(payload):
+    with pytest.raises(ValueError):
+        decode_batch(payload)
@@ -0,0 +1,72 @@
+import dataclasses
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from lab2.disaster_environment import DisasterEnvironment, DisasterType, SeverityLevel
+from lab2.simulation import VirtualClock
+
+START = datetime(2024, 1, 1)
+
+
+def make_environment(**kwargs):
+    environment = DisasterEnvironment(seed=11, clock=VirtualClock(START), **kwargs)
+    for i in range(40):
+        environment.clock.advance(15)
+        environment.generate_events(i % 7 * 3)
+        environment.generate_event()
+    return environment
+
+
+def scan(environment, disaster_type, location, min_severity, since, until):
+    return [
+        event for event in environment.events
+        if (disaster_type is None or event.disaster_type == disaster_type)
+        and (location is None or event.location == location)
+        and (min_severity is None or event.severity_level.value >= min_severity.value)
+        and (since is None or event.timestamp >= since)
+        and (until is None or event.timestamp <= until)
+    ]
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"columnar": True}, {"max_events": 150}])
+def test_query_matches_linear_scan(kwargs):
+    environment = make_environment(**kwargs)
+    # An ingested late event makes the time index unsorted
+    late = dataclasses.replace(environment.events[0], event_id="EVT_9999",
+                               timestamp=START - timedelta(minutes=5))
+    environment.ingest_event(late)
+    environment.generate_events(10)
+    assert not environment.index.time_sorted
+
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        disaster_type = rng.choice([None, *DisasterType])
+        location = rng.choice([None, *DisasterEnvironment.LOCATIONS])
+        min_severity = rng.choice([None, *SeverityLevel])
+        since = START + timedelta(seconds=int(rng.integers(-600, 700))) if rng.random() < 0.5 else None
+        until = START + timedelta(seconds=int(rng.integers(-600, 700))) if rng.random() < 0.5 else None
+        expected = scan(environment, disaster_type, location, min_severity, since, until)
+        found = environment.query(disaster_type, location, min_severity, since, until)
+        assert found == expected
+        assert environment.query(disaster_type, location, min_severity, since, until,
+                                 limit=3) == expected[-3:]
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"max_events": 50}])
+def test_held_query_result_does_not_block_the_index(kwargs):
+    environment = make_environment(**kwargs)
+    index = environment.index
+    held = [
+        index.query(type_codes=[0]),
+        index.query(location_codes=[2], severities=[5]),
+        index.query(),
+        index.query(since_us=0),
+    ]
+    copies = [result.copy() for result in held]
+    for _ in range(200):
+        environment.generate_event()
+        environment.generate_events(5)
+    for result, copy in zip(held, copies):
+        assert np.array_equal(result, copy)
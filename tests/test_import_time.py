@@ -0,0 +1,29 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from check_import_time import AGENT_STACK, PROJECT_ROOT
+
+
+def loaded_modules(code):
+    """Top-level packages loaded by running code in a fresh interpreter."""
+    script = f"{code}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                            cwd=PROJECT_ROOT, check=True)
+    return {name.split(".")[0] for name in json.loads(result.stdout)}
+
+
+@pytest.mark.parametrize("code", [
+    "import lab2",
+    "import lab2; lab2.DisasterEnvironment",
+    "import lab2.event_logger",
+    "import lab2; lab2.EventLogger; lab2.merge_reports",
+])
+def test_imports_do_not_load_the_agent_stack(code):
+    assert not loaded_modules(code) & set(AGENT_STACK)
+
+
+def test_sensor_agent_loads_spade():
+    assert "spade" in loaded_modules("import lab2; lab2.SensorAgent")
@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from lab2.log_writers import BackgroundLogWriter, JsonlLogWriter, read_event_log
+
+
+class FailingWriter:
+    """Writer whose write() fails after a number of records."""
+
+    def __init__(self, path, fail_after=0):
+        self.path = path
+        self.fail_after = fail_after
+        self.records = []
+        self.closed = False
+
+    def write(self, record):
+        if len(self.records) >= self.fail_after:
+            raise OSError("disk full")
+        self.records.append(record)
+
+    def flush(self, fsync=False):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def run_with_timeout(function, timeout=5.0):
+    """Run function in a thread; fail the test instead of hanging."""
+    outcome = {}
+
+    def target():
+        try:
+            function()
+        except BaseException as error:
+            outcome["error"] = error
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "call did not return"
+    return outcome.get("error")
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    writer = BackgroundLogWriter(JsonlLogWriter(path), max_queue=8)
+    records = [{"event_id": f"EVT_{i}"} for i in range(100)]
+    for record in records:
+        writer.write(record)
+    writer.close()
+    assert list(read_event_log(path)) == records
+
+
+def test_flush_raises_writer_error(tmp_path):
+    wrapped = FailingWriter(str(tmp_path / "events.jsonl"), fail_after=3)
+    writer = BackgroundLogWriter(wrapped)
+    for i in range(10):
+        writer.write({"event_id": f"EVT_{i}"})
+
+    error = run_with_timeout(writer.flush)
+    assert isinstance(error, RuntimeError)
+    assert isinstance(error.__cause__, OSError)
+    with pytest.raises(RuntimeError):
+        writer.write({"event_id": "EVT_11"})
+
+    error = run_with_timeout(writer.close)
+    assert isinstance(error, RuntimeError)
+    assert wrapped.closed
+
+
+def test_blocked_write_raises_writer_error(tmp_path):
+    writer = BackgroundLogWriter(FailingWriter(str(tmp_path / "events.jsonl")),
+                                 max_queue=1, batch_size=1)
+
+    def write_many():
+        for i in range(10):
+            writer.write({"event_id": f"EVT_{i}"})
+
+    error = run_with_timeout(write_many)
+    assert isinstance(error, RuntimeError)
+    assert isinstance(run_with_timeout(writer.close), RuntimeError)
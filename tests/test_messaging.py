@@ -0,0 +1,40 @@
+import asyncio
+import dataclasses
+
+from lab2.disaster_environment import DisasterEnvironment
+from lab2.event_codec import decode_batch
+from lab2.messaging import EventPublisherBehaviour
+
+
+def make_publisher(max_batch):
+    publisher = EventPublisherBehaviour(subscribers=["hq@localhost"], max_batch=max_batch)
+    sent = []
+
+    async def send(msg):
+        sent.append(msg)
+
+    publisher.send = send
+    return publisher, sent
+
+
+def test_unencodable_batch_is_dropped_and_rest_sent():
+    environment = DisasterEnvironment(seed=0)
+    events = list(environment.generate_events(5))
+    bad = dataclasses.replace(events[1], event_id="SENSOR-1")
+    publisher, sent = make_publisher(max_batch=2)
+    publisher.publish_many([events[0], bad])
+    publisher.publish_many(events[2:])
+
+    asyncio.run(publisher.flush())
+
+    assert publisher.dropped == 2
+    assert publisher.events == 3
+    assert publisher.pending == 0
+    received = [event for msg in sent for event in decode_batch(msg.body)[1]]
+    assert received == events[2:]
+    assert [decode_batch(msg.body)[0] for msg in sent] == [0, 1]
+
+    # The behaviour keeps publishing afterwards
+    publisher.publish(events[0])
+    asyncio.run(publisher.flush())
+    assert publisher.events == 4
@@ -0,0 +1,31 @@
+import itertools
+
+from lab2.monte_carlo import ScenarioStats, _run_chunk, run_monte_carlo
+
+TIMING_KEYS = ("workers", "chunks", "elapsed_seconds", "runs_per_second")
+
+
+def without_timing(summary):
+    return {key: value for key, value in summary.items() if key not in TIMING_KEYS}
+
+
+def test_results_do_not_depend_on_workers_or_chunking():
+    serial = run_monte_carlo(23, events_per_run=200, seed=3, workers=1)
+    parallel = run_monte_carlo(23, events_per_run=200, seed=3, workers=2, chunk_size=5)
+    assert parallel["chunks"] == 5
+    assert without_timing(parallel) == without_timing(serial)
+    assert serial["runs"] == 23
+    assert serial["events"] == 23 * 200
+
+
+def test_merge_is_order_independent():
+    parts = [_run_chunk(first, count, 100, 30, None)
+             for first, count in ((0, 3), (3, 1), (4, 5), (9, 2))]
+    summaries = []
+    for order in itertools.permutations(parts):
+        merged = ScenarioStats()
+        for part in order:
+            merged.merge(part)
+        summaries.append(merged.summary())
+    assert all(summary == summaries[0] for summary in summaries)
+    assert summaries[0] == _run_chunk(0, 11, 100, 30, None).summary()
@@ -0,0 +1,76 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from lab2.segmented_log import SegmentedLog, SegmentedLogWriter
+
+START = datetime(2024, 1, 1)
+
+
+def records(count, start=0):
+    return [{"event_id": f"EVT_{i:04d}", "severity_level": i % 5 + 1,
+             "disaster_type": "flood", "location": "Port District",
+             "timestamp": (START + timedelta(seconds=i)).isoformat()}
+            for i in range(start, start + count)]
+
+
+def test_segments_are_compressed_and_read_back(tmp_path):
+    directory = str(tmp_path / "log")
+    writer = SegmentedLogWriter(directory, max_segment_bytes=4096)
+    written = records(500)
+    for record in written:
+        writer.write(record)
+    writer.close()
+
+    log = SegmentedLog(directory)
+    assert len(log.segments) > 5
+    assert all(segment["name"].endswith(".gz") for segment in log.segments)
+    assert sorted(os.listdir(directory)) == sorted(
+        ["manifest.json"] + [segment["name"] for segment in log.segments])
+    assert list(log.read()) == written
+    assert log.report()["total_events"] == 500
+
+
+def test_roll_does_not_wait_for_compression(tmp_path, monkeypatch):
+    directory = str(tmp_path / "log")
+    writer = SegmentedLogWriter(directory, max_segment_bytes=4096)
+    release = threading.Event()
+    compress = writer._compress_segment
+
+    def slow_compress(name):
+        release.wait(5)
+        compress(name)
+
+    monkeypatch.setattr(writer, "_compress_segment", slow_compress)
+    start = time.perf_counter()
+    for record in records(500):
+        writer.write(record)
+    assert time.perf_counter() - start < 2.5
+
+    # Closed segments are registered and readable before they are compressed
+    log = SegmentedLog(directory)
+    assert len(log.segments) > 5
+    assert len(list(log.read())) == 500
+    release.set()
+    writer.close()
+    assert len(list(log.read())) == 500
+    log.reload()
+    assert all(segment["name"].endswith(".gz") for segment in log.segments)
+
+
+def test_reopening_compresses_uncompressed_segments(tmp_path):
+    directory = str(tmp_path / "log")
+    writer = SegmentedLogWriter(directory, max_segment_bytes=4096, compress=False)
+    for record in records(200):
+        writer.write(record)
+    writer.close()
+    assert not any(name.endswith(".gz") for name in os.listdir(directory))
+
+    writer = SegmentedLogWriter(directory, max_segment_bytes=4096)
+    for record in records(100, start=200):
+        writer.write(record)
+    writer.close()
+    log = SegmentedLog(directory)
+    assert all(segment["name"].endswith(".gz") for segment in log.segments)
+    assert list(log.read()) == records(300)
@@ -0,0 +1,18 @@
+import asyncio
+import socket
+
+from lab2.sensor_agent import run_sensor_agent
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def test_run_sensor_agent_releases_metrics_port():
+    port = free_port()
+    asyncio.run(run_sensor_agent(duration=0.2, jid="sensor_test@localhost", local=True,
+                                 metrics_port=port))
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", port))
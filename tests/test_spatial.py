@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from lab2.disaster_environment import DisasterEnvironment
+from lab2.simulation import VirtualClock
+from lab2.spatial import GridIndex, SpatialModel
+
+
+def make_environment(seed=7, **kwargs):
+    return DisasterEnvironment(seed=seed, clock=VirtualClock(datetime(2024, 1, 1)),
+                               spatial=SpatialModel(), **kwargs)
+
+
+def brute_force(environment, x, y, r):
+    matches = []
+    for event in environment.events:
+        ex, ey, radius = environment.position_of(event)
+        if (ex - x) ** 2 + (ey - y) ** 2 <= (r + radius) ** 2:
+            matches.append(event)
+    return matches
+
+
+def test_grid_index_evicts_oldest_entries():
+    index = GridIndex(bucket_size=1.0)
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        index.add_batch(rng.uniform(0, 10, 100), rng.uniform(0, 10, 100), np.full(100, 0.5))
+        index.evict_before(index.next_seq - 10)
+        assert len(index) == 10
+        assert len(index.xs) <= 20
+        assert sum(len(bucket) for bucket in index.buckets.values()) <= 20
+    seqs = index.within(5.0, 5.0, 20.0)
+    assert seqs.tolist() == list(range(index.next_seq - 10, index.next_seq))
+    with pytest.raises(KeyError):
+        index.position(index.base - 1)
+
+
+def test_spatial_index_is_bounded_by_max_events():
+    environment = make_environment(max_events=10)
+    for _ in range(100):
+        environment.generate_events(100)
+    index = environment.spatial.index
+    assert len(index) == 10
+    assert len(index.xs) <= 20
+    assert sum(len(bucket) for bucket in index.buckets.values()) <= 20
+    assert environment.events_within(50.0, 50.0, 100.0) == list(environment.events)
+    assert environment.events_within(56.0, 63.0, 3.0) == brute_force(environment, 56.0, 63.0, 3.0)
+
+
+def test_seeded_environment_places_events_reproducibly():
+    positions = []
+    for _ in range(2):
+        environment = make_environment(seed=3, columnar=True)
+        environment.generate_events(50)
+        environment.generate_event()
+        positions.append([environment.position_of(event) for event in environment.events])
+    assert positions[0] == positions[1]
+    other = make_environment(seed=4, columnar=True)
+    other.generate_events(50)
+    assert [other.position_of(event) for event in other.events] != positions[0][:50]
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_position_of_after_ingest_event(columnar):
+    source = make_environment(seed=1)
+    replayed = [source.generate_event() for _ in range(5)]
+    environment = make_environment(columnar=columnar)
+    environment.generate_events(10)
+    for event in replayed:
+        environment.ingest_event(event)
+    environment.generate_events(10)
+
+    for seq, event in enumerate(environment.events):
+        assert environment.position_of(event) == environment.spatial.position(seq)
+    assert replayed[0].event_id == environment.events[0].event_id
+    assert environment.position_of(replayed[0]) == environment.spatial.position(10)
+
+
+def test_position_of_evicted_event_raises():
+    environment = make_environment(max_events=10)
+    first = environment.generate_events(5)[0]
+    environment.generate_events(100)
+    with pytest.raises(ValueError):
+        environment.position_of(first)
+    for event in environment.events:
+        environment.position_of(event)
+    assert len(environment._run_seqs) == 1
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from lab2.disaster_environment import DisasterEnvironment, DisasterType, SeverityLevel, to_dicts
+from lab2.event_logger import EventLogger
+from lab2.simulation import VirtualClock
+from lab2.sqlite_log import SqliteEventLog, SqliteLogWriter
+
+START = datetime(2024, 1, 1)
+
+
+def generate(batches=30, size=20):
+    """Seeded events, one batch per simulated minute."""
+    clock = VirtualClock(START)
+    environment = DisasterEnvironment(seed=5, clock=clock)
+    events = []
+    for _ in range(batches):
+        clock.advance(60)
+        events.extend(environment.generate_events(size))
+    return events
+
+
+@pytest.fixture
+def records():
+    return to_dicts(generate())
+
+
+def test_writer_inserts_in_batches_of_flush_records(tmp_path, records):
+    path = str(tmp_path / "events.db")
+    writer = SqliteLogWriter(path, flush_records=10, flush_interval=None)
+    reader = SqliteEventLog(path)
+    for record in records[:25]:
+        writer.write(record)
+    assert writer.records_written == 25
+    assert len(reader) == 20
+    writer.flush()
+    assert len(reader) == 25
+    writer.close()
+    assert writer.closed
+    with pytest.raises(ValueError):
+        writer.write(records[0])
+    reader.close()
+
+
+def test_writer_flush_interval(tmp_path, records):
+    path = str(tmp_path / "events.db")
+    reader = SqliteEventLog(path)
+    writer = SqliteLogWriter(path, flush_records=None, flush_interval=3600)
+    for record in records[:5]:
+        writer.write(record)
+    assert len(reader) == 0
+    writer.flush_interval = 0
+    writer.write(records[5])
+    assert len(reader) == 6
+    writer.close()
+    reader.close()
+
+
+def test_read_and_query_match_a_scan(tmp_path, records):
+    path = str(tmp_path / "events.db")
+    writer = SqliteLogWriter(path)
+    for record in records:
+        writer.write(record)
+    writer.close()
+    log = SqliteEventLog(path)
+
+    assert list(log.read()) == records
+    since = (START + timedelta(minutes=10)).isoformat()
+    until = (START + timedelta(minutes=14)).isoformat()
+    in_range = [r for r in records if since <= r["timestamp"] <= until]
+    assert list(log.read(since, until)) == in_range
+    assert len(in_range) == 100
+
+    matches = [r for r in records
+               if r["disaster_type"] == DisasterType.FLOOD.value and r["severity_level"] >= 3]
+    assert log.query(DisasterType.FLOOD, min_severity=SeverityLevel.MODERATE) == matches
+    # The limit path selects newest first and reverses
+    assert log.query(DisasterType.FLOOD, min_severity=3, limit=7) == matches[-7:]
+    assert log.query("flood", min_severity=3, since=since, until=until, limit=1000) == [
+        r for r in matches if since <= r["timestamp"] <= until]
+    assert log.query(location="Hospital Area", limit=0) == []
+    assert log.query(location="Nowhere") == []
+    log.close()
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_event_logger_sqlite_matches_counter_report(tmp_path, background):
+    events = generate()
+    counted = EventLogger(str(tmp_path / "events.json"))
+    database = EventLogger(str(tmp_path / "events.db"), sqlite=True, background=background,
+                           flush_records=50)
+    for logger in (counted, database):
+        logger.log_events(events[:300])
+        for event in events[300:]:
+            logger.log_event(event)
+
+    expected = counted.generate_report()
+    report = database.generate_report()
+    for key in ("total_events", "severity_distribution", "disaster_distribution"):
+        assert report[key] == expected[key]
+    assert report["total_events"] == len(events)
+    assert sum(report["location_distribution"].values()) == len(events)
+
+    assert database.query(DisasterType.WILDFIRE, limit=5) == counted.query(
+        DisasterType.WILDFIRE, limit=5)
+    since, until = START + timedelta(minutes=3), START + timedelta(minutes=5)
+    assert list(database.iter_events(since, until)) == list(counted.iter_events(since, until))
+    database.close()
@@ -0,0 +1,29 @@
+import logging
+
+from lab2.structured_logging import RateLimitFilter
+
+
+def make_record(message, report=None, level=logging.INFO):
+    record = logging.LogRecord("test", level, __file__, 1, message, None, None)
+    if report is not None:
+        record.report = report
+    return record
+
+
+def test_rate_limit_suppresses_plain_records():
+    limiter = RateLimitFilter(rate=0.001, burst=2)
+    passed = [limiter.filter(make_record(f"line {i}")) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert limiter.filter(make_record("warning", level=logging.WARNING))
+    assert limiter.total_suppressed == 3
+
+
+def test_rate_limit_keeps_reports_whole():
+    limiter = RateLimitFilter(rate=0.001, burst=2)
+    outcomes = []
+    for report in (object(), object(), object()):
+        outcomes.append([limiter.filter(make_record(f"line {i}", report)) for i in range(16)])
+    assert outcomes[0] == [True] * 16
+    assert outcomes[1] == [True] * 16
+    assert outcomes[2] == [False] * 16
+    assert limiter.total_suppressed == 16
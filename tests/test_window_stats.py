@@ -0,0 +1,22 @@
+from lab2.window_stats import SlidingWindowStats
+
+SECOND = 1_000_000
+
+
+def test_add_expires_old_buckets_without_summary():
+    window = SlidingWindowStats(60, buckets=60)
+    for second in range(10_000):
+        window.add(second * SECOND, 1, 3, 10, 0)
+    assert len(window._buckets) <= window.buckets
+    assert window.events == len(window._buckets)
+    assert window.summary(9_999 * SECOND)["total_events"] == 60
+
+
+def test_late_event_inside_window_is_counted():
+    window = SlidingWindowStats(60, buckets=60)
+    window.add(100 * SECOND, 1, 2, 0, 0)
+    window.add(50 * SECOND, 1, 5, 0, 1)
+    window.add(10 * SECOND, 1, 5, 0, 1)
+    summary = window.summary(100 * SECOND)
+    assert summary["total_events"] == 2
+    assert summary["critical_events"] == 1